@@ -1,7 +1,10 @@
+import os
 import streamlit as st
 import pandas as pd
 from modules.data_loader import DataLoader
 from modules.preprocessor import TextPreprocessor
+from modules.sampled_analysis import get_exact_analysis_jobs
+from modules.sentence_segmenter import get_sentence_segmenter
 import plotly.graph_objects as go
 
 # 페이지 설정
@@ -11,6 +14,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# 이 문장 수보다 많으면 종합 진단을 빠른 추정 모드로 시작
+FAST_MODE_SENTENCES = 150
+
 # 로그인 함수
 def check_login(username, password):
     """사용자 인증"""
@@ -21,8 +27,7 @@ def check_login(username, password):
             st.session_state.data_loader = data_loader
         
         # 사용자정보 시트에서 확인
-        users_sheet = data_loader.sheet.worksheet("사용자정보")
-        all_values = users_sheet.get_all_values()
+        all_values = data_loader.get_sheet_values("사용자정보")
         
         for row in all_values[1:]:  # 헤더 제외
             if len(row) >= 2:
@@ -37,6 +42,16 @@ def check_login(username, password):
         st.error(f"로그인 확인 오류: {e}")
         return False
 
+def is_admin(username):
+    """관리자 여부 (ADMIN_USERS: 쉼표로 구분한 아이디 목록)"""
+    try:
+        admins = st.secrets["ADMIN_USERS"]
+    except Exception:
+        admins = os.getenv("ADMIN_USERS", "")
+    if isinstance(admins, str):
+        admins = admins.split(",")
+    return username in {admin.strip() for admin in admins if admin.strip()}
+
 def login_page():
     """로그인 페이지"""
     st.markdown('<h1 class="main-header">🔍 AI Text Mining Studio</h1>', unsafe_allow_html=True)
@@ -47,8 +62,16 @@ def login_page():
         st.session_state.data_loader = DataLoader()
 
     data_loader = st.session_state.data_loader
-    if data_loader.cache and data_loader.cache.is_connected():
+    circuit = data_loader.cache.circuit_state() if data_loader.cache else {'state': 'disabled'}
+    if circuit['state'] == 'open':
+        st.warning(f"🛑 Redis 응답 지연 - 로컬 캐시로 임시 전환 중 ({circuit['retry_in']:.0f}초 후 재시도)")
+    elif data_loader.cache and data_loader.cache.is_connected():
         st.success("🚀 Redis 캐시 활성화 - 빠른 성능")
+        pool_stats = data_loader.cache.pool_stats()
+        circuit_labels = {'closed': '정상', 'half_open': '복구 확인 중'}
+        st.caption(f"커넥션 풀: 사용 중 {pool_stats['in_use']} / 생성 {pool_stats['created']} / "
+                   f"최대 {pool_stats['max_connections']} ({pool_stats['utilization']:.0f}%) · "
+                   f"회로 상태: {circuit_labels.get(circuit['state'], circuit['state'])}")
     else:
         st.warning("⚠️ Redis 캐시 비활성화 - 제한된 동시 접속")
 
@@ -219,21 +242,168 @@ def main_app():
         unique_topics = essay_data['topic_name'].nunique() if 'topic_name' in essay_data.columns else 0
         st.metric("다룬 주제 수", unique_topics)
     
-    # 탭으로 기능 구분
-    tab1, tab2, tab3 = st.tabs([
+    # 탭으로 기능 구분 (관리자는 캐시 모니터링 탭 추가)
+    tab_names = [
         "📚 내 에세이 모음", 
         "🔬 텍스트 마이닝 실습", 
         "🎓 종합 분석"
-    ])
+    ]
+    if is_admin(username):
+        tab_names.extend(["👩‍🏫 학급 현황", "🛠️ 캐시 모니터링"])
+    tabs = st.tabs(tab_names)
     
-    with tab1:
+    with tabs[0]:
         show_essay_collection(essay_data, username, data_loader)
     
-    with tab2:
+    with tabs[1]:
         show_text_mining_practice(essay_data, preprocessor, username, data_loader)
     
-    with tab3:
-        show_comprehensive_analysis(essay_data, preprocessor, username)
+    with tabs[2]:
+        show_comprehensive_analysis(essay_data, preprocessor, username, data_loader)
+
+    if len(tabs) > 3:
+        with tabs[3]:
+            show_class_overview(data_loader)
+        with tabs[4]:
+            show_cache_admin(data_loader)
+
+def show_class_overview(data_loader):
+    """학생별 에세이 현황 (관리자 전용, 캐시는 MGET 1회로 조회)"""
+    st.subheader("👩‍🏫 학급 현황")
+
+    students = data_loader.get_all_students_list()
+    if not students:
+        st.info("학생 목록이 없습니다.")
+        return
+
+    selected = st.multiselect("학생 선택 (비우면 전체)", students, key="class_overview_students")
+    with st.spinner("학생별 에세이를 불러오는 중..."):
+        essays_by_student = data_loader.get_students_essays(selected or students)
+
+    rows = []
+    for student, essay_data in essays_by_student.items():
+        if essay_data.empty:
+            rows.append({'학생': student, '에세이 수': 0, '평균 점수': None, '최근 작성일': None})
+            continue
+        rows.append({
+            '학생': student,
+            '에세이 수': len(essay_data),
+            '평균 점수': essay_data['total_score'].mean() if 'total_score' in essay_data.columns else None,
+            '최근 작성일': essay_data['created_at'].max() if 'created_at' in essay_data.columns else None
+        })
+
+    df = pd.DataFrame(rows)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("에세이를 제출한 학생", f"{(df['에세이 수'] > 0).sum()} / {len(df)}명")
+    with col2:
+        st.metric("전체 에세이 수", f"{df['에세이 수'].sum():,}")
+    st.dataframe(df.round(1), use_container_width=True, hide_index=True)
+
+def show_cache_admin(data_loader):
+    """캐시 적중률/지연 시간 모니터링 (관리자 전용)"""
+    st.subheader("🛠️ 캐시 모니터링")
+    st.caption("키 그룹(essays, students, aggregate 등) × 계층(redis, local, sheets, lease_wait) × 결과별 통계입니다. "
+               "프로세스 시작(또는 초기화) 이후 누적값입니다.")
+
+    cache = data_loader.cache
+    ratios = cache.metrics.hit_ratios()
+    if ratios:
+        cols = st.columns(min(4, len(ratios)))
+        for i, (family, ratio) in enumerate(sorted(ratios.items())):
+            with cols[i % len(cols)]:
+                st.metric(f"{family} 적중률", f"{ratio['hit_ratio'] * 100:.1f}%",
+                          help=f"조회 {ratio['requests']:,}회 · stale {ratio['stale_ratio'] * 100:.1f}%")
+
+    rows = cache.metrics_snapshot()
+    if rows:
+        df = pd.DataFrame(rows).rename(columns={
+            'family': '키 그룹', 'tier': '계층', 'outcome': '결과', 'count': '횟수',
+            'avg_ms': '평균(ms)', 'max_ms': '최대(ms)', 'p95_ms': 'p95(ms)'
+        })
+        st.dataframe(df.round(2), use_container_width=True, hide_index=True)
+    else:
+        st.info("아직 기록된 캐시 조회가 없습니다.")
+
+    compression = cache.compression_stats()
+    pool_stats = cache.pool_stats()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("회로 상태", cache.circuit_state()['state'])
+    with col2:
+        st.metric("커넥션 풀 사용률", f"{pool_stats['utilization']:.0f}%")
+    with col3:
+        st.metric("압축률", f"{compression['ratio']:.1f}x", help=f"압축 저장 {compression['compressed']:,}건")
+
+    scheduler_stats = data_loader.scheduler.stats()
+    st.caption(f"Sheets API: 호출 {scheduler_stats['calls']:,} · 중복 제거 {scheduler_stats['coalesced']:,} · "
+               f"재시도 {scheduler_stats['retries']:,} · 할당량 대기 {scheduler_stats['throttled']:,} · "
+               f"실패 {scheduler_stats['failed']:,} · 남은 토큰 {scheduler_stats['tokens']:.1f}")
+
+    with st.expander("Prometheus 텍스트"):
+        st.code(cache.metrics.to_prometheus(), language="text")
+
+    if st.button("통계 초기화"):
+        cache.metrics.reset()
+        st.rerun()
+
+ESTIMATE_LABELS = {
+    'overall_score': '종합 점수',
+    'statistical_score': '통계 점수',
+    'vocabulary_score': '어휘 점수',
+    'grammar_score': '문법 점수',
+    'coherence_score': '논리성 점수',
+    'avg_sentence_length': '평균 문장 길이'
+}
+
+
+def show_estimate_summary(estimate):
+    """빠른 추정 결과 안내 (표본 크기, 95% 신뢰구간, 정밀 분석 진행 상태)"""
+    st.info(f"⚡ **빠른 추정 결과**: 전체 {estimate['total_sentences']}개 문장 중 "
+            f"{estimate['sampled_sentences']}개({estimate['sample_ratio']:.0%})를 에세이별로 고르게 뽑아 "
+            f"{estimate['elapsed']:.1f}초 만에 분석했습니다. 아래 점수는 추정값입니다.")
+    intervals = estimate.get('confidence_intervals', {})
+    if intervals:
+        st.dataframe(pd.DataFrame([
+            {'지표': ESTIMATE_LABELS.get(name, name), '95% 신뢰구간': f"{low:.1f} ~ {high:.1f}"}
+            for name, (low, high) in intervals.items()
+        ]), hide_index=True, use_container_width=True)
+    exact_metrics = estimate.get('exact_metrics', [])
+    if exact_metrics:
+        labels = ", ".join(ESTIMATE_LABELS.get(name, name) for name in exact_metrics)
+        st.caption(f"✅ {labels}: 전체 에세이의 누적 통계로 계산한 정확한 값입니다.")
+    show_exact_analysis_status(estimate['exact_key'])
+
+
+STEP_LABELS = {
+    'statistical': '1단계 통계 분석',
+    'vocabulary': '2단계 어휘 분석',
+    'grammar': '문법 분석',
+    'similarity': '문장 유사도 분석'
+}
+
+
+def show_truncated_steps(truncated_steps):
+    """시간 제한으로 부분 결과만 나온 단계 안내"""
+    if truncated_steps:
+        labels = ", ".join(STEP_LABELS.get(step, step) for step in truncated_steps)
+        st.warning(f"⏱️ 텍스트가 길어 시간 제한 안에 끝나지 않은 단계가 있습니다: **{labels}**. "
+                   f"해당 단계는 분석한 부분까지의 결과이며 종합 점수/등급에서는 제외했습니다.")
+
+
+@st.fragment(run_every=3)
+def show_exact_analysis_status(key):
+    """백그라운드 정밀 분석 상태 (완료되면 화면 전체를 다시 그려 정밀 결과로 교체)"""
+    status = get_exact_analysis_jobs().status(key)
+    if status == 'running':
+        st.caption("⏳ 전체 문장 정밀 분석 진행 중... 완료되면 자동으로 정밀 결과로 바뀝니다.")
+    elif status == 'done':
+        st.rerun()
+    elif status == 'partial':
+        st.caption("⏱️ 정밀 분석이 시간 제한 안에 끝나지 않아 추정 결과를 표시합니다.")
+    elif status == 'failed':
+        st.caption("⚠️ 정밀 분석에 실패해 추정 결과를 표시합니다.")
+
 
 def show_essay_collection(essay_data, username, data_loader):
     """에세이 모음 표시"""
@@ -287,6 +457,33 @@ def show_essay_collection(essay_data, username, data_loader):
             else:
                 st.warning("에세이 텍스트를 찾을 수 없습니다.")
     
+    # 다른 학생 에세이와의 유사도 검사
+    st.subheader("🔎 유사 에세이 검사")
+    
+    if st.button("다른 학생 에세이와 비교하기"):
+        with st.spinner("전체 에세이와 비교하는 중..."):
+            if 'preprocessor' not in st.session_state:
+                st.session_state.preprocessor = TextPreprocessor()
+            similar_results = data_loader.find_similar_essays(username, st.session_state.preprocessor)
+            
+            flagged = [item for item in similar_results if item['matches'] or item['sentence_matches']]
+            if not similar_results:
+                st.info("비교할 에세이가 없습니다.")
+            elif not flagged:
+                st.success(f"✅ {len(similar_results)}개 에세이 모두 다른 학생의 글과 겹치는 부분이 적습니다.")
+            else:
+                st.warning(f"⚠️ {len(flagged)}개 에세이가 다른 학생의 글과 매우 유사하거나 비슷한 문장이 있습니다.")
+                for item in flagged:
+                    if item['matches']:
+                        best = item['matches'][0]
+                        st.write(f"• **{item['topic_name']}** - 최대 유사도 {best['similarity'] * 100:.0f}% "
+                                 f"(유사 에세이 {len(item['matches'])}개)")
+                    else:
+                        st.write(f"• **{item['topic_name']}** - 다른 학생의 글과 비슷한 문장 "
+                                 f"{len(item['sentence_matches'])}개")
+                    for match in item['sentence_matches'][:3]:
+                        st.caption(f"\"{match['sentence'][:120]}\" - 유사도 {match['similarity'] * 100:.0f}%")
+    
     # 개별 에세이 목록
     st.subheader("📋 개별 에세이 목록")
     
@@ -348,8 +545,9 @@ def show_text_mining_practice(essay_data, preprocessor, username, data_loader):
     
     if st.button("🔍 전처리 단계별 분석 시작"):
         with st.spinner("단계별 전처리를 진행하는 중..."):
-            # 직접 NLTK로 전처리 단계별 결과 생성
-            from nltk.stem import PorterStemmer, WordNetLemmatizer
+            # 전처리 단계별 결과 생성 (어간/표제어 추출은 공용 정규화기 사용)
+            from modules.word_normalizer import get_word_normalizer
+            normalizer = get_word_normalizer()
             
             # 각 단계별 처리
             steps = {}
@@ -368,25 +566,13 @@ def show_text_mining_practice(essay_data, preprocessor, username, data_loader):
             steps['2단계_불용어제거'] = step2
             steps['2단계_단어수'] = len(step2.split()) if step2 else 0
             
-            # 3단계: 어간 추출 (직접 구현)
-            if step2:
-                stemmer = PorterStemmer()
-                words = step2.split()
-                stemmed_words = [stemmer.stem(word) for word in words]
-                step3 = ' '.join(stemmed_words)
-            else:
-                step3 = step2
+            # 3단계: 어간 추출
+            step3 = preprocessor.step3_stemming(step2) if step2 else step2
             steps['3단계_어간추출'] = step3
             steps['3단계_단어수'] = len(step3.split()) if step3 else 0
             
-            # 4단계: 표제어 추출 (직접 구현)
-            if step2:
-                lemmatizer = WordNetLemmatizer()
-                words = step2.split()
-                lemmatized_words = [lemmatizer.lemmatize(word) for word in words]
-                step4 = ' '.join(lemmatized_words)
-            else:
-                step4 = step2
+            # 4단계: 표제어 추출
+            step4 = preprocessor.step4_lemmatization(step2) if step2 else step2
             steps['4단계_표제어추출'] = step4
             steps['4단계_단어수'] = len(step4.split()) if step4 else 0
             
@@ -453,14 +639,10 @@ def show_text_mining_practice(essay_data, preprocessor, username, data_loader):
                 
                 # 어간 추출 변화 예시 보여주기
                 if preprocessing_steps['2단계_불용어제거'] and preprocessing_steps['3단계_어간추출']:
-                    from nltk.stem import PorterStemmer
-                    stemmer = PorterStemmer()
-                    
                     before_words = preprocessing_steps['2단계_불용어제거'].split()[:20]  # 처음 20개 단어만
                     stemmed_examples = []
                     
-                    for word in before_words:
-                        stemmed = stemmer.stem(word)
+                    for word, stemmed in zip(before_words, normalizer.stem_words(before_words)):
                         if word != stemmed:  # 변화된 단어만 표시
                             stemmed_examples.append(f"'{word}' → '{stemmed}'")
                     
@@ -494,14 +676,10 @@ def show_text_mining_practice(essay_data, preprocessor, username, data_loader):
                 
                 # 표제어 추출 변화 예시 보여주기
                 if preprocessing_steps['2단계_불용어제거'] and preprocessing_steps['4단계_표제어추출']:
-                    from nltk.stem import WordNetLemmatizer
-                    lemmatizer = WordNetLemmatizer()
-                    
                     before_words = preprocessing_steps['2단계_불용어제거'].split()[:20]  # 처음 20개 단어만
                     lemmatized_examples = []
                     
-                    for word in before_words:
-                        lemmatized = lemmatizer.lemmatize(word)
+                    for word, lemmatized in zip(before_words, normalizer.lemmatize_words(before_words)):
                         if word != lemmatized:  # 변화된 단어만 표시
                             lemmatized_examples.append(f"'{word}' → '{lemmatized}'")
                     
@@ -519,16 +697,10 @@ def show_text_mining_practice(essay_data, preprocessor, username, data_loader):
                 # 어간 추출 vs 표제어 추출 비교
                 if preprocessing_steps['3단계_어간추출'] != preprocessing_steps['4단계_표제어추출']:
                     st.write("**🔍 어간 추출 vs 표제어 추출 비교:**")
-                    from nltk.stem import PorterStemmer, WordNetLemmatizer
-                    stemmer = PorterStemmer()
-                    lemmatizer = WordNetLemmatizer()
-                    
                     before_words = preprocessing_steps['2단계_불용어제거'].split()[:15]
                     comparison_examples = []
                     
-                    for word in before_words:
-                        stemmed = stemmer.stem(word)
-                        lemmatized = lemmatizer.lemmatize(word)
+                    for word, stemmed, lemmatized in normalizer.compare(before_words):
                         if stemmed != lemmatized:  # 두 결과가 다른 경우만
                             comparison_examples.append(f"'{word}' → 어간: '{stemmed}' vs 표제어: '{lemmatized}'")
                     
@@ -708,7 +880,7 @@ def show_text_mining_practice(essay_data, preprocessor, username, data_loader):
             except Exception as e:
                 st.error(f"워드클라우드 생성 오류: {e}")
 
-def show_comprehensive_analysis(essay_data, preprocessor, username):
+def show_comprehensive_analysis(essay_data, preprocessor, username, data_loader):
     """종합 분석"""
     st.header("🎓 종합 분석")
     st.markdown("""
@@ -722,12 +894,14 @@ def show_comprehensive_analysis(essay_data, preprocessor, username):
     
     # 전체 에세이 텍스트 합치기
     all_essays_text = ""
+    essay_texts = []  # 에세이별 정제 텍스트 (빠른 추정 모드의 층)
     for _, row in essay_data.iterrows():
         essay_text = row.get('essay_text', '')
         if essay_text and not pd.isna(essay_text):
             cleaned_text = preprocessor.extract_essay_content(essay_text)
             if cleaned_text:
                 all_essays_text += cleaned_text + " "
+                essay_texts.append(cleaned_text)
     
     if not all_essays_text.strip():
         st.warning("분석할 텍스트가 없습니다.")
@@ -1592,8 +1766,8 @@ def show_comprehensive_analysis(essay_data, preprocessor, username):
                         try:
                             import nltk
                             
-                            # 사용자 입력 텍스트를 문장별로 분리
-                            sentences = nltk.sent_tokenize(user_pattern_text)
+                            # 사용자 입력 텍스트를 문장별로 분리 (종합 진단과 같은 문장 분리 서비스)
+                            sentences = get_sentence_segmenter().sentences(user_pattern_text)
                             
                             st.markdown(f"**📝 총 {len(sentences)}개 문장의 상세 분석:**")
                             
@@ -2039,12 +2213,28 @@ def show_comprehensive_analysis(essay_data, preprocessor, username):
         # 자동으로 종합 분석 실행
         if all_essays_text.strip():
             try:
+                # 문장이 많으면 기본으로 빠른 추정 모드 (표본 분석 후 정밀 분석은 백그라운드)
+                total_sentences = len(preprocessor.segmenter.spans(all_essays_text))
+                fast_mode = st.toggle("⚡ 빠른 추정 모드 (표본 문장 분석 + 신뢰구간)",
+                                      value=total_sentences > FAST_MODE_SENTENCES,
+                                      key="fast_writing_analysis",
+                                      help=f"총 {total_sentences}개 문장 중 일부를 에세이별로 고르게 뽑아 먼저 보여주고, 전체 분석이 끝나면 자동으로 바뀝니다.")
+                
                 # 종합 분석 실행
                 with st.spinner("📊 통합 에세이 텍스트 분석 중..."):
-                    result = preprocessor.comprehensive_writing_analysis(all_essays_text)
+                    # 에세이별 분석 결과를 누적한 집계 (새 에세이만 추가 분석)
+                    aggregate = data_loader.get_student_aggregate(username, preprocessor)
+                    result = preprocessor.comprehensive_writing_analysis(
+                        all_essays_text, aggregate,
+                        mode='fast' if fast_mode else 'exact', essays=essay_texts
+                    )
                 
                 if result and 'error' not in result:
-                    st.success("✅ 통합 에세이 데이터 분석 완료!")
+                    if result.get('analysis_mode') == 'estimate':
+                        show_estimate_summary(result['estimate'])
+                    else:
+                        st.success("✅ 통합 에세이 데이터 분석 완료!")
+                    show_truncated_steps(result.get('truncated_steps', []))
                     
                     # 1단계: 통계적 텍스트 분석
                     st.markdown("## 📊 1단계: 통계적 텍스트 분석")
@@ -2146,7 +2336,7 @@ def show_comprehensive_analysis(essay_data, preprocessor, username):
                     if st.button("🔍 내 글 통계 분석하기", key="stats_analysis") and user_text_stats.strip():
                         with st.spinner("통계적 특성 분석 중..."):
                             import nltk
-                            sentences = nltk.sent_tokenize(user_text_stats)
+                            sentences = get_sentence_segmenter().sentences(user_text_stats)
                             words = nltk.word_tokenize(user_text_stats)
                             word_count = len([w for w in words if w.isalnum()])
                             unique_words = len(set(w.lower() for w in words if w.isalnum()))
@@ -2248,6 +2438,24 @@ def show_comprehensive_analysis(essay_data, preprocessor, username):
                                 
                                 st.write(f"**평가:** {complexity_analysis.get('level_description', '보통 수준')}")
                         
+                        # 워드 임베딩 기반 의미 유사도 (임베딩 저장소가 설정된 경우)
+                        embedding_analysis = vocabulary_analysis.get('embedding_analysis')
+                        if embedding_analysis:
+                            st.markdown("### 🧭 워드 임베딩 의미 분석")
+                            category_names = {
+                                'academic': '학술 어휘',
+                                'descriptive': '고급 형용사',
+                                'transitions': '연결 어구',
+                                'advanced_verbs': '고급 동사'
+                            }
+                            category_similarity = embedding_analysis.get('category_similarity', {})
+                            columns = st.columns(len(category_similarity) + 1)
+                            with columns[0]:
+                                st.metric("임베딩 사전 포함 비율", f"{embedding_analysis.get('coverage', 0):.1f}%")
+                            for column, (category, similarity) in zip(columns[1:], category_similarity.items()):
+                                with column:
+                                    st.metric(f"{category_names.get(category, category)} 유사도", f"{similarity:.3f}")
+                        
                         # 개선 추천 사항
                         recommendations = vocabulary_analysis.get('vocabulary_recommendations', [])
                         if recommendations:
@@ -2385,6 +2593,17 @@ def show_comprehensive_analysis(essay_data, preprocessor, username):
                             logical_flow = similarity_analysis.get('logical_flow_level', 'Unknown')
                             st.metric("논리적 흐름", logical_flow)
                         
+                        # TF-IDF 코사인 유사도 기반 응집성 지표
+                        coherence_metrics = similarity_analysis.get('coherence_metrics', {})
+                        if coherence_metrics:
+                            col1, col2, col3 = st.columns(3)
+                            with col1:
+                                st.metric("인접 문장 유사도", f"{coherence_metrics.get('adjacent', 0):.3f}")
+                            with col2:
+                                st.metric("주변 문장 유사도 (3문장 이내)", f"{coherence_metrics.get('windowed', 0):.3f}")
+                            with col3:
+                                st.metric("주제 중심 유사도", f"{coherence_metrics.get('centroid', 0):.3f}")
+                        
                         # 문장별 연결성 분석
                         sentence_pairs = similarity_analysis.get('sentence_pair_analysis', [])
                         if sentence_pairs:
@@ -2582,9 +2801,12 @@ def show_comprehensive_analysis(essay_data, preprocessor, username):
 
                         with col3:
                             # 오류율 계산
-                            total_sentences = grammar_analysis.get('total_sentences', 1)
+                            # 시간 제한으로 일부만 분석했으면 분석한 문장 기준
+                            total_sentences = grammar_analysis.get('analyzed_sentences', grammar_analysis.get('total_sentences', 1))
                             error_rate = (total_errors / total_sentences * 100) if total_sentences > 0 else 0
                             st.metric("오류율", f"{error_rate:.1f}%")
+                            if grammar_analysis.get('truncated'):
+                                st.caption(f"⏱️ 전체 {grammar_analysis.get('total_sentences', 0)}문장 중 {total_sentences}문장 분석")
 
                         # 오류 유형별 분석
                         error_count_by_type = grammar_analysis.get('error_count_by_type', {})
@@ -2637,6 +2859,15 @@ def show_comprehensive_analysis(essay_data, preprocessor, username):
                                 st.info(f"• {area}")
                         elif total_errors == 0:
                             st.success("💡 문법 오류가 발견되지 않았습니다. 우수한 문법 구사력입니다!")
+
+                        # 오류 문장 예시 (표시하는 문장만 원문에서 잘라냄)
+                        if sentences_with_issues:
+                            with st.expander(f"🔍 오류가 발견된 문장 보기 ({len(sentences_with_issues)}개 중 최대 5개)"):
+                                for sentence_data in sentences_with_issues[:5]:
+                                    st.write(f"**문장 {sentence_data['sentence_number']}:** {sentence_data['sentence']}")
+                                    for issue in sentence_data['issues']:
+                                        highlighted = f" - `{issue['text']}`" if issue.get('text') and issue['text'] != sentence_data['sentence'] else ""
+                                        st.caption(f"• {issue['description']}{highlighted} → {issue['suggestion']}")
                     else:
                         st.warning("통합 에세이 문법 분석 결과가 없습니다.")
 
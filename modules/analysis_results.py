@@ -0,0 +1,202 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+
+def sentence_spans(text, sentences):
+    """문장 목록의 원문 내 문자 위치 [(시작, 끝)]
+
+    문장이 원문에서 순서대로 발견되지 않으면 None (토크나이저가 원문을 바꾼 경우)
+    """
+    spans = []
+    cursor = 0
+    for sentence in sentences:
+        start = text.find(sentence, cursor)
+        if start < 0:
+            return None
+        spans.append((start, start + len(sentence)))
+        cursor = start + len(sentence)
+    return spans
+
+
+class _LazyRows(Sequence):
+    """행을 요청할 때만 만드는 읽기 전용 목록 (len()은 비용 없음)"""
+
+    def __init__(self, length, materialize):
+        self._length = length
+        self._materialize = materialize
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        return self._materialize(index)
+
+
+class IssueReport:
+    """참조 기반 문법 분석 결과
+
+    원문은 한 번만 보관하고, 문장은 (시작, 끝) 문자 위치로, 이슈는 문장 번호/문자 위치/
+    유형 ID/메시지 ID 열(int32 배열)로 보관합니다. 문장 텍스트와 이슈 dict는 화면에
+    표시하는 행에 대해서만 만들어집니다.
+    """
+
+    def __init__(self, text, spans):
+        self.text = text
+        spans = np.asarray(spans, dtype=np.int32).reshape(-1, 2)
+        self.sentence_starts = spans[:, 0].copy()
+        self.sentence_ends = spans[:, 1].copy()
+        self.types = []
+        self.messages = []
+        self._type_ids = {}
+        self._message_ids = {}
+        self._rows = []
+        self._columns = None
+
+    @classmethod
+    def from_sentences(cls, text, sentences):
+        """원문 + 문장 목록으로 생성 (문장 위치를 찾지 못하면 문장을 이어 붙인 텍스트를 원문으로 사용)"""
+        spans = sentence_spans(text, sentences)
+        if spans is None:
+            text = ' '.join(sentences)
+            spans = sentence_spans(text, sentences)
+        return cls(text, spans)
+
+    @property
+    def total_sentences(self):
+        return int(self.sentence_starts.shape[0])
+
+    def sentence(self, index):
+        """문장 텍스트 (필요할 때 원문에서 잘라냄)"""
+        return self.text[self.sentence_starts[index]:self.sentence_ends[index]]
+
+    def add_issue(self, sentence_index, issue_type, description, suggestion='', span=None):
+        """이슈 1건 추가
+
+        Args:
+            sentence_index: 문장 번호 (0부터)
+            span: 문장 안의 (시작, 끝) 문자 위치 (없으면 문장 전체)
+        """
+        type_id = self._type_ids.setdefault(issue_type, len(self.types))
+        if type_id == len(self.types):
+            self.types.append(issue_type)
+        message = (description, suggestion)
+        message_id = self._message_ids.setdefault(message, len(self.messages))
+        if message_id == len(self.messages):
+            self.messages.append(message)
+
+        sentence_start = int(self.sentence_starts[sentence_index])
+        if span is None:
+            start, end = sentence_start, int(self.sentence_ends[sentence_index])
+        else:
+            start, end = sentence_start + span[0], sentence_start + span[1]
+        self._rows.append((sentence_index, start, end, type_id, message_id))
+        self._columns = None
+
+    def _issue_columns(self):
+        """이슈 열 배열 (sentence, start, end, type, message) - 추가가 끝난 뒤 한 번만 변환"""
+        if self._columns is None:
+            rows = np.asarray(self._rows, dtype=np.int32).reshape(-1, 5)
+            self._columns = {
+                'sentence': rows[:, 0], 'start': rows[:, 1], 'end': rows[:, 2],
+                'type': rows[:, 3], 'message': rows[:, 4]
+            }
+        return self._columns
+
+    @property
+    def issue_count(self):
+        return len(self._rows)
+
+    def count_by_type(self):
+        """{이슈 유형: 개수} (bincount)"""
+        if not self._rows:
+            return {}
+        counts = np.bincount(self._issue_columns()['type'], minlength=len(self.types))
+        return {issue_type: int(count) for issue_type, count in zip(self.types, counts.tolist()) if count}
+
+    def issue_sentence_indices(self):
+        """이슈가 있는 문장 번호 배열 (오름차순)"""
+        if not self._rows:
+            return np.zeros(0, dtype=np.int32)
+        return np.unique(self._issue_columns()['sentence'])
+
+    def issue(self, row):
+        """이슈 1건 dict (type, description, suggestion, span(원문 기준 문자 위치), text)"""
+        columns = self._issue_columns()
+        description, suggestion = self.messages[columns['message'][row]]
+        start, end = int(columns['start'][row]), int(columns['end'][row])
+        return {
+            'type': self.types[columns['type'][row]],
+            'description': description,
+            'suggestion': suggestion,
+            'span': (start, end),
+            'text': self.text[start:end]
+        }
+
+    def sentences_with_issues(self):
+        """[{'sentence_number', 'sentence', 'issues'}] 형식의 지연 목록"""
+        sentence_indices = self.issue_sentence_indices()
+        columns = self._issue_columns() if self._rows else None
+
+        def materialize(position):
+            sentence_index = int(sentence_indices[position])
+            rows = np.flatnonzero(columns['sentence'] == sentence_index).tolist()
+            return {
+                'sentence_number': sentence_index + 1,
+                'sentence': self.sentence(sentence_index),
+                'issues': [self.issue(row) for row in rows]
+            }
+
+        return _LazyRows(len(sentence_indices), materialize)
+
+    def error_patterns(self):
+        """{이슈 유형: [{'sentence', 'description', 'suggestion'}] 지연 목록}"""
+        if not self._rows:
+            return {}
+        columns = self._issue_columns()
+        patterns = {}
+        for type_id, issue_type in enumerate(self.types):
+            rows = np.flatnonzero(columns['type'] == type_id)
+
+            def materialize(position, rows=rows):
+                row = int(rows[position])
+                issue = self.issue(row)
+                return {
+                    'sentence': self.sentence(int(columns['sentence'][row])),
+                    'description': issue['description'],
+                    'suggestion': issue['suggestion']
+                }
+
+            patterns[issue_type] = _LazyRows(len(rows), materialize)
+        return patterns
+
+    def to_dict(self):
+        """캐시 저장용 JSON 직렬화 가능한 dict (열 단위)"""
+        columns = self._issue_columns()
+        return {
+            'text': self.text,
+            'sentence_starts': self.sentence_starts.tolist(),
+            'sentence_ends': self.sentence_ends.tolist(),
+            'types': list(self.types),
+            'messages': [list(message) for message in self.messages],
+            'issues': {name: values.tolist() for name, values in columns.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """to_dict() 결과로부터 복원"""
+        report = cls(data['text'], list(zip(data['sentence_starts'], data['sentence_ends'])))
+        report.types = list(data['types'])
+        report._type_ids = {issue_type: i for i, issue_type in enumerate(report.types)}
+        report.messages = [tuple(message) for message in data['messages']]
+        report._message_ids = {message: i for i, message in enumerate(report.messages)}
+        issues = data['issues']
+        report._rows = list(zip(issues['sentence'], issues['start'], issues['end'],
+                                issues['type'], issues['message']))
+        return report
@@ -0,0 +1,75 @@
+import threading
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # zstandard 미설치 시 zlib 사용
+    zstandard = None
+
+# 압축된 값의 헤더 (UTF-8 JSON은 0xFF로 시작할 수 없으므로 평문과 구분됨)
+ZLIB_HEADER = b'\xffZ'
+ZSTD_HEADER = b'\xffS'
+
+
+class CacheCodec:
+    """캐시 값 인코더 (임계값 이상일 때만 압축, 헤더로 압축 방식 표시)
+
+    헤더가 없는 값은 압축하지 않은 JSON으로 취급하므로 이전에 저장된 값도 그대로 읽힙니다.
+    """
+
+    def __init__(self, algorithm: str = 'zstd', level: int = 3, threshold: int = 1024):
+        if algorithm == 'zstd' and zstandard is None:
+            algorithm = 'zlib'
+        self.algorithm = algorithm
+        self.level = level
+        self.threshold = threshold
+        self._compressor = zstandard.ZstdCompressor(level=level) if algorithm == 'zstd' else None
+        self._decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+        self._stats = {'values': 0, 'compressed': 0, 'raw_bytes': 0, 'stored_bytes': 0}
+        self._lock = threading.Lock()
+
+    def encode(self, json_data: str) -> bytes:
+        """JSON 문자열 → 저장용 바이트"""
+        raw = json_data.encode('utf-8')
+        stored = raw
+
+        if self.algorithm != 'none' and len(raw) >= self.threshold:
+            if self.algorithm == 'zstd':
+                compressed = ZSTD_HEADER + self._compressor.compress(raw)
+            else:
+                compressed = ZLIB_HEADER + zlib.compress(raw, self.level)
+            # 압축 효과가 없으면 평문 저장
+            if len(compressed) < len(raw):
+                stored = compressed
+
+        with self._lock:
+            self._stats['values'] += 1
+            self._stats['compressed'] += stored is not raw
+            self._stats['raw_bytes'] += len(raw)
+            self._stats['stored_bytes'] += len(stored)
+        return stored
+
+    def decode(self, data) -> str:
+        """저장된 바이트(또는 문자열) → JSON 문자열"""
+        if isinstance(data, str):
+            return data
+        if data[:2] == ZSTD_HEADER:
+            if self._decompressor is None:
+                raise RuntimeError("zstd로 압축된 캐시 값이지만 zstandard가 설치되어 있지 않습니다")
+            return self._decompressor.decompress(data[2:]).decode('utf-8')
+        if data[:2] == ZLIB_HEADER:
+            return zlib.decompress(data[2:]).decode('utf-8')
+        return data.decode('utf-8')
+
+    def stats(self) -> dict:
+        """압축 전후 크기 통계
+
+        Returns:
+            algorithm, values(인코딩 횟수), compressed(압축 저장 횟수),
+            raw_bytes, stored_bytes, ratio(원본/저장 크기)
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats['algorithm'] = self.algorithm
+        stats['ratio'] = stats['raw_bytes'] / stats['stored_bytes'] if stats['stored_bytes'] else 1.0
+        return stats
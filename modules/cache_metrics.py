@@ -0,0 +1,261 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 지연 시간 히스토그램 구간 상한 (초)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 결과 종류: hit(신선한 값), stale(soft TTL 경과 값), miss(없음), error(조회 실패), load(원본에서 가져옴)
+OUTCOMES = ('hit', 'stale', 'miss', 'error', 'load')
+
+# 적중률 계산에 쓰는 1차 조회 계층 (snapshot/lease_wait/sheets는 같은 요청의 후속 단계라 제외)
+PRIMARY_TIERS = ('redis', 'local')
+
+
+class CacheMetrics:
+    """키 그룹(family) × 계층(tier) × 결과(outcome) 별 캐시 카운터와 지연 시간 히스토그램
+
+    tier는 값을 찾은 위치입니다 (redis, local, sheets 등).
+    스레드 안전하며 Prometheus 텍스트 형식으로 내보낼 수 있습니다.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS, export_path=None, export_interval=15.0):
+        """
+        Args:
+            buckets: 히스토그램 구간 상한 (초, 오름차순)
+            export_path: 지정하면 export_interval마다 Prometheus 텍스트 파일로 기록
+                         (node_exporter textfile collector 등에서 수집)
+            export_interval: 파일 기록 최소 간격 (초)
+        """
+        self.buckets = tuple(buckets)
+        self.export_path = export_path
+        self.export_interval = export_interval
+        self.started_at = time.time()
+        self._series = {}
+        self._lock = threading.Lock()
+        self._last_export = 0.0
+
+    @staticmethod
+    def family_of(key):
+        """논리 키의 그룹 이름 (예: 'essays:kim' → 'essays')"""
+        return str(key).partition(':')[0] or 'default'
+
+    def record(self, family, tier, outcome, seconds=0.0, count=1):
+        """캐시 조회 결과 1건(또는 count건) 기록
+
+        Args:
+            family: 키 그룹 이름
+            tier: 값을 찾은(또는 찾지 못한) 계층
+            outcome: hit / stale / miss / error / load
+            seconds: 조회에 걸린 시간 (count건 전체)
+            count: 같은 결과를 한 번에 기록할 건수 (MGET 등)
+        """
+        if count <= 0:
+            return
+        per_item = seconds / count
+        position = bisect_left(self.buckets, per_item)
+
+        with self._lock:
+            series = self._series.get((family, tier, outcome))
+            if series is None:
+                series = {'count': 0, 'sum': 0.0, 'max': 0.0, 'buckets': [0] * (len(self.buckets) + 1)}
+                self._series[(family, tier, outcome)] = series
+            series['count'] += count
+            series['sum'] += seconds
+            series['max'] = max(series['max'], per_item)
+            series['buckets'][position] += count
+
+        if self.export_path and time.monotonic() - self._last_export >= self.export_interval:
+            self.export()
+
+    def timer(self, family, tier):
+        """with 블록 실행 시간을 기록하는 타이머 (outcome은 블록 안에서 지정)
+
+        Example:
+            with metrics.timer('essays', 'sheets') as timing:
+                data = load()
+                timing.outcome = 'load'
+        """
+        return _Timer(self, family, tier)
+
+    def snapshot(self):
+        """현재 카운터 목록 (관리자 화면 표시용)
+
+        Returns:
+            [{family, tier, outcome, count, avg_ms, max_ms, p95_ms}] (family, tier, outcome 순 정렬)
+        """
+        with self._lock:
+            items = [(key, dict(series, buckets=list(series['buckets'])))
+                     for key, series in self._series.items()]
+
+        rows = []
+        for (family, tier, outcome), series in sorted(items):
+            rows.append({
+                'family': family,
+                'tier': tier,
+                'outcome': outcome,
+                'count': series['count'],
+                'avg_ms': series['sum'] / series['count'] * 1000 if series['count'] else 0.0,
+                'max_ms': series['max'] * 1000,
+                'p95_ms': self._quantile(series['buckets'], 0.95) * 1000
+            })
+        return rows
+
+    def hit_ratios(self):
+        """키 그룹별 적중률 (hit+stale) / (hit+stale+miss+error)
+
+        1차 조회 계층(PRIMARY_TIERS)만 세므로 캐시 미스 1건은 스냅샷 확인이나 lease 대기를
+        거쳐도 요청 1건입니다.
+
+        Returns:
+            {family: {'requests', 'hit_ratio', 'stale_ratio'}}
+
+        Example:
+            >>> metrics = CacheMetrics()
+            >>> metrics.record('essays', 'redis', 'miss')
+            >>> metrics.record('essays', 'snapshot', 'miss')
+            >>> metrics.record('essays', 'lease_wait', 'hit')
+            >>> metrics.record('essays', 'redis', 'hit')
+            >>> metrics.hit_ratios()['essays']
+            {'requests': 2, 'hit_ratio': 0.5, 'stale_ratio': 0.0}
+        """
+        totals = {}
+        for row in self.snapshot():
+            if row['tier'] not in PRIMARY_TIERS or row['outcome'] == 'load':
+                continue
+            family = totals.setdefault(row['family'], {outcome: 0 for outcome in OUTCOMES})
+            family[row['outcome']] += row['count']
+
+        ratios = {}
+        for family, counts in totals.items():
+            requests = counts['hit'] + counts['stale'] + counts['miss'] + counts['error']
+            ratios[family] = {
+                'requests': requests,
+                'hit_ratio': (counts['hit'] + counts['stale']) / requests if requests else 0.0,
+                'stale_ratio': counts['stale'] / requests if requests else 0.0
+            }
+        return ratios
+
+    def _quantile(self, bucket_counts, quantile):
+        """히스토그램 구간 상한 기준 분위수 추정 (마지막 구간은 최대 구간 상한으로 표시)"""
+        total = sum(bucket_counts)
+        if not total:
+            return 0.0
+        target = total * quantile
+        running = 0
+        for position, bucket_count in enumerate(bucket_counts):
+            running += bucket_count
+            if running >= target:
+                return self.buckets[min(position, len(self.buckets) - 1)]
+        return self.buckets[-1]
+
+    def to_prometheus(self):
+        """Prometheus 텍스트 노출 형식 (text/plain; version=0.0.4)"""
+        with self._lock:
+            items = sorted((key, dict(series, buckets=list(series['buckets'])))
+                           for key, series in self._series.items())
+
+        lines = [
+            '# HELP tms_cache_requests_total Cache lookups by key family, tier and outcome.',
+            '# TYPE tms_cache_requests_total counter'
+        ]
+        for (family, tier, outcome), series in items:
+            lines.append(f'tms_cache_requests_total{{family="{family}",tier="{tier}",outcome="{outcome}"}} '
+                         f'{series["count"]}')
+
+        lines += [
+            '# HELP tms_cache_latency_seconds Cache lookup latency by key family, tier and outcome.',
+            '# TYPE tms_cache_latency_seconds histogram'
+        ]
+        for (family, tier, outcome), series in items:
+            labels = f'family="{family}",tier="{tier}",outcome="{outcome}"'
+            running = 0
+            for bound, bucket_count in zip(self.buckets, series['buckets']):
+                running += bucket_count
+                lines.append(f'tms_cache_latency_seconds_bucket{{{labels},le="{bound}"}} {running}')
+            lines.append(f'tms_cache_latency_seconds_bucket{{{labels},le="+Inf"}} {series["count"]}')
+            lines.append(f'tms_cache_latency_seconds_sum{{{labels}}} {series["sum"]:.6f}')
+            lines.append(f'tms_cache_latency_seconds_count{{{labels}}} {series["count"]}')
+
+        lines += [
+            '# HELP tms_cache_uptime_seconds Seconds since the metrics were reset.',
+            '# TYPE tms_cache_uptime_seconds gauge',
+            f'tms_cache_uptime_seconds {time.time() - self.started_at:.0f}'
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path=None):
+        """Prometheus 텍스트를 파일로 기록 (임시 파일 → rename으로 원자적 교체)"""
+        path = path or self.export_path
+        if not path:
+            return
+        self._last_export = time.monotonic()
+        try:
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"Cache metrics export error ({path}): {e}")
+
+    def reset(self):
+        """모든 카운터 초기화"""
+        with self._lock:
+            self._series.clear()
+        self.started_at = time.time()
+
+    def serve(self, port, host='127.0.0.1'):
+        """/metrics 엔드포인트를 제공하는 HTTP 서버를 데몬 스레드로 시작
+
+        기본값은 로컬 접속만 허용합니다. 다른 호스트의 수집기가 읽어야 하면 host='0.0.0.0'.
+
+        Returns:
+            서버 객체 (포트 사용 중 등으로 시작하지 못하면 None)
+        """
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            server = ThreadingHTTPServer((host, int(port)), MetricsHandler)
+        except OSError as e:
+            print(f"Cache metrics server not started on port {port}: {e}")
+            return None
+
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"Cache metrics available at http://{host}:{port}/metrics")
+        return server
+
+
+class _Timer:
+    """CacheMetrics.timer() 컨텍스트 매니저 (예외 발생 시 outcome='error')"""
+
+    def __init__(self, metrics, family, tier):
+        self.metrics = metrics
+        self.family = family
+        self.tier = tier
+        self.outcome = 'hit'
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        outcome = 'error' if exc_type else self.outcome
+        self.metrics.record(self.family, self.tier, outcome, time.perf_counter() - self.started)
+        return False
@@ -0,0 +1,102 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+    """연속 실패 시 외부 호출을 잠시 차단하는 회로 차단기
+
+    closed: 정상 호출
+    open: failure_threshold번 연속 실패 → reset_timeout 동안 호출 차단
+    half_open: 차단 시간이 지나면 half_open_max_calls개의 시험 호출만 허용,
+               성공하면 closed, 실패하면 다시 open
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._short_circuited = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """현재 상태 (차단 시간이 지났으면 half_open으로 표시)"""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        """지금 외부 호출을 시도해도 되는지 여부"""
+        with self._lock:
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    self._short_circuited += 1
+                    return False
+                self._state = self.HALF_OPEN
+                self._half_open_calls = 0
+
+            if self._state == self.HALF_OPEN:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    self._short_circuited += 1
+                    return False
+                self._half_open_calls += 1
+
+            return True
+
+    def record_success(self):
+        """호출 성공 기록"""
+        with self._lock:
+            self._failures = 0
+            self._state = self.CLOSED
+
+    def record_failure(self):
+        """호출 실패 기록"""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    print(f"Circuit breaker OPEN for {self.reset_timeout}s after {self._failures} failures")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def release(self):
+        """결과를 기록하지 못하고 끝난 호출의 half_open 시험 호출 자리 반환
+
+        (예: SCAN 순회를 호출한 쪽에서 중간에 멈춤) - 반환하지 않으면 half_open에 머물며 모든 호출을 막음
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def trip(self):
+        """실패 횟수와 관계없이 바로 open (연결 자체가 실패한 경우 등)"""
+        with self._lock:
+            self._failures = max(self._failures + 1, self.failure_threshold)
+            if self._state != self.OPEN:
+                print(f"Circuit breaker OPEN for {self.reset_timeout}s")
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        """상태 요약"""
+        state = self.state
+        with self._lock:
+            retry_in = 0.0
+            if state == self.OPEN:
+                retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+            return {
+                'state': state,
+                'consecutive_failures': self._failures,
+                'short_circuited': self._short_circuited,
+                'retry_in': retry_in
+            }
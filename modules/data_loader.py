@@ -3,7 +3,17 @@ import gspread
 import pandas as pd
 from google.oauth2.service_account import Credentials
 import json
-from modules.redis_cache import RedisCache
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from modules.redis_cache import get_shared_cache
+from modules.sheets_scheduler import get_sheets_scheduler
+from modules.snapshot_store import get_snapshot_store
+from modules.essay_aggregates import EssayAggregate, essay_fingerprint
+from modules.near_duplicate import EssayDuplicateIndex, MIN_SENTENCE_WORDS
+from modules.essay_frame import essay_frame, normalize_columns
+from modules.sheet_columns import (ESSAY_COLUMNS, decode_columns, quote_title, resolve_ranges,
+                                   row_count, select_rows, to_columns, to_records)
 
 # Google Sheets 설정
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets',
@@ -11,10 +21,41 @@ SCOPES = ['https://www.googleapis.com/auth/spreadsheets',
 SERVICE_ACCOUNT_FILE = 'credentials.json'
 SHEET_ID = '1_HkNcnWX_31GhJwDcT3a2D41BJvbF9Njmwi5d5T8pWQ'
 
+# 단일 로딩(single-flight) 설정
+LEASE_SECONDS = 30        # 갱신 담당 워커의 락 유지 시간 (워커가 죽으면 자동 해제)
+WAIT_SECONDS = 3          # 다른 워커가 갱신 중일 때 기다리는 최대 시간
+
+_key_locks = {}
+_key_locks_guard = threading.Lock()
+
+# 백그라운드 갱신 (stale-while-revalidate)
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+_pending_refreshes = set()
+_pending_refreshes_guard = threading.Lock()
+
+
+def _key_lock(cache_key):
+    """캐시 키별 프로세스 내 락"""
+    with _key_locks_guard:
+        if cache_key not in _key_locks:
+            _key_locks[cache_key] = threading.Lock()
+        return _key_locks[cache_key]
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _build_duplicate_index(snapshot_id, threshold, sentence_threshold, _essays, _text_cleaner):
+    """스냅샷별 유사 에세이 인덱스 (프로세스 전체에서 공유, 스냅샷/유사도 기준이 바뀔 때만 재생성)
+
+    LSH 구간 수가 유사도 기준에 맞춰지므로 두 기준 모두 캐시 키에 포함합니다.
+    """
+    return EssayDuplicateIndex.build(_essays, _text_cleaner, threshold=threshold,
+                                     sentence_threshold=sentence_threshold)
+
 class DataLoader:
     def __init__(self):
         self.sheet = self._get_google_sheets()
-        self.cache = RedisCache()  # Redis 캐시 초기화
+        self.cache = get_shared_cache()  # 프로세스 공용 Redis 캐시 (커넥션 풀 공유)
+        self.scheduler = get_sheets_scheduler()  # 프로세스 공용 Sheets API 할당량/재시도 관리
+        self.snapshots = get_snapshot_store(SHEET_ID)  # 마지막으로 성공한 데이터의 로컬 Parquet 스냅샷
     
     @st.cache_resource
     def _get_google_sheets(_self):
@@ -42,68 +83,309 @@ class DataLoader:
             st.error(error_msg)
             return None
     
-    def get_student_essays(self, username):
-        """특정 학생의 모든 에세이 데이터 가져오기 (Redis 캐싱)"""
-        try:
-            # 1. Redis 캐시에서 먼저 확인
-            cache_key = f"essays:{username}"
-            cached_data = self.cache.get(cache_key)
+    def _cached_fetch(self, cache_key, loader, soft_ttl, hard_ttl, snapshot=None):
+        """stale-while-revalidate 캐시 조회
 
+        - soft TTL 이내: 캐시 값 바로 반환
+        - soft TTL 경과 ~ hard TTL 이내: 캐시 값 바로 반환 + 백그라운드 갱신 예약
+        - hard TTL 경과(캐시 없음): 로컬 스냅샷이 있으면 바로 반환 + 백그라운드 갱신 예약,
+          없으면 하나의 워커만 Google Sheets에서 가져오고 나머지는 대기
+
+        Args:
+            cache_key: 캐시 키
+            loader: 캐시 미스 시 호출할 함수 (빈 결과는 캐시하지 않음)
+            soft_ttl: 신선한 값으로 취급하는 시간 (초)
+            hard_ttl: 캐시 유지 시간 (초)
+            snapshot: 캐시 미스 시 디스크 스냅샷에서 값을 읽는 함수 (없으면 None 반환)
+        """
+        # 조회 결과(hit/stale/miss)는 RedisCache.metrics에 키 그룹별로 기록됨
+        cached_data, is_fresh = self.cache.get_with_state(cache_key)
+        if cached_data is not None:
+            if not is_fresh:
+                self._schedule_refresh(cache_key, loader, soft_ttl, hard_ttl)
+            return cached_data
+
+        if snapshot is not None:
+            with self.cache.metrics.timer(self.cache.metrics.family_of(cache_key), 'snapshot') as timing:
+                snapshot_data = snapshot()
+                timing.outcome = 'stale' if snapshot_data else 'miss'
+            if snapshot_data:
+                # 재시작 직후 등: 스냅샷을 stale 값으로 캐시에 넣고 바로 반환, 갱신은 백그라운드에서
+                self.cache.set(cache_key, snapshot_data, ttl=hard_ttl, soft_ttl=0)
+                self._schedule_refresh(cache_key, loader, soft_ttl, hard_ttl)
+                return snapshot_data
+
+        return self._single_flight(cache_key, loader, soft_ttl, hard_ttl)
+
+    def _single_flight(self, cache_key, loader, soft_ttl, hard_ttl):
+        """캐시 미스 시 하나의 워커만 Google Sheets에서 다시 가져오기
+
+        프로세스 안에서는 키별 락으로, 프로세스 사이에서는 Redis SET NX 락(lease)으로
+        갱신 담당을 하나로 정합니다. 나머지는 잠시 기다렸다가 갱신된 값을 사용합니다.
+        락은 LEASE_SECONDS 후 자동 만료되므로 담당 워커가 죽어도 다음 요청이 이어받습니다.
+        """
+        with _key_lock(cache_key):
+            # 락을 기다리는 동안 같은 프로세스의 다른 세션이 채웠을 수 있음 (이미 miss로 기록했으므로 통계 제외)
+            cached_data = self.cache.peek(cache_key)
             if cached_data is not None:
-                print(f"Cache HIT: {cache_key}")
-                return pd.DataFrame(cached_data)
+                return cached_data
 
-            print(f"Cache MISS: {cache_key} - Fetching from Google Sheets")
+            lock_name = f"lock:{cache_key}"
+            token = self.cache.acquire_lock(lock_name, LEASE_SECONDS)
+            if token is None:
+                # 다른 워커가 갱신 중 → 잠시 대기 (대기 시간은 'lease_wait' 계층으로 기록)
+                with self.cache.metrics.timer(self.cache.metrics.family_of(cache_key), 'lease_wait') as timing:
+                    timing.outcome = 'miss'
+                    deadline = time.monotonic() + WAIT_SECONDS
+                    while time.monotonic() < deadline:
+                        time.sleep(0.1)
+                        cached_data = self.cache.peek(cache_key)
+                        if cached_data is not None:
+                            timing.outcome = 'hit'
+                            return cached_data
 
-            if not self.sheet:
+            try:
+                return self._load_and_store(cache_key, loader, soft_ttl, hard_ttl)
+            finally:
+                if token is not None:
+                    self.cache.release_lock(lock_name, token)
+
+    def _load_and_store(self, cache_key, loader, soft_ttl, hard_ttl):
+        """loader 실행 후 soft/hard TTL로 캐시에 저장 (원본 조회 시간은 'sheets' 계층으로 기록)"""
+        with self.cache.metrics.timer(self.cache.metrics.family_of(cache_key), 'sheets') as timing:
+            timing.outcome = 'load'
+            value = loader()
+        if value:
+            self.cache.set(cache_key, value, ttl=hard_ttl, soft_ttl=soft_ttl)
+        return value
+
+    def _schedule_refresh(self, cache_key, loader, soft_ttl, hard_ttl):
+        """백그라운드 갱신 예약 (프로세스 내 중복 예약 방지 + Redis 락으로 워커 간 중복 방지)"""
+        with _pending_refreshes_guard:
+            if cache_key in _pending_refreshes:
+                return
+            _pending_refreshes.add(cache_key)
+
+        def refresh():
+            lock_name = f"lock:{cache_key}"
+            try:
+                token = self.cache.acquire_lock(lock_name, LEASE_SECONDS)
+                if token is None:
+                    return  # 다른 워커가 이미 갱신 중
+                try:
+                    # 화면 요청이 Sheets 할당량을 먼저 쓰도록 낮은 우선순위로 실행
+                    with self.scheduler.background():
+                        self._load_and_store(cache_key, loader, soft_ttl, hard_ttl)
+                    print(f"Background refresh done: {cache_key}")
+                finally:
+                    self.cache.release_lock(lock_name, token)
+            except Exception as e:
+                print(f"Background refresh error for '{cache_key}': {e}")
+            finally:
+                with _pending_refreshes_guard:
+                    _pending_refreshes.discard(cache_key)
+
+        _refresh_executor.submit(refresh)
+
+    def get_student_essays(self, username):
+        """특정 학생의 모든 에세이 데이터 가져오기 (Redis 캐싱)"""
+        try:
+            # 캐시 → Google Sheets 순서로 조회 (5분 후 백그라운드 갱신, 1시간 후 만료)
+            student_data = self._cached_fetch(
+                f"essays:{username}", lambda: self._fetch_student_essays(username),
+                soft_ttl=300, hard_ttl=3600,
+                snapshot=lambda: self._student_rows(
+                    self.snapshots.load("essays", filters=[('username', '==', username)]), username))
+
+            if not student_data and not self.sheet:
                 st.error("Google Sheets 연결이 되지 않았습니다.")
                 return pd.DataFrame()
 
-            # 2. Google Sheets에서 데이터 가져오기
-            essays_sheet = self.sheet.worksheet("논술데이터")
-            data = essays_sheet.get_all_records()
-
-            # 해당 학생의 데이터만 필터링
-            student_data = []
-            for row in data:
-                row_username = row.get('아이디') or row.get('username')
-                if row_username == username:
-                    # 실제 시트 구조에 맞게 매핑
-                    converted_row = {
-                        'username': row_username,
-                        'topic_name': row.get('이름', ''),  # 주제명
-                        'created_at': row.get('날짜', ''),  # 작성일
-                        'topic_description': row.get('주제', ''),  # 주제 설명
-                        'essay_text': row.get('논술문', ''),  # 실제 에세이 내용
-                        'total_score': row.get('점수', 0),  # 점수
-                        'feedback': row.get('피드백', '')  # 피드백
-                    }
-                    student_data.append(converted_row)
-
             if not student_data:
                 st.warning(f"{username}의 에세이 데이터가 없습니다.")
                 return pd.DataFrame()
 
-            df = pd.DataFrame(student_data)
+            return essay_frame(student_data)
 
-            # 데이터 타입 변환
-            if 'total_score' in df.columns:
-                # 점수에서 숫자만 추출
-                df['total_score'] = df['total_score'].astype(str).str.extract(r'(\d+)').astype(float)
+        except Exception as e:
+            st.error(f"데이터 로딩 오류: {e}")
+            return pd.DataFrame()
+
+    def get_students_essays(self, usernames):
+        """여러 학생의 에세이를 한 번에 가져오기 (교사용 화면 등)
+
+        캐시는 MGET 1회로 조회하고, 캐시에 없는 학생은 전체 스냅샷 1회로 채운 뒤
+        파이프라인 1회로 저장합니다.
+
+        Returns:
+            {학생 아이디: 에세이 DataFrame}
+        """
+        try:
+            keys = {username: f"essays:{username}" for username in usernames}
+            cached = self.cache.get_many_with_state(keys.values())
+
+            results = {}
+            missing = []
+            for username, cache_key in keys.items():
+                if cache_key in cached:
+                    student_data, is_fresh = cached[cache_key]
+                    results[username] = student_data
+                    if not is_fresh:
+                        self._schedule_refresh(cache_key, lambda u=username: self._fetch_student_essays(u),
+                                               soft_ttl=300, hard_ttl=3600)
+                else:
+                    missing.append(username)
 
-            # 날짜 컬럼 변환
-            if 'created_at' in df.columns:
-                df['created_at'] = pd.to_datetime(df['created_at'], errors='coerce')
+            if missing:
+                columns = self.get_all_essay_columns()
+                rows = {username: [] for username in missing}
+                for i, row_username in enumerate(columns.get('username', [])):
+                    if row_username in rows:
+                        rows[row_username].append(i)
+                by_student = {username: select_rows(columns, indices) for username, indices in rows.items()}
 
-            # 3. Redis 캐시에 저장 (5분)
-            self.cache.set(cache_key, student_data, ttl=300)
+                # 전체 에세이 값이 스냅샷/오래된 값이면 학생별 캐시도 오래된 값으로 저장 (다음 조회 때 갱신)
+                _, all_fresh = self.cache.peek_with_state("all_essays")
+                self.cache.set_many({keys[username]: data for username, data in by_student.items() if data},
+                                    ttl=3600, soft_ttl=300 if all_fresh else 0)
+                results.update(by_student)
 
-            return df
+            return {
+                username: essay_frame(student_data) if student_data else pd.DataFrame()
+                for username, student_data in results.items()
+            }
 
         except Exception as e:
-            st.error(f"데이터 로딩 오류: {e}")
-            return pd.DataFrame()
-    
+            st.error(f"여러 학생 데이터 로딩 오류: {e}")
+            return {}
+
+    def _fetch_student_essays(self, username):
+        """특정 학생의 에세이 열 목록 (신선한 전체 에세이 캐시 → Google Sheets 순서)
+
+        학생별 캐시가 비거나 오래되면 공용 전체 에세이 캐시가 신선할 때만 거기서 고릅니다.
+        전체 에세이 캐시가 스냅샷이나 soft TTL이 지난 값이면 시트를 다시 읽어 둘 다 갱신합니다.
+        (오래된 값을 고른 결과를 soft TTL 동안 신선한 값으로 저장하지 않도록)
+        """
+        cached_columns, is_fresh = self.cache.peek_with_state("all_essays")
+        if cached_columns is not None and is_fresh:
+            return self._student_rows(to_columns(cached_columns), username)
+        columns = self._load_and_store("all_essays", self._fetch_all_essays, soft_ttl=300, hard_ttl=3600)
+        return self._student_rows(to_columns(columns), username)
+
+    @staticmethod
+    def _student_rows(columns, username):
+        """전체 에세이 열 목록에서 해당 학생의 행만 선택 (essay_id = 시트 행 번호 포함)"""
+        if not columns:
+            return {}
+        indices = [i for i, row_username in enumerate(columns.get('username', [])) if row_username == username]
+        return select_rows(columns, indices)
+
+    def _sheet_columns(self, title, columns=ESSAY_COLUMNS):
+        """필요한 열만 읽기 (헤더 행으로 열 위치를 찾은 뒤 batch_get 1회)
+
+        Returns:
+            {필드: 값 목록} - 행마다 dict를 만들지 않는 열 단위 형식
+        """
+        def read():
+            header = self.sheet.values_get(f"{quote_title(title)}!1:1").get('values') or [[]]
+            ranges = resolve_ranges(title, header[0], columns)
+            if not ranges:
+                return {}
+            response = self.sheet.values_batch_get(list(ranges.values()),
+                                                   params={'majorDimension': 'COLUMNS'})
+            return decode_columns(list(ranges), response.get('valueRanges', []), columns)
+
+        # 같은 시트를 동시에 읽으면 요청 1회로 합침 (헤더 + batch_get = 2회)
+        return self.scheduler.call(f"columns:{title}:{','.join(columns)}", read, cost=2)
+
+    def get_sheet_values(self, title):
+        """워크시트 전체 셀 값 (스케줄러 경유)"""
+        return self.scheduler.call(f"values:{title}",
+                                   lambda: self.sheet.worksheet(title).get_all_values(), cost=2)
+
+    def get_all_essays(self):
+        """전체 학생의 에세이 레코드 스냅샷 (Redis 캐싱)"""
+        return to_records(self.get_all_essay_columns())
+
+    def get_all_essay_columns(self):
+        """전체 학생의 에세이 스냅샷 (열 단위 형식, Redis 캐싱)"""
+        try:
+            return self._all_essay_columns()
+
+        except Exception as e:
+            st.error(f"전체 에세이 로딩 오류: {e}")
+            return {}
+
+    def _all_essay_columns(self):
+        """전체 에세이 열 목록 (화면 출력 없음)"""
+        # 캐시 → Google Sheets 순서로 조회 (5분 후 백그라운드 갱신, 1시간 후 만료)
+        return to_columns(self._cached_fetch("all_essays", self._fetch_all_essays,
+                                             soft_ttl=300, hard_ttl=3600,
+                                             snapshot=lambda: self.snapshots.load("essays")))
+
+    def _fetch_all_essays(self):
+        """Google Sheets에서 전체 에세이 열 목록 가져오기 (essay_id는 시트 행 번호)"""
+        if not self.sheet:
+            return {}
+
+        # 점수/작성일은 가져올 때 한 번만 정규화 (캐시와 스냅샷에는 정규화된 값이 저장됨)
+        columns = normalize_columns(self._sheet_columns("논술데이터"))
+        if columns:
+            columns['essay_id'] = [f"row{row_number}" for row_number in range(2, row_count(columns) + 2)]  # 1행은 헤더
+            # 다음 재시작 때 바로 제공할 스냅샷 저장
+            self.snapshots.save("essays", columns)
+        return columns
+
+    def find_similar_essays(self, username, preprocessor, threshold=0.5, sentence_threshold=0.6):
+        """학생 에세이와 유사한 다른 학생의 에세이/문장 찾기 (MinHash/LSH)
+
+        에세이 전체가 비슷하지 않아도 문장 일부를 그대로 가져온 경우를 찾기 위해
+        문장 인덱스도 함께 조회합니다.
+
+        Returns:
+            [{'essay_id', 'topic_name', 'matches': [유사 에세이 정보],
+              'sentence_matches': [{'sentence', 'similarity', 'username', 'topic_name', ...}]}] 목록
+        """
+        essays = self.get_all_essays()
+        if not essays:
+            return []
+
+        snapshot_id = essay_fingerprint("".join(essay['essay_id'] + str(essay['essay_text']) for essay in essays))
+        index = _build_duplicate_index(snapshot_id, threshold, sentence_threshold, essays,
+                                       preprocessor.extract_essay_content)
+
+        results = []
+        for essay in essays:
+            if essay['username'] != username:
+                continue
+            text = preprocessor.extract_essay_content(essay['essay_text'])
+            if not text:
+                continue
+            matches = [
+                match for match in index.similar_essays(text, threshold, exclude=essay['essay_id'])
+                if match['username'] != username
+            ]
+            matched_essays = {match['essay_id'] for match in matches}
+            sentence_matches = []
+            for sentence in preprocessor.segmenter.sentences(text):
+                if len(sentence.split()) < MIN_SENTENCE_WORDS:
+                    continue
+                # 이미 에세이 단위로 찾은 글은 제외하고 문장당 가장 비슷한 1건만 표시
+                found = [
+                    match for match in index.similar_sentences(sentence, sentence_threshold, exclude_essay=essay['essay_id'])
+                    if match['username'] != username and match['essay_id'] not in matched_essays
+                ]
+                if found:
+                    best = max(found, key=lambda match: match['similarity'])
+                    sentence_matches.append(dict(best, sentence=sentence))
+            results.append({
+                'essay_id': essay['essay_id'],
+                'topic_name': essay['topic_name'],
+                'matches': matches,
+                'sentence_matches': sentence_matches
+            })
+        return results
+
     @st.cache_data(ttl=300, show_spinner=False)
     def get_combined_essay_text(_self, username):
         """학생의 모든 에세이를 하나의 텍스트로 합치기 (5분 캐싱)"""
@@ -126,49 +408,98 @@ class DataLoader:
             st.error(f"텍스트 합치기 오류: {e}")
             return ""
     
-    def get_all_students_list(self):
-        """전체 학생 목록 가져오기 (Redis 캐싱)"""
+    def get_student_aggregate(self, username, preprocessor):
+        """학생의 누적 텍스트 통계 집계 (에세이별 결과를 병합, Redis 캐싱)
+
+        에세이별 분석 결과는 내용 해시 키로 따로 저장되고, 학생 집계에는
+        이미 병합한 에세이 ID("시트 행:내용 해시") 목록이 함께 저장됩니다. 같은 내용을
+        다시 제출해도 행이 다르므로 따로 집계되고, 새 에세이가 추가되면 그 에세이
+        1편만 분석해서 기존 집계에 병합합니다.
+        """
         try:
-            # 1. Redis 캐시에서 먼저 확인
-            cache_key = "students:list"
-            cached_data = self.cache.get(cache_key)
+            essay_data = self.get_student_essays(username)
+            if essay_data.empty:
+                return EssayAggregate()
 
-            if cached_data is not None:
-                print(f"Cache HIT: {cache_key}")
-                return cached_data
+            # essay_id가 없는 이전 캐시는 학생 에세이 순번으로 구분
+            row_ids = essay_data['essay_id'] if 'essay_id' in essay_data.columns else range(len(essay_data))
+            essays = {}
+            for row_id, essay_text in zip(row_ids, essay_data['essay_text']):
+                if essay_text and not pd.isna(essay_text):
+                    essays[f"{row_id}:{essay_fingerprint(essay_text)}"] = essay_text
 
-            print(f"Cache MISS: {cache_key} - Fetching from Google Sheets")
+            cache_key = f"aggregate:{username}"
+            cached_data = self.cache.get(cache_key)
+            aggregate = EssayAggregate.from_dict(cached_data) if cached_data else EssayAggregate()
 
-            if not self.sheet:
-                return []
+            # 수정/삭제된 에세이가 있으면 에세이별 캐시로부터 다시 병합
+            if not set(aggregate.essay_ids).issubset(essays):
+                aggregate = EssayAggregate()
 
-            # 2. Google Sheets에서 학생 목록 가져오기
-            users_sheet = self.sheet.worksheet("사용자정보")
+            merged_ids = set(aggregate.essay_ids)
+            new_ids = [essay_id for essay_id in essays if essay_id not in merged_ids]
+            if not new_ids:
+                return aggregate
 
-            # 모든 데이터 가져오기
-            all_values = users_sheet.get_all_values()
+            for essay_id in new_ids:
+                aggregate.merge(self._get_essay_aggregate(essay_id, essays[essay_id], preprocessor))
 
-            if len(all_values) < 2:
-                return []
+            # 학생 집계 저장 (1일)
+            self.cache.set(cache_key, aggregate.to_dict(), ttl=86400)
+            return aggregate
 
-            # 학생 ID만 추출 (첫 번째 컬럼이 아이디)
-            students = []
-            for row in all_values[1:]:  # 헤더 제외
-                if row and len(row) > 0:  # 빈 행이 아닌 경우
-                    username = row[0].strip()  # 첫 번째 컬럼 (아이디)
-                    if username and username != 'teachertest1':
-                        students.append(username)
+        except Exception as e:
+            st.error(f"누적 통계 계산 오류: {e}")
+            return EssayAggregate()
 
-            students = sorted(students)
+    def _get_essay_aggregate(self, essay_id, essay_text, preprocessor):
+        """에세이 1편의 분석 결과 (내용 해시 키로 캐싱, 집계에는 essay_id로 기록)"""
+        cache_key = f"essay_stats:{essay_fingerprint(essay_text)}"
+        cached_data = self.cache.get(cache_key)
+        if cached_data is not None:
+            aggregate = EssayAggregate.from_dict(cached_data)
+        else:
+            aggregate = preprocessor.analyze_essay_aggregate(essay_text)
+            # 내용이 같으면 결과도 같으므로 길게 보관 (7일)
+            self.cache.set(cache_key, aggregate.to_dict(), ttl=604800)
 
-            # 3. Redis 캐시에 저장 (10분)
-            self.cache.set(cache_key, students, ttl=600)
+        # 같은 내용의 다른 행(재제출)도 따로 세도록 행 기준 ID로 교체
+        aggregate.essay_ids = [essay_id]
+        return aggregate
 
-            return students
+    def get_all_students_list(self):
+        """전체 학생 목록 가져오기 (Redis 캐싱)"""
+        try:
+            # 캐시 → Google Sheets 순서로 조회 (10분 후 백그라운드 갱신, 2시간 후 만료)
+            return self._cached_fetch("students:list", self._fetch_students_list,
+                                      soft_ttl=600, hard_ttl=7200,
+                                      snapshot=lambda: (self.snapshots.load("students") or {}).get('username')) or []
 
         except Exception as e:
             st.error(f"학생 목록 로딩 오류: {e}")
             return []
+
+    def _fetch_students_list(self):
+        """Google Sheets에서 학생 아이디 목록 가져오기"""
+        if not self.sheet:
+            return []
+
+        # 첫 번째 컬럼(아이디)만 가져오기 (헤더 제외)
+        response = self.scheduler.call(
+            "columns:사용자정보:A",
+            lambda: self.sheet.values_get(f"{quote_title('사용자정보')}!A2:A", params={'majorDimension': 'COLUMNS'}))
+        values = (response.get('values') or [[]])[0]
+
+        # 학생 ID만 추출
+        students = []
+        for value in values:
+            username = str(value).strip()
+            if username and username != 'teachertest1':
+                students.append(username)
+
+        students = sorted(students)
+        self.snapshots.save("students", {'username': students})
+        return students
     
     def test_connection(self):
         """연결 테스트"""
@@ -177,7 +508,7 @@ class DataLoader:
                 return False, "Google Sheets 연결 실패"
             
             # 시트에 접근해보기
-            worksheets = self.sheet.worksheets()
+            worksheets = self.scheduler.call("worksheets", self.sheet.worksheets)
             
             return True, f"연결 성공! 시트 수: {len(worksheets)}"
             
@@ -0,0 +1,157 @@
+import json
+import os
+
+import numpy as np
+import streamlit as st
+
+VECTORS_FILE = 'vectors.npy'
+VOCAB_FILE = 'vocab.json'
+
+
+class EmbeddingStore:
+    """메모리 매핑된 정적 단어 임베딩 저장소
+
+    GloVe 형식 텍스트 파일을 한 번만 변환해 두면(convert_glove), 이후에는
+    np.load(mmap_mode='r')로 열어서 벡터를 프로세스 메모리에 복사하지 않습니다.
+    여러 Streamlit 프로세스가 같은 파일을 열면 OS 페이지 캐시를 공유합니다.
+    벡터는 변환 시 L2 정규화되므로 내적이 곧 코사인 유사도입니다.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.vectors = np.load(os.path.join(directory, VECTORS_FILE), mmap_mode='r')
+        with open(os.path.join(directory, VOCAB_FILE), encoding='utf-8') as f:
+            self.words = json.load(f)
+        self.index = {word: i for i, word in enumerate(self.words)}
+
+    @staticmethod
+    def convert_glove(glove_path, output_dir, max_words=None):
+        """GloVe 텍스트 파일 → (정규화된 float32 .npy, 어휘 목록 .json) 변환
+
+        Args:
+            glove_path: "단어 값1 값2 ..." 형식의 텍스트 파일
+            output_dir: 변환 결과를 저장할 디렉터리
+            max_words: 앞에서부터 변환할 최대 단어 수 (빈도순 파일 기준)
+        """
+        rows = 0
+        dimension = None
+        with open(glove_path, encoding='utf-8') as f:
+            for line in f:
+                if dimension is None:
+                    dimension = len(line.rstrip().split(' ')) - 1
+                rows += 1
+                if max_words and rows >= max_words:
+                    break
+
+        if not rows:
+            raise ValueError(f"임베딩 파일이 비어 있습니다: {glove_path}")
+
+        os.makedirs(output_dir, exist_ok=True)
+        vectors = np.lib.format.open_memmap(os.path.join(output_dir, VECTORS_FILE), mode='w+',
+                                            dtype=np.float32, shape=(rows, dimension))
+        vocabulary = []
+        with open(glove_path, encoding='utf-8') as f:
+            for i, line in enumerate(f):
+                if i >= rows:
+                    break
+                parts = line.rstrip().split(' ')
+                vector = np.asarray(parts[1:], dtype=np.float32)
+                norm = np.linalg.norm(vector)
+                vectors[i] = vector / norm if norm > 0 else vector
+                vocabulary.append(parts[0])
+
+        vectors.flush()
+        del vectors
+        with open(os.path.join(output_dir, VOCAB_FILE), 'w', encoding='utf-8') as f:
+            json.dump(vocabulary, f, ensure_ascii=False)
+        return rows, dimension
+
+    @property
+    def dimension(self):
+        return self.vectors.shape[1]
+
+    def __len__(self):
+        return self.vectors.shape[0]
+
+    def __contains__(self, word):
+        return word in self.index
+
+    def lookup(self, words):
+        """단어 목록 → 벡터 행렬 (배치 조회, 사전에 없는 단어는 제외)
+
+        Returns:
+            (벡터 행렬 [k x dim], 찾은 단어 목록)
+        """
+        found = [word for word in words if word in self.index]
+        if not found:
+            return np.zeros((0, self.dimension), dtype=np.float32), []
+        rows = np.fromiter((self.index[word] for word in found), dtype=np.int64, count=len(found))
+        # 팬시 인덱싱은 필요한 행만 복사
+        return self.vectors[rows], found
+
+    def coverage(self, words):
+        """단어 목록 중 사전에 있는 단어 비율"""
+        words = list(words)
+        if not words:
+            return 0.0
+        return sum(1 for word in words if word in self.index) / len(words)
+
+    def sentence_centroid(self, words):
+        """단어 벡터 평균 (정규화된 중심 벡터, 찾은 단어가 없으면 None)"""
+        matrix, found = self.lookup(words)
+        if not found:
+            return None
+        centroid = matrix.mean(axis=0)
+        norm = np.linalg.norm(centroid)
+        return centroid / norm if norm > 0 else None
+
+    def centroid_similarity(self, words1, words2):
+        """두 단어 묶음의 중심 벡터 코사인 유사도"""
+        centroid1 = self.sentence_centroid(words1)
+        centroid2 = self.sentence_centroid(words2)
+        if centroid1 is None or centroid2 is None:
+            return 0.0
+        return float(np.dot(centroid1, centroid2))
+
+    def most_similar(self, word, top_n=5):
+        """가장 가까운 단어 목록 [(단어, 유사도)]"""
+        if word not in self.index:
+            return []
+        scores = self.vectors @ self.vectors[self.index[word]]
+        best = np.argpartition(-scores, min(top_n + 1, len(scores) - 1))[:top_n + 1]
+        ranked = sorted(best.tolist(), key=lambda i: -scores[i])
+        return [(self.words[i], float(scores[i])) for i in ranked if self.words[i] != word][:top_n]
+
+
+@st.cache_resource(show_spinner=False)
+def get_embedding_store():
+    """프로세스 전체에서 공유하는 임베딩 저장소 (EMBEDDINGS_DIR 미설정 시 None)"""
+    directory = None
+    try:
+        directory = st.secrets["EMBEDDINGS_DIR"]
+    except Exception:
+        directory = os.getenv("EMBEDDINGS_DIR")
+
+    if not directory or not os.path.exists(os.path.join(directory, VECTORS_FILE)):
+        return None
+
+    try:
+        store = EmbeddingStore(directory)
+        print(f"Embedding store loaded: {len(store)} words x {store.dimension} dims")
+        return store
+    except Exception as e:
+        print(f"Embedding store load error: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    # 사용법: python -m modules.embeddings glove.6B.100d.txt embeddings/ [최대 단어 수]
+    import sys
+
+    if len(sys.argv) < 3:
+        print("Usage: python -m modules.embeddings <glove.txt> <output_dir> [max_words]")
+        sys.exit(1)
+
+    limit = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    count, dims = EmbeddingStore.convert_glove(sys.argv[1], sys.argv[2], limit)
+    print(f"Converted {count} words x {dims} dims → {sys.argv[2]}")
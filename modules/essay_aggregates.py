@@ -0,0 +1,139 @@
+import hashlib
+import re
+
+import nltk
+
+from modules.sentence_segmenter import get_sentence_segmenter
+from modules.vocabulary_sketch import VocabularySketch
+
+# 복잡도 추정에 사용하는 접속사/연결어
+COMPLEX_INDICATORS = {'however', 'therefore', 'furthermore', 'although', 'because',
+                      'since', 'while', 'whereas', 'unless', 'though'}
+
+
+def essay_fingerprint(text: str) -> str:
+    """에세이 내용 기반 식별자 (같은 내용이면 같은 값)"""
+    return hashlib.sha1(str(text).encode('utf-8')).hexdigest()[:16]
+
+
+class EssayAggregate:
+    """병합 가능한 텍스트 통계 집계
+
+    에세이 1편의 분석 결과이면서 동시에 학생 전체의 누적 결과이기도 합니다.
+    모든 값이 개수/합계이므로 새 에세이가 추가되면 해당 에세이만 분석해서
+    merge()로 더하면 됩니다.
+    """
+
+    COUNT_FIELDS = ('essay_count', 'total_words', 'total_sentences', 'noun_count',
+                    'verb_count', 'adj_count', 'complex_indicators', 'word_length_sum')
+
+    def __init__(self):
+        for field in self.COUNT_FIELDS:
+            setattr(self, field, 0)
+        self.vocabulary = VocabularySketch()
+        self.essay_ids = []
+
+    @classmethod
+    def from_text(cls, text, essay_id=None):
+        """에세이 1편 분석 → 집계 객체
+
+        Args:
+            text: 분석할 텍스트 (정제된 에세이 본문)
+            essay_id: 에세이 식별자 (없으면 내용 해시 사용)
+        """
+        aggregate = cls()
+        aggregate.essay_ids.append(essay_id or essay_fingerprint(text or ''))
+        aggregate.essay_count = 1
+
+        if not text or not text.strip():
+            return aggregate
+
+        sentences = get_sentence_segmenter().sentences(text)
+        try:
+            words = nltk.word_tokenize(text.lower())
+            words = [word for word in words if word.isalpha() and len(word) >= 2]
+
+            if words:
+                pos_tagged = nltk.pos_tag(words)
+                aggregate.noun_count = sum(1 for word, pos in pos_tagged if pos.startswith('NN'))
+                aggregate.verb_count = sum(1 for word, pos in pos_tagged if pos.startswith('VB'))
+                aggregate.adj_count = sum(1 for word, pos in pos_tagged if pos.startswith('JJ'))
+        except Exception:
+            # NLTK가 없거나 오류 시 접미사 규칙 기반 추정
+            words = re.findall(r'\b[a-zA-Z]{2,}\b', text.lower())
+            aggregate.noun_count = sum(1 for word in words if word.endswith(('tion', 'sion', 'ment', 'ness', 'ity', 'ty', 'ence', 'ance')))
+            aggregate.verb_count = sum(1 for word in words if word.endswith(('ed', 'ing', 'ize', 'ise', 'ate')))
+            aggregate.adj_count = sum(1 for word in words if word.endswith(('ful', 'less', 'ous', 'ive', 'able', 'ible', 'al', 'ic')))
+
+        aggregate.total_words = len(words)
+        aggregate.total_sentences = len(sentences)
+        aggregate.complex_indicators = sum(1 for word in words if word in COMPLEX_INDICATORS)
+        aggregate.word_length_sum = sum(len(word) for word in words)
+        aggregate.vocabulary.update(words)
+        return aggregate
+
+    def merge(self, other):
+        """다른 집계를 현재 집계에 더하기 (제자리 병합)"""
+        for field in self.COUNT_FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        self.vocabulary.merge(other.vocabulary)
+        self.essay_ids.extend(other.essay_ids)
+        return self
+
+    def add_essay(self, text, essay_id=None):
+        """에세이 1편을 분석해서 누적 집계에 추가"""
+        return self.merge(EssayAggregate.from_text(text, essay_id))
+
+    @property
+    def unique_words(self):
+        return self.vocabulary.count()
+
+    def to_statistics(self):
+        """_calculate_text_statistics()와 같은 형식의 통계 반환"""
+        total_words = self.total_words
+        total_sentences = self.total_sentences
+
+        if total_words == 0:
+            return {
+                'total_words': 0,
+                'total_sentences': 0,
+                'unique_words': 0,
+                'vocabulary_diversity': 0,
+                'avg_sentence_length': 0,
+                'noun_ratio': 0,
+                'verb_ratio': 0,
+                'adj_ratio': 0,
+                'complexity_ratio': 0
+            }
+
+        unique_words = self.unique_words
+        complexity_ratio = min(100, (self.complex_indicators / total_sentences) * 50) if total_sentences else 0
+
+        return {
+            'total_words': total_words,
+            'total_sentences': total_sentences,
+            'unique_words': unique_words,
+            'vocabulary_diversity': unique_words / total_words,
+            'avg_sentence_length': total_words / total_sentences if total_sentences else 0,
+            'noun_ratio': (self.noun_count / total_words * 100),
+            'verb_ratio': (self.verb_count / total_words * 100),
+            'adj_ratio': (self.adj_count / total_words * 100),
+            'complexity_ratio': complexity_ratio
+        }
+
+    def to_dict(self):
+        """캐시 저장용 JSON 직렬화 가능한 dict"""
+        data = {field: getattr(self, field) for field in self.COUNT_FIELDS}
+        data['vocabulary'] = self.vocabulary.to_dict()
+        data['essay_ids'] = list(self.essay_ids)
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """to_dict() 결과로부터 복원"""
+        aggregate = cls()
+        for field in cls.COUNT_FIELDS:
+            setattr(aggregate, field, data.get(field, 0))
+        aggregate.vocabulary = VocabularySketch.from_dict(data.get('vocabulary', []))
+        aggregate.essay_ids = list(data.get('essay_ids', []))
+        return aggregate
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+# 캐시/스냅샷에 저장하는 작성일 형식 (정규화 후에는 항상 이 형식)
+CANONICAL_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 시트 작성일 형식 (앞에서부터 시도, 모두 실패한 값만 형식 추론)
+DATE_FORMATS = (CANONICAL_DATE_FORMAT, '%Y-%m-%d %H:%M', '%Y-%m-%d', '%Y/%m/%d %H:%M:%S', '%Y/%m/%d')
+
+# 범주형(category)으로 보관할 열
+CATEGORICAL_COLUMNS = ('username', 'topic_name')
+
+_SCORE_PATTERN = r'(-?\d+(?:\.\d+)?)'
+
+
+def parse_scores(values):
+    """점수 값 목록 → float Series (숫자는 그대로, '85점' 같은 문자열은 숫자 부분 추출)"""
+    series = pd.Series(values, dtype=object)
+    scores = pd.to_numeric(series, errors='coerce')
+    pending = scores.isna() & series.notna()
+    if pending.any():
+        extracted = series[pending].astype(str).str.extract(_SCORE_PATTERN, expand=False)
+        scores[pending] = pd.to_numeric(extracted, errors='coerce')
+    return scores.astype(float)
+
+
+def parse_dates(values):
+    """작성일 값 목록 → datetime Series
+
+    DATE_FORMATS 순서로 명시적 형식을 먼저 시도하고, 남은 값(예: '3/5/2024 14:10' 같은
+    시트 지역 형식)만 값별 형식 추론으로 변환합니다. 그래도 실패한 값 수는 로그로 남깁니다.
+    """
+    series = pd.Series(values, dtype=object)
+    text = series.where(series.notna(), '').astype(str).str.strip()
+    dates = pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]')
+    pending = text != ''
+    for date_format in DATE_FORMATS:
+        if not pending.any():
+            break
+        parsed = pd.to_datetime(text[pending], format=date_format, errors='coerce')
+        dates[pending] = parsed
+        pending = pending & dates.isna()
+
+    if pending.any():
+        dates[pending] = pd.to_datetime(text[pending], format='mixed', errors='coerce')
+        failed = int((pending & dates.isna()).sum())
+        if failed:
+            print(f"Date parse: {failed} value(s) not recognized (e.g. '{text[pending & dates.isna()].iloc[0]}')")
+    return dates
+
+
+def normalize_columns(columns):
+    """시트에서 읽은 열 목록을 한 번만 정규화 (캐시/스냅샷 저장 형식)
+
+    - total_score: float 또는 None
+    - created_at: CANONICAL_DATE_FORMAT 문자열 또는 None
+    """
+    if not columns:
+        return columns
+
+    normalized = dict(columns)
+    if 'total_score' in normalized:
+        scores = parse_scores(normalized['total_score'])
+        normalized['total_score'] = [None if np.isnan(score) else float(score) for score in scores.to_numpy()]
+    if 'created_at' in normalized:
+        dates = parse_dates(normalized['created_at'])
+        formatted = dates.dt.strftime(CANONICAL_DATE_FORMAT).tolist()
+        normalized['created_at'] = [value if valid else None
+                                    for value, valid in zip(formatted, dates.notna().tolist())]
+    return normalized
+
+
+def essay_frame(columns):
+    """에세이 열 목록(또는 이전 형식의 레코드 목록) → 타입이 지정된 DataFrame
+
+    정규화된 값은 첫 번째 날짜 형식/숫자 변환에서 바로 처리되므로 추가 비용이 거의 없고,
+    정규화 전 값(이전 캐시 등)도 같은 규칙으로 변환됩니다.
+    """
+    df = pd.DataFrame(columns)
+    if df.empty:
+        return df
+
+    if 'total_score' in df.columns and not pd.api.types.is_float_dtype(df['total_score']):
+        df['total_score'] = parse_scores(df['total_score'].tolist())
+    if 'created_at' in df.columns:
+        df['created_at'] = parse_dates(df['created_at'].tolist())
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    return df
@@ -0,0 +1,292 @@
+import configparser
+import operator
+import os
+import re
+from fnmatch import fnmatchcase
+
+import streamlit as st
+
+# 기본 규칙 파일 (GRAMMAR_RULES_FILE 설정으로 교체 가능)
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(__file__), 'grammar_rules.ini')
+
+# when 조건 비교 연산자
+COMPARISONS = {
+    '>': operator.gt, '>=': operator.ge, '<': operator.lt,
+    '<=': operator.le, '==': operator.eq, '!=': operator.ne
+}
+
+_CONDITION = re.compile(r'^count\s+(\S+)\s*(>=|<=|==|!=|>|<)\s*(\d+)$')
+
+# (단어, 태그)별 요소 판정 결과 캐시 크기
+_MASK_CACHE_SIZE = 50000
+
+
+class GrammarRuleError(ValueError):
+    """규칙 파일 문법 오류"""
+
+
+class _TokenTest:
+    """단어 1개에 대한 조건 (단어 또는 품사 태그, 대안은 |, 글자 와일드카드 *, 부정 !)"""
+
+    def __init__(self, source):
+        self.source = source
+        text = source
+        self.negate = text.startswith('!')
+        if self.negate:
+            text = text[1:]
+        self.on_tag = text.startswith('<') and text.endswith('>')
+        if self.on_tag:
+            text = text[1:-1]
+        else:
+            text = text.lower()
+        values = [value for value in text.split('|') if value]
+        if not values:
+            raise GrammarRuleError(f"빈 요소: '{source}'")
+        self.exact = frozenset(value for value in values if '*' not in value)
+        self.globs = tuple(value for value in values if '*' in value)
+
+    def __call__(self, word, tag):
+        value = tag if self.on_tag else word
+        matched = value in self.exact or any(fnmatchcase(value, glob) for glob in self.globs)
+        return matched != self.negate
+
+
+class _Pattern:
+    """컴파일된 패턴 1개: 단계 목록 [(요소 번호 또는 None(아무 단어), 앞에 ... 여부)]"""
+
+    def __init__(self, rule_index, steps, anchor_start, anchor_end, exception, source):
+        self.rule_index = rule_index
+        self.steps = steps
+        self.anchor_start = anchor_start
+        self.anchor_end = anchor_end
+        self.exception = exception  # unless 패턴 여부
+        self.source = source
+
+
+class GrammarRule:
+    """규칙 1개 (패턴/조건/예외 + 학생에게 보여줄 메시지)"""
+
+    def __init__(self, name, issue_type, description, suggestion, patterns, conditions, exceptions):
+        self.name = name
+        self.type = issue_type
+        self.description = description
+        self.suggestion = suggestion
+        self.patterns = patterns
+        self.conditions = conditions
+        self.exceptions = exceptions
+        self.compiled_conditions = []  # [(요소 번호, 비교 함수, 기준값)] - GrammarMatcher가 채움
+
+
+class GrammarMatcher:
+    """규칙 전체를 하나로 합친 단어/품사 유한 상태 매처
+
+    모든 규칙의 패턴(예외 패턴 포함)을 단계 목록으로 컴파일하고, 단어마다 필요한 요소 판정을
+    한 번씩만 한 뒤 활성 상태 집합을 함께 진행시킵니다. 규칙 수와 관계없이 문장의 토큰을
+    한 번만 훑으며, when 조건의 개수 세기도 같은 순회에서 처리합니다.
+    """
+
+    def __init__(self, rules, source=None):
+        self.rules = rules
+        self.source = source
+        self._tests = []
+        self._test_ids = {}
+        self._patterns = []
+        self._counters = []
+        for rule_index, rule in enumerate(rules):
+            for text in rule.patterns:
+                self._patterns.append(self._compile(rule_index, text, exception=False))
+            for text in rule.exceptions:
+                self._patterns.append(self._compile(rule_index, text, exception=True))
+            compiled = []
+            for element, compare, limit in rule.conditions:
+                compiled.append((self._test_id(element), compare, limit))
+            rule.compiled_conditions = compiled
+            for test_id, _, _ in compiled:
+                if test_id not in self._counters:
+                    self._counters.append(test_id)
+
+        # 첫 단계의 요소별 시작 패턴 (해당 요소가 맞는 단어에서만 새 상태 생성)
+        self._starts = {}
+        for pattern_index, pattern in enumerate(self._patterns):
+            self._starts.setdefault(pattern.steps[0][0], []).append(pattern_index)
+        self._mask_cache = {}
+
+    def _test_id(self, source):
+        test_id = self._test_ids.get(source)
+        if test_id is None:
+            test_id = len(self._tests)
+            self._tests.append(_TokenTest(source))
+            self._test_ids[source] = test_id
+        return test_id
+
+    def _compile(self, rule_index, text, exception):
+        elements = text.split()
+        anchor_start = bool(elements) and elements[0] == '^'
+        anchor_end = bool(elements) and elements[-1] == '$'
+        elements = elements[1 if anchor_start else 0:len(elements) - 1 if anchor_end else len(elements)]
+
+        steps = []
+        gap = False
+        for element in elements:
+            if element == '...':
+                gap = True
+                continue
+            steps.append((None if element == '*' else self._test_id(element), gap))
+            gap = False
+        if not steps or steps[0][1] or gap:
+            raise GrammarRuleError(f"패턴은 단어로 시작하고 끝나야 합니다: '{text}'")
+
+        return _Pattern(rule_index, steps, anchor_start, anchor_end, exception, text)
+
+    def _mask(self, word, tag):
+        """(단어, 태그)가 만족하는 요소 비트마스크"""
+        key = (word, tag)
+        mask = self._mask_cache.get(key)
+        if mask is None:
+            mask = 0
+            for test_id, test in enumerate(self._tests):
+                if test(word, tag):
+                    mask |= 1 << test_id
+            if len(self._mask_cache) >= _MASK_CACHE_SIZE:
+                self._mask_cache.clear()
+            self._mask_cache[key] = mask
+        return mask
+
+    def match(self, tagged):
+        """문장 1개 검사
+
+        Args:
+            tagged: [(단어, 태그)] 목록
+        Returns:
+            [(규칙, (시작 토큰, 끝 토큰) 또는 None)] - 규칙 파일 순서, 규칙마다 최대 1건
+        """
+        patterns = self._patterns
+        found = {}        # 규칙 번호 → 첫 매치 토큰 범위
+        excepted = set()  # 예외 패턴이 맞은 규칙 번호
+        counts = dict.fromkeys(self._counters, 0)
+        active = {}       # (패턴 번호, 다음 단계) → 시작 토큰
+        # $ 는 문장 끝 문장 부호('.', '!', '"' 등)를 건너뛴 마지막 단어 위치
+        last = len(tagged) - 1
+        while last > 0 and not any(ch.isalnum() for ch in tagged[last][0]):
+            last -= 1
+
+        for position, (word, tag) in enumerate(tagged):
+            mask = self._mask(word.lower(), tag)
+            for test_id in counts:
+                if mask >> test_id & 1:
+                    counts[test_id] += 1
+
+            candidates = list(active.items())
+            active = {}
+            for test_id, pattern_indices in self._starts.items():
+                if test_id is None or mask >> test_id & 1:
+                    for pattern_index in pattern_indices:
+                        if position == 0 or not patterns[pattern_index].anchor_start:
+                            candidates.append(((pattern_index, 0), position))
+
+            for (pattern_index, step), start in candidates:
+                pattern = patterns[pattern_index]
+                rule_index = pattern.rule_index
+                if rule_index in excepted or (not pattern.exception and rule_index in found):
+                    continue
+                test_id, _ = pattern.steps[step]
+                if test_id is None or mask >> test_id & 1:
+                    if step + 1 == len(pattern.steps):
+                        if not pattern.anchor_end or position >= last:
+                            if pattern.exception:
+                                excepted.add(rule_index)
+                            else:
+                                found[rule_index] = (start, position + 1)
+                            continue
+                    else:
+                        _keep(active, (pattern_index, step + 1), start)
+                # ... 앞의 단계는 맞지 않아도(또는 맞아도) 계속 대기
+                if step > 0 and pattern.steps[step][1]:
+                    _keep(active, (pattern_index, step), start)
+
+        results = []
+        for rule_index, rule in enumerate(self.rules):
+            if rule_index in excepted:
+                continue
+            if rule.patterns and rule_index not in found:
+                continue
+            if not all(compare(counts[test_id], limit) for test_id, compare, limit in rule.compiled_conditions):
+                continue
+            results.append((rule, found.get(rule_index)))
+        return results
+
+
+def _keep(active, state, start):
+    """같은 상태는 가장 앞에서 시작한 것만 유지"""
+    if state not in active or start < active[state]:
+        active[state] = start
+
+
+def _lines(value):
+    return [line.strip() for line in (value or '').splitlines() if line.strip()]
+
+
+def parse_rules(text, source='<rules>'):
+    """규칙 파일 내용 → GrammarMatcher (문법 오류 시 GrammarRuleError)"""
+    parser = configparser.ConfigParser(interpolation=None, comment_prefixes=('#',), inline_comment_prefixes=None)
+    try:
+        parser.read_string(text, source=source)
+    except configparser.Error as e:
+        raise GrammarRuleError(str(e)) from e
+
+    rules = []
+    for name in parser.sections():
+        section = parser[name]
+        conditions = []
+        for line in _lines(section.get('when')):
+            match = _CONDITION.match(line)
+            if not match:
+                raise GrammarRuleError(f"[{name}] when 형식 오류: '{line}' (예: count <VBD> >= 1)")
+            conditions.append((match.group(1), COMPARISONS[match.group(2)], int(match.group(3))))
+        patterns = _lines(section.get('pattern'))
+        if not patterns and not conditions:
+            raise GrammarRuleError(f"[{name}] pattern 또는 when 이 필요합니다")
+        rules.append(GrammarRule(
+            name=name,
+            issue_type=section.get('type', name),
+            description=section.get('description', name),
+            suggestion=section.get('suggestion', ''),
+            patterns=patterns,
+            conditions=conditions,
+            exceptions=_lines(section.get('unless'))
+        ))
+
+    try:
+        return GrammarMatcher(rules, source)
+    except GrammarRuleError as e:
+        raise GrammarRuleError(f"{source}: {e}") from e
+
+
+def load_rules(path=DEFAULT_RULES_FILE):
+    """규칙 파일 → GrammarMatcher"""
+    with open(path, encoding='utf-8') as f:
+        return parse_rules(f.read(), path)
+
+
+@st.cache_resource(show_spinner=False)
+def _cached_rules(path, modified):
+    return load_rules(path)
+
+
+def get_grammar_matcher():
+    """공용 문법 규칙 매처 (GRAMMAR_RULES_FILE, 파일이 수정되면 다시 컴파일)
+
+    규칙 파일에 오류가 있으면 기본 규칙 파일을 사용합니다.
+    """
+    try:
+        path = st.secrets["GRAMMAR_RULES_FILE"]
+    except Exception:
+        path = os.getenv("GRAMMAR_RULES_FILE", DEFAULT_RULES_FILE)
+
+    try:
+        return _cached_rules(path, os.path.getmtime(path))
+    except Exception as e:
+        if path == DEFAULT_RULES_FILE:
+            raise
+        print(f"Grammar rules error ({e}) - using default rules")
+        return _cached_rules(DEFAULT_RULES_FILE, os.path.getmtime(DEFAULT_RULES_FILE))
@@ -0,0 +1,221 @@
+import hashlib
+import re
+from collections import defaultdict
+
+import numpy as np
+
+from modules.sentence_segmenter import get_sentence_segmenter
+
+# 2^32 보다 큰 최소 소수 (a*x + b 계산이 uint64 범위를 넘지 않음)
+_PRIME = np.uint64(4294967311)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+_WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+# 문장 인덱스에 넣을 최소 단어 수 (짧은 관용구 제외)
+MIN_SENTENCE_WORDS = 6
+
+
+def _hash32(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest(), 'big')
+
+
+class MinHasher:
+    """단어 n-gram 기반 MinHash 서명 생성기
+
+    두 서명에서 값이 같은 위치의 비율이 원문 shingle 집합의 Jaccard 유사도 추정값입니다.
+    """
+
+    def __init__(self, num_perm=128, shingle_size=3, seed=42):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, 2 ** 32 - 1, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, 2 ** 32 - 1, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text):
+        """텍스트 → 단어 n-gram 집합 (n보다 짧은 텍스트는 전체를 1개 shingle로 사용)"""
+        words = _WORD_PATTERN.findall(str(text).lower())
+        n = self.shingle_size
+        if len(words) < n:
+            return {' '.join(words)} if words else set()
+        return {' '.join(words[i:i + n]) for i in range(len(words) - n + 1)}
+
+    def signature(self, text):
+        """텍스트의 MinHash 서명 (uint64 배열, 빈 텍스트는 None)"""
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+
+        hashed = np.fromiter((_hash32(s) for s in shingles), dtype=np.uint64, count=len(shingles))
+        permuted = (np.outer(hashed, self._a) + self._b) % _PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+    @staticmethod
+    def jaccard(signature1, signature2):
+        """두 서명의 Jaccard 유사도 추정값"""
+        return float(np.mean(signature1 == signature2))
+
+
+def lsh_bands(num_perm, threshold):
+    """유사도 기준에 맞는 구간 수
+
+    num_perm을 나누어 떨어지게 하는 (bands, rows) 중 후보 기준 유사도 (1/bands)^(1/rows)가
+    threshold 이하인 것 가운데 가장 높은 것을 고릅니다. 후보는 정확한 서명 비교로 다시 거르므로
+    기준보다 조금 낮게 잡아 놓치는 항목이 없도록 합니다. (128개 기준 0.5 → 32 × 4)
+    """
+    best = num_perm
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows == 0 and (rows / num_perm) ** (1 / rows) <= threshold:
+            best = num_perm // rows
+    return best
+
+
+class LSHIndex:
+    """MinHash 서명용 LSH(Locality Sensitive Hashing) 인덱스
+
+    서명을 bands개 구간으로 나눠 구간별 버킷에 넣고, 한 구간이라도 같은
+    항목만 후보로 비교합니다. 전체 쌍 비교 없이 유사 항목을 찾을 수 있습니다.
+    (유사도 약 (1/bands)^(1/rows) 이상에서 후보가 될 확률이 급격히 높아짐)
+    bands를 지정하지 않으면 threshold에 맞춰 lsh_bands()로 정합니다.
+    """
+
+    def __init__(self, num_perm=128, bands=None, threshold=0.5):
+        if bands is None:
+            bands = lsh_bands(num_perm, threshold)
+        if num_perm % bands != 0:
+            raise ValueError("num_perm은 bands로 나누어 떨어져야 합니다")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.buckets = [defaultdict(list) for _ in range(bands)]
+        self.signatures = {}
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def insert(self, key, signature):
+        """서명 추가"""
+        if signature is None:
+            return
+        self.signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self.buckets[band][band_key].append(key)
+
+    def candidates(self, signature):
+        """같은 버킷에 들어간 후보 키 집합"""
+        found = set()
+        if signature is None:
+            return found
+        for band, band_key in self._band_keys(signature):
+            found.update(self.buckets[band].get(band_key, ()))
+        return found
+
+    def query(self, signature, threshold=0.7, exclude=None):
+        """유사도 threshold 이상인 항목 [(키, 유사도)] (유사도 내림차순)"""
+        results = []
+        for key in self.candidates(signature):
+            if key == exclude:
+                continue
+            similarity = MinHasher.jaccard(signature, self.signatures[key])
+            if similarity >= threshold:
+                results.append((key, similarity))
+        return sorted(results, key=lambda x: x[1], reverse=True)
+
+    def near_duplicate_pairs(self, threshold=0.7):
+        """인덱스 전체에서 유사도 threshold 이상인 쌍 목록"""
+        seen = set()
+        pairs = []
+        for band_buckets in self.buckets:
+            for keys in band_buckets.values():
+                if len(keys) < 2:
+                    continue
+                for i, key1 in enumerate(keys):
+                    for key2 in keys[i + 1:]:
+                        pair = (key1, key2) if str(key1) <= str(key2) else (key2, key1)
+                        if pair in seen:
+                            continue
+                        seen.add(pair)
+                        similarity = MinHasher.jaccard(self.signatures[key1], self.signatures[key2])
+                        if similarity >= threshold:
+                            pairs.append((pair[0], pair[1], similarity))
+        return sorted(pairs, key=lambda x: x[2], reverse=True)
+
+    def __len__(self):
+        return len(self.signatures)
+
+
+class EssayDuplicateIndex:
+    """전체 논술데이터 스냅샷에 대한 에세이/문장 단위 유사 문서 인덱스"""
+
+    def __init__(self, num_perm=128, threshold=0.5, sentence_threshold=0.6):
+        """
+        Args:
+            threshold: 에세이 조회 유사도 기준 (LSH 구간 수를 이 값에 맞춤)
+            sentence_threshold: 문장 조회 유사도 기준 (문장 인덱스의 LSH 구간 수를 이 값에 맞춤)
+        """
+        self.essay_hasher = MinHasher(num_perm=num_perm, shingle_size=3)
+        self.sentence_hasher = MinHasher(num_perm=num_perm, shingle_size=2)
+        self.essay_index = LSHIndex(num_perm=num_perm, threshold=threshold)
+        self.sentence_index = LSHIndex(num_perm=num_perm, threshold=sentence_threshold)
+        self.essays = {}
+
+    @classmethod
+    def build(cls, essays, text_cleaner=None, min_sentence_words=MIN_SENTENCE_WORDS, **kwargs):
+        """에세이 레코드 목록으로 인덱스 생성
+
+        Args:
+            essays: {'essay_id', 'username', 'topic_name', 'essay_text'} dict 목록
+            text_cleaner: 본문 정제 함수 (예: TextPreprocessor.extract_essay_content)
+            min_sentence_words: 문장 인덱스에 넣을 최소 단어 수 (짧은 관용구 제외)
+        """
+        index = cls(**kwargs)
+        for essay in essays:
+            text = essay.get('essay_text', '')
+            if text_cleaner:
+                text = text_cleaner(text)
+            if not text:
+                continue
+            index.add_essay(essay['essay_id'], text, essay, min_sentence_words)
+        return index
+
+    def add_essay(self, essay_id, text, metadata=None, min_sentence_words=MIN_SENTENCE_WORDS):
+        """에세이 1편과 그 문장들을 인덱스에 추가"""
+        self.essays[essay_id] = {
+            'username': (metadata or {}).get('username', ''),
+            'topic_name': (metadata or {}).get('topic_name', '')
+        }
+        self.essay_index.insert(essay_id, self.essay_hasher.signature(text))
+
+        # 분석과 같은 문장 분리 서비스 사용 (조회 쪽도 같은 기준으로 나눔)
+        for position, sentence in enumerate(get_sentence_segmenter().sentences(text)):
+            if len(sentence.split()) >= min_sentence_words:
+                self.sentence_index.insert((essay_id, position), self.sentence_hasher.signature(sentence))
+
+    def similar_essays(self, text, threshold=0.5, exclude=None):
+        """주어진 텍스트와 유사한 에세이 목록"""
+        signature = self.essay_hasher.signature(text)
+        return [
+            dict(self.essays[essay_id], essay_id=essay_id, similarity=similarity)
+            for essay_id, similarity in self.essay_index.query(signature, threshold, exclude)
+        ]
+
+    def similar_sentences(self, sentence, threshold=0.6, exclude_essay=None):
+        """주어진 문장과 유사한 다른 에세이의 문장 목록"""
+        signature = self.sentence_hasher.signature(sentence)
+        results = []
+        for (essay_id, position), similarity in self.sentence_index.query(signature, threshold):
+            if essay_id == exclude_essay:
+                continue
+            results.append(dict(self.essays[essay_id], essay_id=essay_id,
+                                sentence_index=position, similarity=similarity))
+        return results
+
+    def near_duplicate_essays(self, threshold=0.7):
+        """서로 다른 학생 사이의 유사 에세이 쌍 목록"""
+        return [
+            (essay1, essay2, similarity)
+            for essay1, essay2, similarity in self.essay_index.near_duplicate_pairs(threshold)
+            if self.essays[essay1]['username'] != self.essays[essay2]['username']
+        ]
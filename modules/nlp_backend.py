@@ -0,0 +1,132 @@
+import os
+
+import nltk
+import streamlit as st
+
+from modules.sentence_segmenter import get_sentence_segmenter
+
+# 사용할 수 있는 백엔드 이름
+BACKENDS = ('nltk', 'spacy')
+
+DEFAULT_SPACY_MODEL = 'en_core_web_sm'
+
+
+def _rule_tag(words):
+    """NLTK 태거를 쓸 수 없을 때의 간단한 규칙 기반 태깅"""
+    return [(word, 'NN' if word[0].isupper() else 'VB' if word.endswith('ed') else 'JJ' if word.endswith('ly') else 'NN')
+            for word in words if word.isalpha()]
+
+
+class NLTKBackend:
+    """NLTK 품사 태깅 (문장 분리는 공용 서비스, 문서의 모든 문장을 pos_tag_sents로 한 번에 태깅)"""
+
+    name = 'nltk'
+
+    def __init__(self, segmenter=None):
+        self.segmenter = segmenter or get_sentence_segmenter()
+
+    def sentences(self, text):
+        """문장 목록 (공용 문장 분리 서비스)"""
+        return self.segmenter.sentences(text)
+
+    def tag_sentences(self, text):
+        """문서 1개 → 문장별 [(단어, 태그)] 목록"""
+        sentences = self.sentences(text)
+        try:
+            return nltk.pos_tag_sents([nltk.word_tokenize(sentence) for sentence in sentences])
+        except Exception:
+            # NLTK가 실패하면 간단한 단어 분리 및 기본 태깅
+            return [_rule_tag(sentence.split()) for sentence in sentences]
+
+    def tag(self, text):
+        """문서 1개 → [(단어, 태그)] (문장 구분 없이)"""
+        return [pair for sentence in self.tag_sentences(text) for pair in sentence]
+
+    def tag_many(self, texts):
+        """여러 문서 → 문서별 tag_sentences() 결과"""
+        return [self.tag_sentences(text) for text in texts]
+
+
+class SpacyBackend:
+    """spaCy 기반 문장 분리 + 품사 태깅
+
+    개체명 인식/표제어 추출 등 필요 없는 구성요소는 불러오지 않고, 문장 분리는 parser 대신
+    가벼운 senter를 사용합니다. 여러 문서는 nlp.pipe로 묶어서(batch_size) 처리하며
+    n_process > 1이면 여러 프로세스로 나눠 처리합니다. 태그는 NLTK와 같은 Penn Treebank 태그(token.tag_)입니다.
+    """
+
+    name = 'spacy'
+
+    def __init__(self, model=DEFAULT_SPACY_MODEL, batch_size=64, n_process=1):
+        import spacy
+
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.nlp = spacy.load(model, exclude=['ner', 'lemmatizer', 'textcat'])
+        if 'senter' in self.nlp.pipe_names or 'senter' in self.nlp.disabled:
+            if 'parser' in self.nlp.pipe_names:
+                self.nlp.disable_pipe('parser')
+            if 'senter' in self.nlp.disabled:
+                self.nlp.enable_pipe('senter')
+        elif 'parser' not in self.nlp.pipe_names:
+            self.nlp.add_pipe('sentencizer')
+
+    @staticmethod
+    def _doc_sentences(doc):
+        return [[(token.text, token.tag_) for token in sentence if not token.is_space] for sentence in doc.sents]
+
+    def sentences(self, text):
+        """문장 목록"""
+        return [sentence.text.strip() for sentence in self.nlp(text).sents if sentence.text.strip()]
+
+    def tag_sentences(self, text):
+        """문서 1개 → 문장별 [(단어, 태그)] 목록"""
+        return self._doc_sentences(self.nlp(text))
+
+    def tag(self, text):
+        """문서 1개 → [(단어, 태그)] (문장 구분 없이)"""
+        return [pair for sentence in self.tag_sentences(text) for pair in sentence]
+
+    def tag_many(self, texts):
+        """여러 문서 → 문서별 tag_sentences() 결과 (nlp.pipe 배치 처리)"""
+        docs = self.nlp.pipe(texts, batch_size=self.batch_size, n_process=self.n_process)
+        return [self._doc_sentences(doc) for doc in docs]
+
+
+def create_backend(name='nltk', **options):
+    """이름으로 백엔드 생성 (spaCy나 모델이 없으면 NLTK로 대체)
+
+    Args:
+        name: 'nltk' 또는 'spacy'
+        options: SpacyBackend 옵션 (model, batch_size, n_process)
+    """
+    if name == 'spacy':
+        try:
+            return SpacyBackend(**options)
+        except Exception as e:
+            print(f"spaCy backend unavailable ({e}) - falling back to NLTK")
+    elif name != 'nltk':
+        print(f"Unknown NLP backend '{name}' - using NLTK")
+    return NLTKBackend()
+
+
+def _get_setting(name, default=None):
+    try:
+        return st.secrets[name]
+    except Exception:
+        return os.getenv(name, default)
+
+
+@st.cache_resource(show_spinner=False)
+def get_nlp_backend():
+    """프로세스 전체에서 공유하는 NLP 백엔드 (NLP_BACKEND, SPACY_MODEL, SPACY_N_PROCESS 설정)"""
+    name = str(_get_setting("NLP_BACKEND", "nltk")).lower()
+    options = {}
+    if name == 'spacy':
+        options = {
+            'model': _get_setting("SPACY_MODEL", DEFAULT_SPACY_MODEL),
+            'n_process': int(_get_setting("SPACY_N_PROCESS", 1))
+        }
+    backend = create_backend(name, **options)
+    print(f"NLP backend: {backend.name}")
+    return backend
@@ -0,0 +1,167 @@
+import os
+import time
+from difflib import SequenceMatcher
+
+import pandas as pd
+
+from modules.nlp_backend import create_backend
+from modules.sentence_segmenter import create_segmenter
+
+# 기본 코퍼스: 데이터 로더가 저장한 에세이 스냅샷
+DEFAULT_CORPUS = os.path.join('.snapshots', 'essays.parquet')
+
+
+def load_corpus(path=DEFAULT_CORPUS, limit=None):
+    """벤치마크용 에세이 본문 목록 (평가 결과 부분 제외)
+
+    Args:
+        path: 에세이 스냅샷(.parquet), essay_text 열이 있는 .csv, 또는 .txt 파일 디렉터리
+        limit: 최대 에세이 수
+    """
+    if os.path.isdir(path):
+        texts = []
+        for name in sorted(os.listdir(path)):
+            if name.endswith('.txt'):
+                with open(os.path.join(path, name), encoding='utf-8') as f:
+                    texts.append(f.read())
+    elif path.endswith('.parquet'):
+        texts = pd.read_parquet(path, columns=['essay_text'])['essay_text'].tolist()
+    else:
+        texts = pd.read_csv(path)['essay_text'].tolist()
+
+    from modules.preprocessor import TextPreprocessor
+
+    extract = TextPreprocessor.extract_essay_content
+    cleaned = [extract(text) for text in texts]
+    cleaned = [text for text in cleaned if text]
+    return cleaned[:limit] if limit else cleaned
+
+
+def tag_agreement(reference, candidate):
+    """두 태깅 결과의 품사 일치율
+
+    토큰화가 달라도 비교할 수 있도록 단어 순서를 SequenceMatcher로 맞춘 뒤,
+    같은 단어로 정렬된 토큰에 대해 세부 태그 / 대분류(앞 2글자, 예: VBD → VB) 일치를 셉니다.
+
+    Returns:
+        (정렬된 토큰 수, 세부 태그 일치 수, 대분류 일치 수)
+    """
+    matcher = SequenceMatcher(None, [word for word, _ in reference], [word for word, _ in candidate], autojunk=False)
+    aligned = exact = coarse = 0
+    for block in matcher.get_matching_blocks():
+        for offset in range(block.size):
+            left = reference[block.a + offset][1]
+            right = candidate[block.b + offset][1]
+            aligned += 1
+            exact += left == right
+            coarse += left[:2] == right[:2]
+    return aligned, exact, coarse
+
+
+def run(texts, backends):
+    """백엔드별 처리 속도와 첫 번째 백엔드 대비 태그 일치율
+
+    Returns:
+        [{'backend', 'documents', 'tokens', 'seconds', 'tokens_per_sec',
+          'aligned_tokens', 'tag_agreement', 'coarse_agreement'}]
+    """
+    results = []
+    reference = None
+    for backend in backends:
+        started = time.perf_counter()
+        tagged = [[pair for sentence in document for pair in sentence] for document in backend.tag_many(texts)]
+        seconds = time.perf_counter() - started
+        tokens = sum(len(document) for document in tagged)
+
+        row = {
+            'backend': backend.name,
+            'documents': len(texts),
+            'tokens': tokens,
+            'seconds': round(seconds, 3),
+            'tokens_per_sec': round(tokens / seconds) if seconds else 0
+        }
+        if reference is None:
+            reference = tagged
+        else:
+            aligned = exact = coarse = 0
+            for left, right in zip(reference, tagged):
+                counts = tag_agreement(left, right)
+                aligned += counts[0]
+                exact += counts[1]
+                coarse += counts[2]
+            row['aligned_tokens'] = aligned
+            row['tag_agreement'] = round(exact / aligned, 4) if aligned else 0.0
+            row['coarse_agreement'] = round(coarse / aligned, 4) if aligned else 0.0
+        results.append(row)
+    return results
+
+
+def boundary_scores(reference, candidate):
+    """문장 경계(문장 끝 문자 위치) 기준 정밀도/재현율/F1 (문서 끝 경계는 제외)
+
+    Args:
+        reference, candidate: 문서별 [(시작, 끝)] 목록의 목록
+    """
+    true_positive = predicted = expected = 0
+    for left, right in zip(reference, candidate):
+        left_ends = {end for _, end in left[:-1]}
+        right_ends = {end for _, end in right[:-1]}
+        true_positive += len(left_ends & right_ends)
+        expected += len(left_ends)
+        predicted += len(right_ends)
+    precision = true_positive / predicted if predicted else 1.0
+    recall = true_positive / expected if expected else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def run_segmenters(texts, segmenters):
+    """문장 분리기별 처리 속도와 첫 번째 분리기(punkt) 대비 경계 F1
+
+    Returns:
+        [{'segmenter', 'documents', 'sentences', 'seconds', 'docs_per_sec',
+          'precision', 'recall', 'boundary_f1'}]
+    """
+    results = []
+    reference = None
+    for segmenter in segmenters:
+        started = time.perf_counter()
+        spans = [segmenter.span_tokenize(text) for text in texts]
+        seconds = time.perf_counter() - started
+
+        row = {
+            'segmenter': segmenter.name,
+            'documents': len(texts),
+            'sentences': sum(len(document) for document in spans),
+            'seconds': round(seconds, 4),
+            'docs_per_sec': round(len(texts) / seconds) if seconds else 0
+        }
+        if reference is None:
+            reference = spans
+        else:
+            precision, recall, f1 = boundary_scores(reference, spans)
+            row.update(precision=round(precision, 4), recall=round(recall, 4), boundary_f1=round(f1, 4))
+        results.append(row)
+    return results
+
+
+if __name__ == "__main__":
+    # 사용법: python -m modules.nlp_benchmark [코퍼스 경로] [최대 에세이 수] [spaCy 프로세스 수]
+    import sys
+
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CORPUS
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    n_process = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+
+    texts = load_corpus(path, limit)
+    print(f"Corpus: {len(texts)} essays from {path}")
+
+    backends = [create_backend('nltk')]
+    spacy_backend = create_backend('spacy', n_process=n_process)
+    if spacy_backend.name == 'spacy':
+        backends.append(spacy_backend)
+
+    print(pd.DataFrame(run(texts, backends)).to_string(index=False))
+
+    print()
+    print(pd.DataFrame(run_segmenters(texts, [create_segmenter('punkt'), create_segmenter('regex')])).to_string(index=False))
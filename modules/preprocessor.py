@@ -3,6 +3,18 @@ import nltk
 import re
 from collections import Counter
 import pandas as pd
+import numpy as np
+from modules.essay_aggregates import EssayAggregate
+from modules.sentence_similarity import SentenceSimilarityEngine
+from modules.embeddings import get_embedding_store
+from modules.word_normalizer import get_word_normalizer
+from modules.token_store import TokenDocument
+from modules.analysis_results import IssueReport
+from modules.nlp_backend import get_nlp_backend
+from modules.sentence_segmenter import get_sentence_segmenter
+from modules.grammar_rules import get_grammar_matcher
+from modules.sampled_analysis import DEFAULT_TIME_BUDGET, fast_writing_analysis
+from modules.time_budget import TimeBudget, current_deadline, get_analysis_time_budget
 
 # NLTK 데이터 다운로드 (안정화 버전)
 @st.cache_resource
@@ -58,6 +70,16 @@ def download_nltk_data():
         st.error(f"NLTK 데이터 다운로드 오류: {e}")
         return False
 
+# 문법 분석 시 한 번에 태깅하는 문장 수 (묶음마다 시간 제한 확인)
+GRAMMAR_CHUNK_SENTENCES = 64
+
+# 어휘 분석 시 한 번에 세는 단어 수 (묶음마다 시간 제한 확인)
+VOCABULARY_CHUNK_WORDS = 5000
+
+# 시간 제한이 있을 때 문장 유사도(TF-IDF)를 계산하는 최대 문장 수 (앞부분만 분석)
+SIMILARITY_MAX_SENTENCES = 2000
+
+
 class TextPreprocessor:
     def __init__(self):
         # NLTK 데이터 다운로드
@@ -69,9 +91,16 @@ class TextPreprocessor:
         except:
             # 기본 불용어 리스트
             self.stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his', 'her', 'its', 'our', 'their'}
+        
+        # 공용 문장 분리 서비스 (SENTENCE_SEGMENTER 설정: regex / punkt, 문서별 경계 캐시)
+        self.segmenter = get_sentence_segmenter()
+        
+        # 문장 분리 + 품사 태깅 백엔드 (NLP_BACKEND 설정: nltk / spacy)
+        self.nlp = get_nlp_backend()
     
-    def extract_essay_content(self, text):
-        """에세이 내용만 추출 (평가 결과 부분 제외)"""
+    @staticmethod
+    def extract_essay_content(text):
+        """에세이 내용만 추출 (평가 결과 부분 제외, 인스턴스 없이도 호출 가능)"""
         if not text or pd.isna(text):
             return ""
         
@@ -162,11 +191,8 @@ class TextPreprocessor:
             return ""
         
         try:
-            from nltk.stem import PorterStemmer
-            stemmer = PorterStemmer()
-            
-            words = text.split()
-            stemmed_words = [stemmer.stem(word) for word in words]
+            # 공용 정규화기 (단어 형태별 캐시)
+            stemmed_words = get_word_normalizer().stem_words(text.split())
             return ' '.join(stemmed_words)
         except:
             # NLTK가 없으면 그대로 반환
@@ -178,11 +204,8 @@ class TextPreprocessor:
             return ""
         
         try:
-            from nltk.stem import WordNetLemmatizer
-            lemmatizer = WordNetLemmatizer()
-            
-            words = text.split()
-            lemmatized_words = [lemmatizer.lemmatize(word) for word in words]
+            # 공용 정규화기 (단어 형태별 캐시, WordNet이 없으면 어간 추출로 대체)
+            lemmatized_words = get_word_normalizer().lemmatize_words(text.split())
             return ' '.join(lemmatized_words)
         except:
             # NLTK가 없으면 어간 추출로 대체
@@ -485,77 +508,70 @@ class TextPreprocessor:
             if not cleaned_text:
                 return {}
             
-            # 기본 토큰화 시도
-            try:
-                sentences = nltk.sent_tokenize(cleaned_text)
-            except:
-                # NLTK가 실패하면 간단한 문장 분리
-                sentences = [s.strip() + '.' for s in cleaned_text.split('.') if s.strip()]
-            
-            all_pos_tags = []
-            pos_counts = {}
-            
-            for sentence in sentences:
-                try:
-                    # 단어 토큰화 및 품사 태깅
-                    words = nltk.word_tokenize(sentence)
-                    pos_tags = nltk.pos_tag(words)
-                except:
-                    # NLTK가 실패하면 간단한 단어 분리 및 기본 태깅
-                    words = sentence.split()
-                    pos_tags = [(word, 'NN' if word[0].isupper() else 'VB' if word.endswith('ed') else 'JJ' if word.endswith('ly') else 'NN') for word in words if word.isalpha()]
-                
-                all_pos_tags.extend(pos_tags)
-                
-                # 품사별 카운트
-                for word, pos in pos_tags:
-                    if pos not in pos_counts:
-                        pos_counts[pos] = 0
-                    pos_counts[pos] += 1
-            
-            # 주요 품사별 분류
-            noun_tags = ['NN', 'NNS', 'NNP', 'NNPS']  # 명사
-            verb_tags = ['VB', 'VBD', 'VBG', 'VBN', 'VBP', 'VBZ']  # 동사
-            adjective_tags = ['JJ', 'JJR', 'JJS']  # 형용사
-            adverb_tags = ['RB', 'RBR', 'RBS']  # 부사
-            
-            categorized = {
-                'nouns': sum(pos_counts.get(tag, 0) for tag in noun_tags),
-                'verbs': sum(pos_counts.get(tag, 0) for tag in verb_tags),
-                'adjectives': sum(pos_counts.get(tag, 0) for tag in adjective_tags),
-                'adverbs': sum(pos_counts.get(tag, 0) for tag in adverb_tags),
-                'total_words': len(all_pos_tags)
-            }
-            
-            # 비율 계산
-            total = categorized['total_words']
-            if total > 0:
-                categorized['noun_ratio'] = categorized['nouns'] / total * 100
-                categorized['verb_ratio'] = categorized['verbs'] / total * 100
-                categorized['adjective_ratio'] = categorized['adjectives'] / total * 100
-                categorized['adverb_ratio'] = categorized['adverbs'] / total * 100
-            else:
-                categorized['noun_ratio'] = categorized['verb_ratio'] = categorized['adjective_ratio'] = categorized['adverb_ratio'] = 0
-            
-            return {
-                'detailed_pos': pos_counts,
-                'categorized': categorized,
-                'pos_tags': all_pos_tags
-            }
+            # 문장 분리 + 품사 태깅 (NLP 백엔드, 실패 시 백엔드 내부에서 규칙 기반 태깅)
+            return self._pos_summary(self.nlp.tag_sentences(cleaned_text))
             
         except Exception as e:
             st.warning(f"품사 분석 중 오류: {e}")
             return {}
 
+    def _pos_summary(self, tagged_sentences):
+        """문장별 [(단어, 태그)] 목록 → 품사 분석 결과"""
+        # 정수 ID 배열로 보관 (품사별 카운트는 bincount)
+        document = TokenDocument.from_tagged_sentences(tagged_sentences)
+        pos_counts = document.tag_counts()
+        
+        # 주요 품사별 분류
+        noun_tags = ['NN', 'NNS', 'NNP', 'NNPS']  # 명사
+        verb_tags = ['VB', 'VBD', 'VBG', 'VBN', 'VBP', 'VBZ']  # 동사
+        adjective_tags = ['JJ', 'JJR', 'JJS']  # 형용사
+        adverb_tags = ['RB', 'RBR', 'RBS']  # 부사
+        
+        categorized = {
+            'nouns': document.count_tags(noun_tags),
+            'verbs': document.count_tags(verb_tags),
+            'adjectives': document.count_tags(adjective_tags),
+            'adverbs': document.count_tags(adverb_tags),
+            'total_words': len(document)
+        }
+        
+        # 비율 계산
+        total = categorized['total_words']
+        if total > 0:
+            categorized['noun_ratio'] = categorized['nouns'] / total * 100
+            categorized['verb_ratio'] = categorized['verbs'] / total * 100
+            categorized['adjective_ratio'] = categorized['adjectives'] / total * 100
+            categorized['adverb_ratio'] = categorized['adverbs'] / total * 100
+        else:
+            categorized['noun_ratio'] = categorized['verb_ratio'] = categorized['adjective_ratio'] = categorized['adverb_ratio'] = 0
+        
+        return {
+            'detailed_pos': pos_counts,
+            'categorized': categorized,
+            'pos_tags': document  # (단어, 태그) 목록처럼 사용 가능
+        }
+
     def analyze_all_essays_pos(self, essay_data):
-        """모든 에세이의 품사 분석"""
+        """모든 에세이의 품사 분석 (NLP 백엔드로 한 번에 배치 태깅)"""
         all_results = []
         
+        rows = []
         for idx, row in essay_data.iterrows():
             essay_text = row.get('essay_text', '')
-            topic_name = row.get('topic_name', f'Essay {idx+1}')
-            
-            pos_result = self.advanced_pos_analysis(essay_text)
+            if not essay_text or pd.isna(essay_text):
+                continue
+            cleaned_text = self.extract_essay_content(essay_text)
+            if cleaned_text:
+                rows.append((idx, row.get('topic_name', f'Essay {idx+1}'), cleaned_text))
+        
+        try:
+            tagged_essays = self.nlp.tag_many([cleaned_text for _, _, cleaned_text in rows])
+        except Exception as e:
+            st.warning(f"품사 분석 중 오류: {e}")
+            return all_results
+        
+        for (idx, topic_name, _), tagged_sentences in zip(rows, tagged_essays):
+            pos_result = self._pos_summary(tagged_sentences)
             
             if pos_result and 'categorized' in pos_result:
                 result = {
@@ -603,11 +619,8 @@ class TextPreprocessor:
             if not cleaned_text:
                 return {}
             
-            # 문장 분리 (안전한 방법)
-            try:
-                sentences = nltk.sent_tokenize(cleaned_text)
-            except:
-                sentences = [s.strip() + '.' for s in cleaned_text.split('.') if s.strip()]
+            # 문장 분리 (공용 문장 분리 서비스)
+            sentences = self.segmenter.sentences(cleaned_text)
             
             sentence_lengths = []
             clause_counts = []
@@ -648,13 +661,7 @@ class TextPreprocessor:
     
     def tokenize_sentences(self, text):
         """문장 토큰화"""
-        try:
-            sentences = nltk.sent_tokenize(text)
-            return [s.strip() for s in sentences if s.strip() and len(s.strip()) > 10]
-        except:
-            # 간단한 문장 분리
-            sentences = text.split('.')
-            return [s.strip() + '.' for s in sentences if s.strip() and len(s.strip()) > 10]
+        return [s for s in self.segmenter.sentences(text) if len(s) > 10]
     
     def tokenize_words(self, text):
         """단어 토큰화"""
@@ -914,7 +921,7 @@ class TextPreprocessor:
                 emoji = "😐"
             
             # 문장별 분석 (교육적 목적)
-            sentences = cleaned_text.split('.')
+            sentences = self.segmenter.sentences(cleaned_text)
             sentence_analysis = []
             
             for i, sentence in enumerate(sentences[:5]):  # 처음 5문장만
@@ -1163,9 +1170,8 @@ class TextPreprocessor:
             return {}
         
         try:
-            # NLTK 품사 태깅
-            words = nltk.word_tokenize(cleaned_text)
-            pos_tags = nltk.pos_tag(words)
+            # 품사 태깅 (NLP_BACKEND 설정의 백엔드, 기본 NLTK)
+            pos_tags = self.nlp.tag(cleaned_text)
             
             # 품사 태그 설명
             pos_tag_explanations = {
@@ -1186,26 +1192,28 @@ class TextPreprocessor:
                 '기능어': ['DT', 'IN', 'CC', 'PRP', 'TO', 'WDT', 'WP', 'WRB']
             }
             
-            # 결과 분석
+            # 결과 분석 (정수 ID 배열 + bincount, 알파벳 2글자 이상 단어만)
+            document = TokenDocument.from_tagged(pos_tags)
+            word_mask = document.word_mask(lambda word: word.isalpha() and len(word) > 1)
+            
+            category_counts = {cat: document.count_tags(tags, word_mask) for cat, tags in pos_categories.items()}
+            category_counts['기타'] = int(word_mask.sum()) - sum(category_counts.values())
+            
+            def category_of(pos):
+                for cat, tags in pos_categories.items():
+                    if pos in tags:
+                        return cat
+                return '기타'
+            
             detailed_analysis = []
-            category_counts = {'명사': 0, '동사': 0, '형용사': 0, '부사': 0, '기능어': 0, '기타': 0}
-            
-            for word, pos in pos_tags:
-                if word.isalpha() and len(word) > 1:
-                    category = '기타'
-                    for cat, tags in pos_categories.items():
-                        if pos in tags:
-                            category = cat
-                            break
-                    
-                    category_counts[category] += 1
-                    
-                    detailed_analysis.append({
-                        'word': word.lower(),
-                        'pos_tag': pos,
-                        'pos_explanation': pos_tag_explanations.get(pos, '기타'),
-                        'category': category
-                    })
+            for index in np.flatnonzero(word_mask)[:30].tolist():
+                word, pos = document[index]
+                detailed_analysis.append({
+                    'word': word.lower(),
+                    'pos_tag': pos,
+                    'pos_explanation': pos_tag_explanations.get(pos, '기타'),
+                    'category': category_of(pos)
+                })
             
             # 비율 계산
             total_words = sum(category_counts.values())
@@ -1216,12 +1224,12 @@ class TextPreprocessor:
             
             return {
                 'method': 'NLTK 품사 태깅',
-                'detailed_analysis': detailed_analysis[:30],  # 처음 30개만
+                'detailed_analysis': detailed_analysis,  # 처음 30개만
                 'category_counts': category_counts,
                 'category_ratios': category_ratios,
                 'total_words': total_words,
                 'pos_tag_explanations': pos_tag_explanations,
-                'pos_tagged_words': pos_tags,  # main.py에서 필요한 키 추가
+                'pos_tagged_words': document,  # main.py에서 필요한 키 추가 ((단어, 태그) 목록처럼 사용 가능)
                 'explanation': "NLTK의 기계학습 기반 품사 태거를 사용한 정확한 분류"
             }
             
@@ -1244,7 +1252,7 @@ class TextPreprocessor:
         
         try:
             # 문장별 분석
-            sentences = nltk.sent_tokenize(cleaned_text)
+            sentences = self.segmenter.sentences(cleaned_text)
             
             sentence_analysis = []
             overall_patterns = {
@@ -1256,9 +1264,11 @@ class TextPreprocessor:
                 'simple_sentences': 0
             }
             
-            for i, sentence in enumerate(sentences[:5]):  # 처음 5문장만
-                words = nltk.word_tokenize(sentence)
-                pos_tags = nltk.pos_tag(words)
+            # 처음 5문장만 (NLP_BACKEND 설정의 백엔드로 한 번에 태깅)
+            tagged_sentences = self.nlp.tag_many(sentences[:5])
+            for i, (sentence, tagged) in enumerate(zip(sentences[:5], tagged_sentences)):
+                pos_tags = [pair for part in tagged for pair in part]
+                words = [word for word, _ in pos_tags]
                 
                 # 품사별 카운트
                 nouns = sum(1 for _, pos in pos_tags if pos.startswith('NN'))
@@ -1471,8 +1481,7 @@ class TextPreprocessor:
         vocabulary_diversity = unique_words / total_words if total_words > 0 else 0
         
         # 문장 수 계산
-        sentences = text.split('.')
-        sentences = [s.strip() for s in sentences if s.strip()]
+        sentences = self.segmenter.sentences(text)
         avg_sentence_length = total_words / len(sentences) if sentences else 0
         
         return {
@@ -1707,25 +1716,56 @@ class TextPreprocessor:
 
 
 
-    def comprehensive_writing_analysis(self, text):
-        """통합 글쓰기 수준 종합 진단"""
-        
+    def analyze_essay_aggregate(self, essay_text, essay_id=None):
+        """에세이 1편을 정제 후 병합 가능한 통계 집계로 변환"""
+        cleaned_text = self.extract_essay_content(essay_text)
+        return EssayAggregate.from_text(cleaned_text, essay_id)
+
+    def comprehensive_writing_analysis(self, text, aggregate=None, mode='exact', essays=None,
+                                       time_budget=DEFAULT_TIME_BUDGET, time_limit=None):
+        """통합 글쓰기 수준 종합 진단
+
+        Args:
+            text: 학생의 통합 에세이 텍스트
+            aggregate: 에세이별로 누적된 EssayAggregate (있으면 1단계 통계를 재계산하지 않음)
+            mode: 'exact' (전체 텍스트) 또는 'fast' (층화 표본 추정 + 신뢰구간, 정밀 분석은 백그라운드)
+            essays: 빠른 추정 모드의 층(에세이별 정제 텍스트 목록, 없으면 text 1개)
+            time_budget: 빠른 추정 모드의 목표 시간 (초)
+            time_limit: 1~4단계 전체 시간 제한 (초, 없으면 ANALYSIS_TIME_BUDGET 설정, 0 이하면 제한 없음)
+                시간이 부족한 단계는 부분 결과('truncated': True)를 돌려주고 'truncated_steps'에 기록됩니다.
+        """
+        if mode == 'fast':
+            return fast_writing_analysis(self, essays or [text], aggregate, time_budget)
         
         try:
+            if time_limit is None:
+                time_limit = get_analysis_time_budget()
+            elif time_limit <= 0:
+                time_limit = None  # ANALYSIS_TIME_BUDGET=0과 같이 제한 없음
+            budget = TimeBudget(time_limit, steps=4)
+            
             # 1단계: 통계적 벤치마킹 분석
-            step1_result = self._statistical_benchmarking_analysis(text)
+            step1_result = budget.run('statistical', self._statistical_benchmarking_analysis, text, aggregate,
+                                      fallback={'user_statistics': {}, 'statistical_score': 0})
             
             # 2단계: 어휘 수준 분석
-            step2_result = self._vocabulary_level_analysis(text)
+            step2_result = budget.run('vocabulary', self._vocabulary_level_analysis, text,
+                                      fallback={'complexity_analysis': {}})
             
             # 3단계: 문법 오류 패턴 분석
-            step3_result = self.analyze_grammar_patterns(text)
+            step3_result = budget.run('grammar', self.analyze_grammar_patterns, text,
+                                      fallback={'total_sentences': 0, 'analyzed_sentences': 0, 'error_patterns': {},
+                                                'error_count_by_type': {}, 'sentences_with_issues': [],
+                                                'grammar_score': 0, 'improvement_areas': []})
             
             # 4단계: 문장 유사도 분석
-            step4_result = self._sentence_similarity_analysis(text)
+            step4_result = budget.run('similarity', self._sentence_similarity_analysis, text,
+                                      fallback={'average_similarity': 0, 'coherence_score': 0,
+                                                'sentence_pair_analysis': [], 'topic_consistency': {}})
             
-            # 5단계: 종합 진단
-            step5_result = self._comprehensive_assessment(text, step1_result, step2_result, step3_result, step4_result)
+            # 5단계: 종합 진단 (앞 단계 결과만 사용하므로 시간 제한 없음)
+            step5_result = self._comprehensive_assessment(text, step1_result, step2_result, step3_result, step4_result,
+                                                          excluded_steps=budget.truncated_steps)
             
             return {
                 'step1_statistical': step1_result,
@@ -1735,13 +1775,15 @@ class TextPreprocessor:
                 'step5_comprehensive': step5_result,
                 'overall_score': step5_result['overall_score'],
                 'final_level': step5_result['final_level'],
-                'improvement_roadmap': step5_result['improvement_roadmap']
+                'improvement_roadmap': step5_result['improvement_roadmap'],
+                'truncated_steps': budget.truncated_steps,  # 시간 제한으로 부분 결과인 단계
+                'step_seconds': budget.step_seconds
             }
             
         except Exception as e:
             return {'error': f"통합 글쓰기 진단 중 오류: {str(e)}"}
 
-    def _statistical_benchmarking_analysis(self, text):
+    def _statistical_benchmarking_analysis(self, text, aggregate=None):
         """1단계: 통계적 벤치마킹 분석"""
         
         
@@ -1776,8 +1818,12 @@ class TextPreprocessor:
             }
         }
         
-        # 사용자 텍스트 통계 계산
-        user_stats = self._calculate_text_statistics(text)
+        # 사용자 텍스트 통계 계산 (누적 집계가 있으면 재사용, 없으면 시간 제한 안에서 문장 묶음 단위로 계산)
+        truncated = False
+        if aggregate is not None:
+            user_stats = aggregate.to_statistics()
+        else:
+            user_stats, truncated = self._calculate_text_statistics(text)
         
         # 각 벤치마크와 비교
         benchmark_scores = {}
@@ -1797,11 +1843,12 @@ class TextPreprocessor:
             'benchmark_comparisons': benchmark_scores,
             'best_match': best_match,
             'statistical_score': best_match[1]['similarity_score'],
-            'insights': self._generate_statistical_insights(user_stats, EXPERT_BENCHMARKS)
+            'insights': self._generate_statistical_insights(user_stats, EXPERT_BENCHMARKS),
+            'truncated': truncated
         }
 
     def _vocabulary_level_analysis(self, text):
-        """2단계: 어휘 수준 분석 (Word Embedding 시뮬레이션)"""
+        """2단계: 어휘 수준 분석 (고급 어휘 사전 + 워드 임베딩 의미 유사도)"""
 
         # 구두점 제거하고 단어 추출
         import string
@@ -1833,17 +1880,46 @@ class TextPreprocessor:
                             'reflect', 'reveal', 'suggest', 'imply', 'encompass']
         }
         
+        # 단어 묶음(VOCABULARY_CHUNK_WORDS) 단위로 세면서 시간 제한 확인 (시간이 다 되면 센 단어까지만)
+        deadline = current_deadline()
+        category_counts = {category: 0 for category in ADVANCED_VOCABULARY}
+        length_counts = {'basic': 0, 'intermediate': 0, 'advanced': 0}
+        seen_words = set()
+        word_length_sum = 0
+        analyzed = 0
+        
+        for chunk_start in range(0, len(words), VOCABULARY_CHUNK_WORDS):
+            if deadline.expired():
+                break
+            chunk = words[chunk_start:chunk_start + VOCABULARY_CHUNK_WORDS]
+            seen_words.update(chunk)
+            for category, vocab_list in ADVANCED_VOCABULARY.items():
+                category_counts[category] += sum(1 for word in chunk if word in vocab_list)
+            for word in chunk:
+                length = len(word)
+                word_length_sum += length
+                if length <= 4:
+                    length_counts['basic'] += 1
+                elif length <= 7:
+                    length_counts['intermediate'] += 1
+                else:
+                    length_counts['advanced'] += 1
+            analyzed += len(chunk)
+        
+        truncated = analyzed < len(words)
+        words = words[:analyzed]
+        
         # 어휘 분석
         total_words = len(words)
-        unique_words = len(set(words))
+        unique_words = len(seen_words)
         vocabulary_diversity = unique_words / total_words if total_words > 0 else 0
         
         # 고급 어휘 사용률 계산
         advanced_count = 0
         category_usage = {}
         
-        for category, vocab_list in ADVANCED_VOCABULARY.items():
-            category_count = sum(1 for word in words if word in vocab_list)
+        for category in ADVANCED_VOCABULARY:
+            category_count = category_counts[category]
             category_usage[category] = {
                 'count': category_count,
                 'ratio': (category_count / total_words * 100) if total_words > 0 else 0
@@ -1872,13 +1948,13 @@ class TextPreprocessor:
             level_desc = "어휘 확장이 필요"
         
         # 어휘 복잡도 분석 추가
-        avg_word_length = sum(len(word) for word in words) / len(words) if words else 0
+        avg_word_length = word_length_sum / total_words if total_words > 0 else 0
         unique_word_ratio = (unique_words / total_words * 100) if total_words > 0 else 0
         
         # 수준별 어휘 분석
-        basic_words = sum(1 for word in words if len(word) <= 4)
-        intermediate_words = sum(1 for word in words if 5 <= len(word) <= 7)
-        advanced_words = sum(1 for word in words if len(word) > 7)
+        basic_words = length_counts['basic']
+        intermediate_words = length_counts['intermediate']
+        advanced_words = length_counts['advanced']
         academic_words = advanced_count
         
         return {
@@ -1899,17 +1975,36 @@ class TextPreprocessor:
             },
             'vocabulary_recommendations': self._generate_vocabulary_recommendations(advanced_vocabulary_ratio, vocabulary_score),
             'category_usage': category_usage,
-            'vocabulary_diversity': vocabulary_diversity
+            'vocabulary_diversity': vocabulary_diversity,
+            # 임베딩 분석은 시간이 남아 있을 때만 (시간 제한에 걸리면 None)
+            'embedding_analysis': None if deadline.expired() else self._embedding_vocabulary_analysis(words, ADVANCED_VOCABULARY),
+            'analyzed_words': analyzed,
+            'truncated': truncated
+        }
+
+    def _embedding_vocabulary_analysis(self, words, advanced_vocabulary):
+        """워드 임베딩 기반 어휘 분석 (임베딩 저장소가 없으면 None)"""
+        store = get_embedding_store()
+        if store is None or not words:
+            return None
+        
+        content_words = [word for word in words if word not in self.stop_words]
+        
+        # 학생 어휘 중심 벡터와 각 고급 어휘 범주 중심 벡터의 코사인 유사도
+        category_similarity = {
+            category: store.centroid_similarity(content_words, vocab_list)
+            for category, vocab_list in advanced_vocabulary.items()
+        }
+        
+        return {
+            'coverage': store.coverage(content_words) * 100,
+            'category_similarity': category_similarity
         }
 
     def _sentence_similarity_analysis(self, text):
         """3단계: 문장 유사도 분석 (전문가 글과의 논리성 비교)"""
         
-        try:
-            import nltk
-            sentences = nltk.sent_tokenize(text)
-        except:
-            sentences = [s.strip() for s in text.split('.') if s.strip()]
+        sentences = self.segmenter.sentences(text)
         
         if not sentences:
             return {
@@ -1928,42 +2023,51 @@ class TextPreprocessor:
         transition_words = ['but', 'and', 'or', 'so', 'because', 'since', 'while', 'although', 
                           'unless', 'before', 'after', 'when', 'if', 'thus', 'hence']
         
-        # 문장 간 유사도 계산 (단어 기반 Jaccard 유사도)
-        sentence_similarities = []
-        sentence_pairs = []
+        # 문장 간 유사도 계산 (TF-IDF 희소 행렬 코사인 유사도)
+        # 시간 제한이 있으면 앞쪽 SIMILARITY_MAX_SENTENCES 문장까지만, 이미 시간이 다 됐으면 계산하지 않음
+        deadline = current_deadline()
+        similarity_sentences = sentences
+        if deadline.remaining() is not None:
+            similarity_sentences = sentences[:SIMILARITY_MAX_SENTENCES]
+        truncated = len(similarity_sentences) < len(sentences)
+        
+        if deadline.expired():
+            truncated = True
+            coherence = {'adjacent': 0.0, 'windowed': 0.0, 'centroid': 0.0,
+                         'adjacent_similarities': np.zeros(0)}
+        else:
+            coherence = SentenceSimilarityEngine().coherence_metrics(similarity_sentences)
+        adjacent_similarities = coherence['adjacent_similarities']
         
-        for i in range(len(sentences)-1):
-            sentence1 = sentences[i].lower()
-            sentence2 = sentences[i+1].lower()
-            
-            words1 = set(word.strip('.,!?;:') for word in sentence1.split() if word.isalpha())
-            words2 = set(word.strip('.,!?;:') for word in sentence2.split() if word.isalpha())
-            
-            if words1 and words2:
-                intersection = words1.intersection(words2)
-                union = words1.union(words2)
-                similarity = len(intersection) / len(union) if union else 0
-                sentence_similarities.append(similarity)
-                
-                if len(sentence_pairs) < 5:  # 상위 5개만 저장
-                    sentence_pairs.append({
-                        'similarity': similarity,
-                        'sentence1_preview': sentences[i][:100],
-                        'sentence2_preview': sentences[i+1][:100]
-                    })
+        # 인접 문장 쌍 중 유사도 상위 5개 저장
+        sentence_pairs = []
+        for i in np.argsort(-adjacent_similarities, kind='stable')[:5]:
+            sentence_pairs.append({
+                'similarity': float(adjacent_similarities[i]),
+                'sentence1_preview': sentences[i][:100],
+                'sentence2_preview': sentences[i+1][:100]
+            })
         
         # 평균 유사도
-        avg_similarity = sum(sentence_similarities) / len(sentence_similarities) if sentence_similarities else 0
+        avg_similarity = coherence['adjacent']
         
-        # 논리적 흐름 분석
+        # 논리적 흐름 분석 (시간 제한에 걸리면 확인한 문장까지만)
         connector_count = 0
+        checked = 0
         for sentence in sentences:
+            if deadline.expired():
+                break
             sentence_lower = sentence.lower()
             connector_count += sum(1 for conn in logical_connectors + transition_words if conn in sentence_lower)
+            checked += 1
         
-        connector_ratio = connector_count / len(sentences) if sentences else 0
+        connector_ratio = connector_count / checked if checked else 0
         
         # 일관성 점수 계산
+        # avg_similarity는 불용어를 뺀 TF-IDF 코사인(0~1)으로, 학생 에세이의 인접 문장에서는 보통 0~0.1입니다.
+        # 예전 단어 Jaccard 평균(보통 0.05~0.1)과 범위가 비슷해 가중치(50)는 그대로 두었습니다.
+        # 같은 단어를 반복하지 않고 대명사/연결어로 이어지는 문장은 0에 가까우므로
+        # 연결어 비율(30)과 기본 점수(20)가 점수의 대부분을 차지합니다.
         coherence_score = min(100, (avg_similarity * 50) + (connector_ratio * 30) + 20)
         
         # 논리적 흐름 수준 결정
@@ -2004,10 +2108,16 @@ class TextPreprocessor:
             'coherence_score': coherence_score,
             'logical_flow_level': logical_flow,
             'sentence_pair_analysis': sentence_pairs,
+            'coherence_metrics': {
+                'adjacent': coherence['adjacent'],
+                'windowed': coherence['windowed'],
+                'centroid': coherence['centroid']
+            },
             'topic_consistency': {
                 'topic_drift_score': topic_drift_score,
                 'main_theme_strength': main_theme_strength
-            }
+            },
+            'truncated': truncated or checked < len(sentences)
         }
     
     def _generate_vocabulary_recommendations(self, advanced_ratio, vocab_score):
@@ -2027,8 +2137,14 @@ class TextPreprocessor:
         
         return recommendations[:3] if recommendations else ["현재 어휘 수준이 적절합니다"]
 
-    def _comprehensive_assessment(self, text, step1_result, step2_result, step3_result, step4_result):
-        """5단계: 종합 진단 및 개선 로드맵"""
+    def _comprehensive_assessment(self, text, step1_result, step2_result, step3_result, step4_result,
+                                  excluded_steps=()):
+        """5단계: 종합 진단 및 개선 로드맵
+
+        Args:
+            excluded_steps: 시간 제한으로 건너뛰었거나 일부만 분석한 단계 이름
+                (종합 점수에서 빼고 나머지 단계의 가중치를 다시 맞춤, 등급은 부분 결과로 표시)
+        """
         
         # 각 단계별 점수 (100점 만점으로 정규화)
         statistical_score = step1_result.get('statistical_score', 0)
@@ -2037,15 +2153,25 @@ class TextPreprocessor:
         similarity_score = step4_result.get('coherence_score', 0)
         
         # 가중치 적용 종합 점수 (4단계로 확장)
-        overall_score = (
-            statistical_score * 0.25 +  # 통계적 특성 25%
-            vocabulary_score * 0.25 +   # 어휘 수준 25%
-            grammar_score * 0.25 +      # 문법 정확성 25%
-            similarity_score * 0.25     # 논리적 구성 25%
-        )
+        weighted_scores = {
+            'statistical': (statistical_score, 0.25),  # 통계적 특성 25%
+            'vocabulary': (vocabulary_score, 0.25),    # 어휘 수준 25%
+            'grammar': (grammar_score, 0.25),          # 문법 정확성 25%
+            'similarity': (similarity_score, 0.25)     # 논리적 구성 25%
+        }
+        # 시간 제한에 걸린 단계의 기본값(0점 등)이 등급에 들어가지 않도록 제외 후 가중치 재조정
+        included = {step: value for step, value in weighted_scores.items() if step not in excluded_steps}
+        total_weight = sum(weight for _, weight in included.values())
+        overall_score = (sum(score * weight for score, weight in included.values()) / total_weight
+                         if total_weight else 0)
+        partial = len(included) < len(weighted_scores)
         
         # 최종 등급 판정
-        if overall_score >= 85:
+        if not included:
+            final_level = "⏱️ 판정 보류"
+            level_desc = "시간 제한 안에 분석을 마치지 못했습니다"
+            level_color = "warning"
+        elif overall_score >= 85:
             final_level = "🏆 우수 (Excellent)"
             level_desc = "전문가 수준의 뛰어난 글쓰기 실력"
             level_color = "success"
@@ -2062,35 +2188,49 @@ class TextPreprocessor:
             level_desc = "기초 실력 향상에 집중 필요"
             level_color = "error"
         
+        if partial and included:
+            final_level += " · 부분 결과"
+            level_desc += " (시간 제한으로 일부 단계를 제외하고 판정)"
+        
+        # 제외된 단계는 종합 점수로 대신해 로드맵/강약점 판단에 기본값이 쓰이지 않도록 함
+        def component(step, score):
+            return score if step in included else overall_score
+        
         # 맞춤형 개선 로드맵 생성
         improvement_roadmap = self._generate_improvement_roadmap(
-            statistical_score, vocabulary_score, similarity_score, overall_score
+            component('statistical', statistical_score), component('vocabulary', vocabulary_score),
+            component('similarity', similarity_score), overall_score
         )
         
-        # 강점과 약점 분석
+        # 강점과 약점 분석 (제외된 단계는 판단하지 않음)
         strengths = []
         weaknesses = []
         
-        if statistical_score >= 70:
-            strengths.append("통계적 글쓰기 패턴이 우수함")
-        else:
-            weaknesses.append("품사 사용과 문장 구성의 균형 개선 필요")
+        if 'statistical' in included:
+            if statistical_score >= 70:
+                strengths.append("통계적 글쓰기 패턴이 우수함")
+            else:
+                weaknesses.append("품사 사용과 문장 구성의 균형 개선 필요")
         
-        if vocabulary_score >= 70:
-            strengths.append("어휘 사용이 풍부하고 다양함")
-        else:
-            weaknesses.append("어휘 다양성과 고급 표현 확장 필요")
+        if 'vocabulary' in included:
+            if vocabulary_score >= 70:
+                strengths.append("어휘 사용이 풍부하고 다양함")
+            else:
+                weaknesses.append("어휘 다양성과 고급 표현 확장 필요")
         
-        if similarity_score >= 70:
-            strengths.append("논리적이고 일관성 있는 구성")
-        else:
-            weaknesses.append("문장 간 연결성과 논리적 흐름 개선 필요")
+        if 'similarity' in included:
+            if similarity_score >= 70:
+                strengths.append("논리적이고 일관성 있는 구성")
+            else:
+                weaknesses.append("문장 간 연결성과 논리적 흐름 개선 필요")
         
         return {
             'overall_score': round(overall_score, 1),
             'final_level': final_level,
             'level_description': level_desc,
             'level_color': level_color,
+            'partial': partial,
+            'excluded_steps': [step for step in weighted_scores if step not in included],
             'component_scores': {
                 'statistical': round(statistical_score, 1),
                 'vocabulary': round(vocabulary_score, 1),
@@ -2103,114 +2243,29 @@ class TextPreprocessor:
 
     # 보조 메서드들
     def _calculate_text_statistics(self, text):
-        """영어 텍스트 통계 계산"""
-        
-        if not text or not text.strip():
-            return {
-                'total_words': 0,
-                'total_sentences': 0, 
-                'unique_words': 0,
-                'vocabulary_diversity': 0,
-                'avg_sentence_length': 0,
-                'noun_ratio': 0,
-                'verb_ratio': 0,
-                'adj_ratio': 0,
-                'complexity_ratio': 0
-            }
-        
-        try:
-            import nltk
-            
-            # 문장과 단어 토큰화
-            sentences = nltk.sent_tokenize(text)
-            words = nltk.word_tokenize(text.lower())
-            
-            # 알파벳 단어만 필터링 (길이 2 이상)
-            words = [word for word in words if word.isalpha() and len(word) >= 2]
-            total_words = len(words)
-            
-            
-            if total_words == 0:
-                return {
-                    'total_words': 0,
-                    'total_sentences': 0,
-                    'unique_words': 0,
-                    'vocabulary_diversity': 0,
-                    'avg_sentence_length': 0,
-                    'noun_ratio': 0,
-                    'verb_ratio': 0,
-                    'adj_ratio': 0,
-                    'complexity_ratio': 0
-                }
-            
-            # POS 태깅
-            pos_tagged = nltk.pos_tag(words)
-            
-            # 품사별 개수 계산
-            noun_count = sum(1 for word, pos in pos_tagged if pos.startswith('NN'))
-            verb_count = sum(1 for word, pos in pos_tagged if pos.startswith('VB'))
-            adj_count = sum(1 for word, pos in pos_tagged if pos.startswith('JJ'))
-            
-            # 복잡도 계산 (복합문/복문의 비율 추정)
-            complex_indicators = sum(1 for word in words if word in ['however', 'therefore', 'furthermore', 'although', 'because', 'since', 'while', 'whereas', 'unless', 'though'])
-            complexity_ratio = min(100, (complex_indicators / len(sentences)) * 50) if sentences else 0
-            
-            unique_words_count = len(set(words))
-            diversity = unique_words_count / total_words
-            
-            return {
-                'total_words': total_words,
-                'total_sentences': len(sentences),
-                'unique_words': unique_words_count,
-                'vocabulary_diversity': diversity,
-                'avg_sentence_length': total_words / len(sentences) if sentences else 0,
-                'noun_ratio': (noun_count / total_words * 100),
-                'verb_ratio': (verb_count / total_words * 100),
-                'adj_ratio': (adj_count / total_words * 100),
-                'complexity_ratio': complexity_ratio
-            }
-            
-        except Exception as e:
-            # NLTK가 없거나 오류 시 기본 분석
-            import re
-            
-            # 단어 추출 (구두점 제거)
-            words = re.findall(r'\b[a-zA-Z]{2,}\b', text.lower())
-            sentences = [s.strip() for s in text.split('.') if s.strip()]
-            total_words = len(words)
-            
-            if total_words == 0:
-                return {
-                    'total_words': 0,
-                    'total_sentences': 0,
-                    'unique_words': 0,
-                    'vocabulary_diversity': 0,
-                    'avg_sentence_length': 0,
-                    'noun_ratio': 0,
-                    'verb_ratio': 0,
-                    'adj_ratio': 0,
-                    'complexity_ratio': 0
-                }
-            
-            # 간단한 영어 규칙 기반 분석
-            noun_count = sum(1 for word in words if word.endswith(('tion', 'sion', 'ment', 'ness', 'ity', 'ty', 'ence', 'ance')))
-            verb_count = sum(1 for word in words if word.endswith(('ed', 'ing', 'ize', 'ise', 'ate')))
-            adj_count = sum(1 for word in words if word.endswith(('ful', 'less', 'ous', 'ive', 'able', 'ible', 'al', 'ic')))
-            
-            unique_count = len(set(words))
-            diversity = unique_count / total_words
-            
-            return {
-                'total_words': total_words,
-                'total_sentences': len(sentences),
-                'unique_words': unique_count,
-                'vocabulary_diversity': diversity,
-                'avg_sentence_length': total_words / len(sentences) if sentences else 0,
-                'noun_ratio': (noun_count / total_words * 100),
-                'verb_ratio': (verb_count / total_words * 100),
-                'adj_ratio': (adj_count / total_words * 100),
-                'complexity_ratio': 50  # 기본값
-            }
+        """영어 텍스트 통계 계산
+
+        문장 묶음(GRAMMAR_CHUNK_SENTENCES)마다 EssayAggregate를 만들어 병합하고, 묶음 사이에서
+        시간 제한을 확인합니다. 시간이 다 되면 분석한 문장까지의 통계를 돌려줍니다.
+
+        Returns:
+            (통계 dict, 시간 제한으로 잘렸는지 여부)
+        """
+        sentences = self.segmenter.sentences(text)
+        if len(sentences) <= GRAMMAR_CHUNK_SENTENCES:
+            return EssayAggregate.from_text(text).to_statistics(), False
+
+        deadline = current_deadline()
+        aggregate = EssayAggregate()
+        analyzed = 0
+        for chunk_start in range(0, len(sentences), GRAMMAR_CHUNK_SENTENCES):
+            if deadline.expired():
+                break
+            chunk = sentences[chunk_start:chunk_start + GRAMMAR_CHUNK_SENTENCES]
+            aggregate.merge(EssayAggregate.from_text(' '.join(chunk)))
+            analyzed += len(chunk)
+
+        return aggregate.to_statistics(), analyzed < len(sentences)
 
     def _calculate_similarity_score(self, user_stats, benchmark):
         """벤치마크와의 유사도 점수 계산"""
@@ -2368,91 +2423,62 @@ class TextPreprocessor:
         return roadmap
 
     def analyze_grammar_patterns(self, text):
-        """문법 오류 패턴 분석"""
-        import re
-        import nltk
-        from nltk.tokenize import sent_tokenize, word_tokenize
-        from nltk.tag import pos_tag
-        
+        """문법 오류 패턴 분석
+
+        원문은 IssueReport에 한 번만 보관하고 이슈는 문장 번호/문자 위치로 참조합니다.
+        'sentences_with_issues', 'error_patterns'는 화면에서 읽는 행만 만들어지는 지연 목록입니다.
+        """
         try:
-            sentences = sent_tokenize(text)
+            # 문장 경계 위치를 그대로 IssueReport에 넘김 (문장 위치를 다시 찾지 않음)
+            spans = self.segmenter.spans(text)
+            report = IssueReport(text, spans)
+            sentences = [report.sentence(i) for i in range(report.total_sentences)]
+            
+            # 문법 규칙 파일(grammar_rules.ini)을 하나로 컴파일한 매처 - 문장마다 토큰을 한 번만 훑음
+            matcher = get_grammar_matcher()
+            deadline = current_deadline()
+            analyzed = 0
+            
+            # 시간 제한 확인을 위해 문장 묶음 단위로 태깅 (시간이 다 되면 분석한 문장까지의 부분 결과)
+            for chunk_start in range(0, len(sentences), GRAMMAR_CHUNK_SENTENCES):
+                if deadline.expired():
+                    break
+                chunk = sentences[chunk_start:chunk_start + GRAMMAR_CHUNK_SENTENCES]
+                # NLP_BACKEND 설정의 백엔드로 묶음 단위 태깅 (문장 1개를 다시 나누면 이어 붙임)
+                tagged_sentences = [[pair for part in tagged for pair in part]
+                                    for tagged in self.nlp.tag_many(chunk)]
+                
+                for i, (sentence, pos_tags) in enumerate(zip(chunk, tagged_sentences), start=chunk_start):
+                    offsets = self._token_offsets(sentence, pos_tags)
+                    
+                    # 문장 텍스트는 복사하지 않고 문장 번호/문자 위치만 기록
+                    for rule, token_range in matcher.match(pos_tags):
+                        span = None
+                        if token_range is not None:
+                            first, last = offsets[token_range[0]], offsets[token_range[1] - 1]
+                            if first is not None and last is not None:
+                                span = (first[0], last[1])
+                        report.add_issue(i, rule.type, rule.description, rule.suggestion, span)
+                analyzed += len(chunk)
+            
+            total_issues = report.issue_count
             grammar_analysis = {
                 'total_sentences': len(sentences),
+                'analyzed_sentences': analyzed,
+                'truncated': analyzed < len(sentences),
                 'potential_errors': [],
-                'error_patterns': {},
-                'error_count_by_type': {},
-                'sentences_with_issues': [],
+                'error_patterns': report.error_patterns(),
+                'error_count_by_type': report.count_by_type(),  # 오류 유형별 카운트 (bincount)
+                'sentences_with_issues': report.sentences_with_issues(),
+                'issue_report': report,
                 'grammar_score': 0
             }
             
-            error_count = 0
-            total_issues = 0
-            
-            for i, sentence in enumerate(sentences):
-                sentence_issues = []
-                words = word_tokenize(sentence)
-                pos_tags = pos_tag(words)
-                
-                # 1. 주어-동사 수일치 검사 (간단한 패턴)
-                subject_verb_issues = self._check_subject_verb_agreement(sentence, pos_tags)
-                if subject_verb_issues:
-                    sentence_issues.extend(subject_verb_issues)
-                    error_count += len(subject_verb_issues)
-                
-                # 2. 시제 일관성 검사
-                tense_issues = self._check_tense_consistency(sentence, pos_tags)
-                if tense_issues:
-                    sentence_issues.extend(tense_issues)
-                    error_count += len(tense_issues)
-                
-                # 3. 관사 사용 검사 (기초 패턴)
-                article_issues = self._check_article_usage(sentence, pos_tags)
-                if article_issues:
-                    sentence_issues.extend(article_issues)
-                    error_count += len(article_issues)
-                
-                # 4. 전치사 사용 검사
-                preposition_issues = self._check_preposition_patterns(sentence, pos_tags)
-                if preposition_issues:
-                    sentence_issues.extend(preposition_issues)
-                    error_count += len(preposition_issues)
-                
-                # 5. 문장 구조 검사
-                structure_issues = self._check_sentence_structure(sentence, pos_tags)
-                if structure_issues:
-                    sentence_issues.extend(structure_issues)
-                    error_count += len(structure_issues)
-                
-                if sentence_issues:
-                    grammar_analysis['sentences_with_issues'].append({
-                        'sentence_number': i + 1,
-                        'sentence': sentence,
-                        'issues': sentence_issues
-                    })
-                    total_issues += len(sentence_issues)
-            
-            # 오류 패턴별 분류
-            for sentence_data in grammar_analysis['sentences_with_issues']:
-                for issue in sentence_data['issues']:
-                    error_type = issue['type']
-                    if error_type not in grammar_analysis['error_patterns']:
-                        grammar_analysis['error_patterns'][error_type] = []
-                    grammar_analysis['error_patterns'][error_type].append({
-                        'sentence': sentence_data['sentence'],
-                        'description': issue['description'],
-                        'suggestion': issue.get('suggestion', '')
-                    })
-                    
-                    # 오류 유형별 카운트
-                    if error_type not in grammar_analysis['error_count_by_type']:
-                        grammar_analysis['error_count_by_type'][error_type] = 0
-                    grammar_analysis['error_count_by_type'][error_type] += 1
-            
-            # 문법 점수 계산 (100점 만점)
-            if len(sentences) > 0:
-                error_rate = total_issues / len(sentences)
+            # 문법 점수 계산 (100점 만점, 분석한 문장 기준)
+            if analyzed > 0:
+                error_rate = total_issues / analyzed
                 grammar_analysis['grammar_score'] = max(0, 100 - (error_rate * 20))
-            else:
+            elif not sentences:
                 grammar_analysis['grammar_score'] = 100
             
             # 주요 개선 영역 식별
@@ -2472,131 +2498,18 @@ class TextPreprocessor:
                 'error': f"문법 분석 중 오류 발생: {str(e)}"
             }
     
-    def _check_subject_verb_agreement(self, sentence, pos_tags):
-        """주어-동사 수일치 검사"""
-        issues = []
-        
-        # 간단한 패턴 검사 (I/He/She + 동사 형태)
-        sentence_lower = sentence.lower()
-        
-        # 자주 틀리는 패턴들
-        error_patterns = [
-            (r'\bi am\s+\w+ing\b', '현재진행형이 맞나요?'),
-            (r'\bhe are\b|\bshe are\b', 'He/She는 is를 써야 합니다'),
-            (r'\bthey is\b', 'They는 are를 써야 합니다'),
-            (r'\bi are\b', 'I는 am을 써야 합니다')
-        ]
-        
-        for pattern, description in error_patterns:
-            if re.search(pattern, sentence_lower):
-                issues.append({
-                    'type': 'subject_verb_agreement',
-                    'description': description,
-                    'suggestion': '주어와 동사의 수를 맞춰보세요'
-                })
-        
-        return issues
-    
-    def _check_tense_consistency(self, sentence, pos_tags):
-        """시제 일관성 검사"""
-        issues = []
-        
-        # 과거형과 현재형이 혼재된 경우 체크
-        past_verbs = [word for word, pos in pos_tags if pos in ['VBD']]  # 과거형
-        present_verbs = [word for word, pos in pos_tags if pos in ['VBZ', 'VBP']]  # 현재형
-        
-        if len(past_verbs) > 0 and len(present_verbs) > 0:
-            issues.append({
-                'type': 'tense_consistency',
-                'description': '한 문장에서 과거형과 현재형이 혼재되어 있습니다',
-                'suggestion': '문장 전체의 시제를 일치시켜보세요'
-            })
-        
-        return issues
-    
-    def _check_article_usage(self, sentence, pos_tags):
-        """관사 사용 검사"""
-        issues = []
-        
-        # 관사가 빠진 패턴 (간단한 체크)
-        sentence_lower = sentence.lower()
-        
-        # 자주 실수하는 패턴
-        if re.search(r'\b(go to school|at home|in bed)\b', sentence_lower):
-            # 이런 경우는 관사가 없는 게 맞음
-            pass
-        elif re.search(r'\b[a-z]+ (cat|dog|book|house|car)\b', sentence_lower):
-            if not re.search(r'\b(a|an|the) (cat|dog|book|house|car)\b', sentence_lower):
-                issues.append({
-                    'type': 'article_usage',
-                    'description': '셀 수 있는 명사 앞에는 관사가 필요할 수 있습니다',
-                    'suggestion': 'a/an/the 중 적절한 관사를 추가해보세요'
-                })
-        
-        return issues
-    
-    def _check_preposition_patterns(self, sentence, pos_tags):
-        """전치사 사용 검사"""
-        issues = []
-        
-        sentence_lower = sentence.lower()
-        
-        # 자주 틀리는 전치사 패턴
-        error_patterns = [
-            (r'\bin the morning\b.*\bin the afternoon\b', '시간 전치사 사용을 확인해보세요'),
-            (r'\bgo to home\b', 'go home이 맞습니다 (to 불필요)'),
-            (r'\blisten music\b', 'listen to music이 맞습니다'),
-        ]
-        
-        for pattern, description in error_patterns:
-            if re.search(pattern, sentence_lower):
-                issues.append({
-                    'type': 'preposition_usage',
-                    'description': description,
-                    'suggestion': '전치사 사용 규칙을 확인해보세요'
-                })
-        
-        return issues
-    
-    def _check_sentence_structure(self, sentence, pos_tags):
-        """문장 구조 검사"""
-        issues = []
-        
-        # 문장이 너무 길거나 짧은 경우
-        word_count = len([word for word, pos in pos_tags if pos not in ['.',  ',', ':', ';']])
-        
-        if word_count > 25:
-            issues.append({
-                'type': 'sentence_length',
-                'description': '문장이 너무 길어 읽기 어려울 수 있습니다',
-                'suggestion': '문장을 나누어보세요'
-            })
-        elif word_count < 3:
-            issues.append({
-                'type': 'sentence_length', 
-                'description': '문장이 너무 짧습니다',
-                'suggestion': '좀 더 자세한 설명을 추가해보세요'
-            })
-        
-        # 주어나 동사가 없는 경우 (간단 체크)
-        has_subject = any(pos in ['PRP', 'NN', 'NNS', 'NNP', 'NNPS'] for word, pos in pos_tags)
-        has_verb = any(pos.startswith('VB') for word, pos in pos_tags)
-        
-        if not has_subject:
-            issues.append({
-                'type': 'sentence_structure',
-                'description': '주어가 없는 것 같습니다',
-                'suggestion': '문장의 주어를 명확히 해보세요'
-            })
-        
-        if not has_verb:
-            issues.append({
-                'type': 'sentence_structure',
-                'description': '동사가 없는 것 같습니다',
-                'suggestion': '문장에 동사를 추가해보세요'
-            })
-        
-        return issues
+    def _token_offsets(self, sentence, pos_tags):
+        """토큰별 문장 내 (시작, 끝) 문자 위치 (토크나이저가 바꾼 토큰은 None)"""
+        offsets = []
+        cursor = 0
+        for word, _ in pos_tags:
+            start = sentence.find(word, cursor)
+            if start < 0:
+                offsets.append(None)
+                continue
+            offsets.append((start, start + len(word)))
+            cursor = start + len(word)
+        return offsets
     
     def _identify_improvement_areas(self, error_count_by_type):
         """주요 개선 영역 식별"""
@@ -2733,7 +2646,7 @@ class TextPreprocessor:
                 }
             
             # 문장별 감정 분석 (처음 3문장)
-            sentences = [s.strip() for s in cleaned_text.split('.') if s.strip()]
+            sentences = self.segmenter.sentences(cleaned_text)
             sentence_emotions = []
             
             for i, sentence in enumerate(sentences[:3]):
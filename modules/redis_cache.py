@@ -1,60 +1,127 @@
 import redis
 import json
+import fnmatch
 import os
+import threading
+import time
+import uuid
 import streamlit as st
-from typing import Any, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 import logging
+from modules.circuit_breaker import CircuitBreaker
+from modules.local_cache import LocalCache
+from modules.cache_codec import CacheCodec
+from modules.cache_metrics import CacheMetrics
 
 # 로거 설정
 logger = logging.getLogger(__name__)
 
+# 모든 캐시 키의 접두어 (키 형식이 바뀌면 버전을 올림)
+NAMESPACE = "tms:v3"
+
+# 커넥션 풀 기본 크기 (REDIS_MAX_CONNECTIONS로 변경 가능)
+DEFAULT_MAX_CONNECTIONS = 20
+
+
+def _get_setting(name: str, default=None):
+    """Streamlit secrets → 환경 변수 순서로 설정값 조회"""
+    try:
+        return st.secrets[name]
+    except Exception:
+        return os.getenv(name, default)
+
+
 class RedisCache:
-    """Redis 캐시 관리 클래스"""
+    """Redis 캐시 관리 클래스
+
+    Redis가 없거나 회로 차단기가 열려 있으면 프로세스 내 로컬 캐시(LocalCache)로 동작합니다.
+    """
+
+    # 로컬 계층 최대 보관 시간 (초)
+    LOCAL_TTL = 300
+
+    # 세대 번호를 로컬에 보관하는 시간 (초) - 무효화가 다른 프로세스에 반영되는 최대 지연
+    GENERATION_CACHE_SECONDS = 5
+
+    # soft/hard TTL 값을 감싸는 봉투(envelope) 표시
+    _SWR_MARKER = '__swr__'
 
-    def __init__(self):
-        """Redis 연결 초기화"""
+    # 토큰이 일치할 때만 락 삭제 (다른 워커의 락을 지우지 않도록)
+    _RELEASE_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, max_connections: Optional[int] = None):
+        """Redis 연결 초기화
+
+        Args:
+            max_connections: 커넥션 풀 최대 크기 (기본: REDIS_MAX_CONNECTIONS 또는 20)
+        """
         self.client = None
-        self._connect()
+        self.pool = None
+        self.max_connections = int(max_connections or _get_setting("REDIS_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS))
+        # Redis 장애 시 로컬 계층으로 우회하는 회로 차단기
+        self.breaker = CircuitBreaker(
+            failure_threshold=int(_get_setting("REDIS_BREAKER_FAILURES", 3)),
+            reset_timeout=float(_get_setting("REDIS_BREAKER_RESET_SECONDS", 30))
+        )
+        self.local = LocalCache()
+        # 큰 값은 압축 저장 (헤더로 압축 방식 표시)
+        self.codec = CacheCodec(
+            algorithm=_get_setting("CACHE_COMPRESSION", "zstd"),
+            level=int(_get_setting("CACHE_COMPRESSION_LEVEL", 3)),
+            threshold=int(_get_setting("CACHE_COMPRESSION_THRESHOLD", 1024))
+        )
+        # 키 그룹/계층/결과별 조회 카운터 (관리자 화면, Prometheus)
+        self.metrics = CacheMetrics(export_path=_get_setting("CACHE_METRICS_FILE"))
+        metrics_port = _get_setting("CACHE_METRICS_PORT")
+        if metrics_port:
+            self.metrics.serve(metrics_port, _get_setting("CACHE_METRICS_HOST", "127.0.0.1"))
+        self._generations = {}
+        self._generations_lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+
+        # Streamlit Cloud에서는 secrets, 로컬에서는 환경 변수 사용
+        self.redis_url = _get_setting("REDIS_URL")
+        if self.redis_url:
+            logger.info("Using Redis URL from settings")
+            self._connect()
+        else:
+            logger.warning("REDIS_URL not found. Using local in-process cache only.")
 
     def _connect(self):
-        """Redis 서버에 연결"""
+        """Redis 서버에 연결 (화면 출력 없음, 상태는 is_connected()/circuit_state()로 확인)
+
+        공유 캐시 객체 안에서 실행되므로 st.* 를 호출하지 않습니다. 연결에 실패하면
+        회로 차단기를 열어 reset_timeout 뒤에 _redis_available()이 다시 연결을 시도합니다.
+        """
         try:
-            # Streamlit Cloud에서는 secrets 사용
-            redis_url = None
-            try:
-                redis_url = st.secrets["REDIS_URL"]
-                st.write("✅ Redis URL found in Streamlit secrets")
-                logger.info("Using Redis URL from Streamlit secrets")
-            except Exception as e:
-                # 로컬에서는 환경 변수 사용
-                redis_url = os.getenv("REDIS_URL")
-                if redis_url:
-                    st.write("✅ Redis URL found in environment variable")
-                    logger.info("Using Redis URL from environment variable")
-                else:
-                    st.warning("⚠️ REDIS_URL not found. Cache disabled.")
-                    logger.warning("REDIS_URL not found")
-
-            if not redis_url:
-                return
-
-            # Redis 연결
-            self.client = redis.from_url(
-                redis_url,
-                decode_responses=True,
+            # Redis 연결 (크기가 제한된 커넥션 풀, 풀이 가득 차면 잠시 대기)
+            self.pool = redis.BlockingConnectionPool.from_url(
+                self.redis_url,
+                max_connections=self.max_connections,
+                timeout=5,
+                decode_responses=False,  # 압축된 바이트 값을 그대로 주고받음
                 socket_connect_timeout=5,
                 socket_timeout=5
             )
+            self.client = redis.Redis(connection_pool=self.pool)
 
             # 연결 테스트
             self.client.ping()
-            st.success("🎉 Redis cache connected successfully!")
+            self.breaker.record_success()
             logger.info("Redis cache connected successfully")
 
         except Exception as e:
-            st.error(f"❌ Redis connection failed: {e}")
             logger.error(f"Redis connection failed: {e}")
             self.client = None
+            if self.pool:
+                self.pool.disconnect()
+                self.pool = None
+            self.breaker.trip()
 
     def get(self, key: str) -> Optional[Any]:
         """캐시에서 데이터 가져오기
@@ -63,66 +130,318 @@ class RedisCache:
             key: 캐시 키
 
         Returns:
-            캐시된 데이터 또는 None
+            캐시된 데이터 또는 None (soft TTL이 지난 값도 반환)
+        """
+        value, _ = self.get_with_state(key)
+        return value
+
+    def get_with_state(self, key: str) -> Tuple[Optional[Any], bool]:
+        """캐시 데이터와 신선도 함께 가져오기
+
+        Returns:
+            (캐시된 데이터 또는 None, soft TTL 이내 여부)
+        """
+        family = self.metrics.family_of(key)
+        started = time.perf_counter()
+        data, tier = self._get_raw(self._key(key), family)
+        if not data:
+            self.metrics.record(family, tier, 'miss', time.perf_counter() - started)
+            return None, False
+
+        value, is_fresh = self._unwrap(data)
+        self.metrics.record(family, tier, 'hit' if is_fresh else 'stale', time.perf_counter() - started)
+        return value, is_fresh
+
+    def peek(self, key: str) -> Optional[Any]:
+        """적중률 통계에 기록하지 않는 조회 (락 대기 중 폴링, 락 획득 후 재확인 등 내부용)"""
+        return self.peek_with_state(key)[0]
+
+    def peek_with_state(self, key: str) -> Tuple[Optional[Any], bool]:
+        """적중률 통계에 기록하지 않는 조회 + soft TTL 이내 여부 (없으면 (None, False))"""
+        data, _ = self._get_raw(self._key(key), self.metrics.family_of(key))
+        if not data:
+            return None, False
+        return self._unwrap(data)
+
+    def _unwrap(self, data: bytes) -> Tuple[Any, bool]:
+        """직렬화된 값 → (값, soft TTL 이내 여부)"""
+        value = json.loads(self.codec.decode(data))
+        if isinstance(value, dict) and value.get(self._SWR_MARKER):
+            return value.get('value'), time.time() < value.get('fresh_until', 0)
+        return value, True
+
+    def _get_raw(self, key: str, family: str) -> Tuple[Optional[bytes], str]:
+        """직렬화된 값 조회 (Redis → 실패/차단 시 로컬 계층)
+
+        Returns:
+            (직렬화된 값 또는 None, 조회한 계층 'redis'/'local')
         """
-        if not self.client:
-            return None
+        if not self._redis_available():
+            return self.local.get(key), 'local'
 
+        started = time.perf_counter()
         try:
             data = self.client.get(key)
+            self.breaker.record_success()
             if data:
-                return json.loads(data)
-            return None
+                self.local.set(key, data, self.LOCAL_TTL)
+            return data, 'redis'
         except Exception as e:
+            self.breaker.record_failure()
+            self.metrics.record(family, 'redis', 'error', time.perf_counter() - started)
             print(f"Redis GET error for key '{key}': {e}")
-            return None
+            return self.local.get(key), 'local'
 
-    def set(self, key: str, value: Any, ttl: int = 300):
+    def set(self, key: str, value: Any, ttl: int = 300, soft_ttl: Optional[int] = None):
         """캐시에 데이터 저장
 
         Args:
             key: 캐시 키
             value: 저장할 데이터 (JSON 직렬화 가능해야 함)
-            ttl: 캐시 유지 시간 (초, 기본 5분)
+            ttl: 캐시 유지 시간 (초, 기본 5분) - 이 시간이 지나면 삭제 (hard TTL)
+            soft_ttl: 신선한 값으로 취급하는 시간 (초) - 지나면 get_with_state()가 stale로 표시
         """
-        if not self.client:
+        if soft_ttl is not None:
+            value = {self._SWR_MARKER: True, 'value': value, 'fresh_until': time.time() + soft_ttl}
+        key = self._key(key)
+
+        try:
+            data = self.codec.encode(json.dumps(value, ensure_ascii=False, default=str))
+        except Exception as e:
+            print(f"Cache SET serialization error for key '{key}': {e}")
+            return
+
+        self.local.set(key, data, min(ttl, self.LOCAL_TTL))
+
+        if not self._redis_available():
             return
 
         try:
-            json_data = json.dumps(value, ensure_ascii=False, default=str)
-            self.client.setex(key, ttl, json_data)
-            print(f"Redis SET: key='{key}', ttl={ttl}s")
+            self.client.setex(key, ttl, data)
+            self.breaker.record_success()
+            print(f"Redis SET: key='{key}', ttl={ttl}s, {len(data)} bytes")
         except Exception as e:
+            self.breaker.record_failure()
             print(f"Redis SET error for key '{key}': {e}")
 
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """여러 키를 한 번에 가져오기 (MGET 1회 왕복)
+
+        Args:
+            keys: 캐시 키 목록
+
+        Returns:
+            {키: 캐시된 데이터} (없는 키는 제외)
+        """
+        return {key: value for key, (value, _) in self.get_many_with_state(keys).items()}
+
+    def get_many_with_state(self, keys: List[str]) -> Dict[str, Tuple[Any, bool]]:
+        """여러 키의 데이터와 신선도를 한 번에 가져오기
+
+        Returns:
+            {키: (캐시된 데이터, soft TTL 이내 여부)} (없는 키는 제외)
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        physical_keys = [self._key(key) for key in keys]
+        raw_values = None
+        tier = 'local'
+        started = time.perf_counter()
+        if self._redis_available():
+            try:
+                raw_values = self.client.mget(physical_keys)
+                tier = 'redis'
+                self.breaker.record_success()
+                for physical_key, data in zip(physical_keys, raw_values):
+                    if data:
+                        self.local.set(physical_key, data, self.LOCAL_TTL)
+            except Exception as e:
+                self.breaker.record_failure()
+                self.metrics.record(self.metrics.family_of(keys[0]), 'redis', 'error',
+                                    time.perf_counter() - started, count=len(keys))
+                print(f"Redis MGET error for {len(keys)} keys: {e}")
+        if raw_values is None:
+            raw_values = [self.local.get(physical_key) for physical_key in physical_keys]
+
+        results = {}
+        outcomes = {}
+        for key, data in zip(keys, raw_values):
+            outcome = 'miss'
+            if data:
+                results[key] = self._unwrap(data)
+                outcome = 'hit' if results[key][1] else 'stale'
+            group = (self.metrics.family_of(key), outcome)
+            outcomes[group] = outcomes.get(group, 0) + 1
+
+        # 왕복 1회 시간을 키 개수만큼 나눠 기록
+        elapsed = time.perf_counter() - started
+        for (family, outcome), count in outcomes.items():
+            self.metrics.record(family, tier, outcome, elapsed * count / len(keys), count=count)
+        return results
+
+    def set_many(self, items: Dict[str, Any], ttl: Union[int, Dict[str, int]] = 300,
+                 soft_ttl: Optional[int] = None):
+        """여러 키를 한 번에 저장 (파이프라인 1회 왕복)
+
+        Args:
+            items: {키: 저장할 데이터}
+            ttl: 모든 키에 같은 유지 시간(초) 또는 {키: 유지 시간} (없는 키는 300초)
+            soft_ttl: 신선한 값으로 취급하는 시간 (초)
+        """
+        if not items:
+            return
+
+        fresh_until = time.time() + soft_ttl if soft_ttl is not None else None
+        encoded = []
+        for key, value in items.items():
+            key_ttl = ttl.get(key, 300) if isinstance(ttl, dict) else ttl
+            if fresh_until is not None:
+                value = {self._SWR_MARKER: True, 'value': value, 'fresh_until': fresh_until}
+            try:
+                data = self.codec.encode(json.dumps(value, ensure_ascii=False, default=str))
+            except Exception as e:
+                print(f"Cache SET serialization error for key '{key}': {e}")
+                continue
+            physical_key = self._key(key)
+            self.local.set(physical_key, data, min(key_ttl, self.LOCAL_TTL))
+            encoded.append((physical_key, key_ttl, data))
+
+        if not encoded or not self._redis_available():
+            return
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for physical_key, key_ttl, data in encoded:
+                pipe.setex(physical_key, key_ttl, data)
+            pipe.execute()
+            self.breaker.record_success()
+            print(f"Redis SET (pipeline): {len(encoded)} keys")
+        except Exception as e:
+            self.breaker.record_failure()
+            print(f"Redis pipeline SET error for {len(encoded)} keys: {e}")
+
     def delete(self, key: str):
         """캐시 삭제
 
         Args:
             key: 삭제할 캐시 키
         """
-        if not self.client:
+        key = self._key(key)
+        self.local.delete(key)
+
+        if not self._redis_available():
             return
 
         try:
             self.client.delete(key)
+            self.breaker.record_success()
             print(f"Redis DELETE: key='{key}'")
         except Exception as e:
+            self.breaker.record_failure()
             print(f"Redis DELETE error for key '{key}': {e}")
 
+    def invalidate_namespace(self, family: str) -> int:
+        """키 그룹 전체 무효화 (세대 번호 증가, 기존 키는 TTL로 자연 만료)
+
+        Args:
+            family: 키 그룹 이름 (예: 'essays', 'students')
+
+        Returns:
+            새 세대 번호
+        """
+        generation = self._generation(family) + 1
+        if self._redis_available():
+            try:
+                generation = int(self.client.incr(self._generation_key(family)))
+                self.breaker.record_success()
+            except Exception as e:
+                self.breaker.record_failure()
+                print(f"Redis INCR error for namespace '{family}': {e}")
+
+        with self._generations_lock:
+            self._generations[family] = (generation, time.monotonic())
+        print(f"Cache namespace invalidated: {family} → g{generation}")
+        return generation
+
     def clear_all(self):
-        """모든 캐시 삭제 (주의: 전체 데이터베이스 초기화)"""
-        if not self.client:
-            return
+        """이 앱의 캐시 전체 무효화 (FLUSHDB와 달리 같은 DB의 다른 데이터는 건드리지 않음)"""
+        families = set()
+        with self._generations_lock:
+            families.update(self._generations)
+
+        # 네임스페이스 안의 키 그룹 찾기 (SCAN, 서버를 막지 않음)
+        for key in self._scan(f"{NAMESPACE}:*"):
+            parts = key.split(":")
+            if len(parts) >= 4:
+                families.add(parts[3] if parts[2] == "gen" else parts[2])
+
+        for family in families:
+            self.invalidate_namespace(family)
+        self.local.clear()
+
+        # 이전 세대 키 정리 (작은 단위로 UNLINK)
+        removed = self.purge_old_generations()
+        print(f"Cache: All namespaces invalidated ({len(families)} families, {removed} old keys removed)")
+
+    def purge_old_generations(self, batch_size: int = 500) -> int:
+        """현재 세대가 아닌 키를 SCAN으로 찾아 비동기 삭제(UNLINK)
+
+        Returns:
+            삭제한 키 개수
+        """
+        if not self._redis_available():
+            return 0
 
+        removed = 0
+        batch = []
         try:
-            self.client.flushdb()
-            print("Redis: All cache cleared")
+            for key in self._scan(f"{NAMESPACE}:*", batch_size):
+                parts = key.split(":")
+                if len(parts) < 4 or parts[2] == "gen" or not parts[3].startswith("g"):
+                    continue
+                if parts[3] != f"g{self._generation(parts[2])}":
+                    batch.append(key)
+                if len(batch) >= batch_size:
+                    removed += self.client.unlink(*batch)
+                    batch = []
+            if batch:
+                removed += self.client.unlink(*batch)
+            self.breaker.record_success()
         except Exception as e:
-            print(f"Redis CLEAR error: {e}")
+            self.breaker.record_failure()
+            print(f"Redis PURGE error: {e}")
+        return removed
+
+    def scan_keys(self, pattern: str = "*", count: int = 500) -> Iterator[str]:
+        """현재 세대의 캐시 키를 SCAN으로 순회 (KEYS처럼 서버 전체를 막지 않음)
+
+        Args:
+            pattern: 논리 키 패턴 (예: 'essays:*')
+            count: SCAN 1회당 힌트 개수
+
+        Yields:
+            논리 키 (get/delete에 그대로 사용 가능)
+        """
+        family = pattern.split(":", 1)[0]
+        if any(char in family for char in "*?["):
+            physical_pattern = f"{NAMESPACE}:*"
+        else:
+            physical_pattern = f"{NAMESPACE}:{family}:g{self._generation(family)}:*"
+
+        for key in self._scan(physical_pattern, count):
+            parts = key.split(":", 4)
+            if len(parts) < 5 or parts[2] == "gen":
+                continue
+            if parts[3] != f"g{self._generation(parts[2])}":
+                continue
+            logical_key = f"{parts[2]}:{parts[4]}"
+            if fnmatch.fnmatchcase(logical_key, pattern):
+                yield logical_key
 
     def get_keys(self, pattern: str = "*") -> list:
-        """패턴과 일치하는 모든 키 반환
+        """패턴과 일치하는 모든 키 반환 (SCAN 기반)
 
         Args:
             pattern: 검색 패턴 (기본: 모든 키)
@@ -130,14 +449,54 @@ class RedisCache:
         Returns:
             키 리스트
         """
-        if not self.client:
-            return []
+        return list(self.scan_keys(pattern))
 
+    def _scan(self, physical_pattern: str, count: int = 500) -> Iterator[str]:
+        if not self._redis_available():
+            return
+        recorded = False
         try:
-            return self.client.keys(pattern)
+            for key in self.client.scan_iter(match=physical_pattern, count=count):
+                yield key.decode('utf-8') if isinstance(key, bytes) else key
+            recorded = True
+            self.breaker.record_success()
         except Exception as e:
-            print(f"Redis KEYS error: {e}")
-            return []
+            recorded = True
+            self.breaker.record_failure()
+            print(f"Redis SCAN error: {e}")
+        finally:
+            # 호출한 쪽이 순회를 중간에 멈추면(GeneratorExit) 결과 없이 끝나므로 시험 호출 자리만 반환
+            if not recorded:
+                self.breaker.release()
+
+    def _key(self, key: str) -> str:
+        """논리 키 → 버전/세대가 붙은 실제 키 (예: essays:kim → tms:v3:essays:g2:kim)"""
+        family, _, rest = key.partition(":")
+        return f"{NAMESPACE}:{family}:g{self._generation(family)}:{rest}"
+
+    def _generation_key(self, family: str) -> str:
+        return f"{NAMESPACE}:gen:{family}"
+
+    def _generation(self, family: str) -> int:
+        """키 그룹의 현재 세대 번호 (GENERATION_CACHE_SECONDS 동안 로컬에 보관)"""
+        with self._generations_lock:
+            cached = self._generations.get(family)
+        if cached and time.monotonic() - cached[1] < self.GENERATION_CACHE_SECONDS:
+            return cached[0]
+
+        generation = cached[0] if cached else 0
+        if self._redis_available():
+            try:
+                value = self.client.get(self._generation_key(family))
+                self.breaker.record_success()
+                generation = int(value) if value else 0
+            except Exception as e:
+                self.breaker.record_failure()
+                print(f"Redis GET error for namespace '{family}': {e}")
+
+        with self._generations_lock:
+            self._generations[family] = (generation, time.monotonic())
+        return generation
 
     def is_connected(self) -> bool:
         """Redis 연결 상태 확인
@@ -145,11 +504,115 @@ class RedisCache:
         Returns:
             연결 여부
         """
-        if not self.client:
+        if not self._redis_available():
             return False
 
         try:
             self.client.ping()
+            self.breaker.record_success()
             return True
         except:
+            self.breaker.record_failure()
             return False
+
+    def acquire_lock(self, name: str, ttl: int = 30) -> Optional[str]:
+        """분산 락(lease) 획득 (SET NX + 만료 시간)
+
+        Args:
+            name: 락 이름
+            ttl: 락 유지 시간 (초) - 락을 가진 워커가 죽어도 이 시간 후 자동 해제
+
+        Returns:
+            락 토큰 (다른 워커가 보유 중이면 None, Redis를 쓸 수 없으면 로컬 토큰)
+        """
+        token = uuid.uuid4().hex
+        name = self._key(name)
+        if not self._redis_available():
+            return token
+
+        try:
+            acquired = self.client.set(name, token, nx=True, ex=ttl)
+            self.breaker.record_success()
+            return token if acquired else None
+        except Exception as e:
+            self.breaker.record_failure()
+            print(f"Redis LOCK error for '{name}': {e}")
+            return token
+
+    def release_lock(self, name: str, token: str):
+        """락 해제 (내가 획득한 락일 때만 삭제)"""
+        name = self._key(name)
+        if not self._redis_available():
+            return
+
+        try:
+            self.client.eval(self._RELEASE_SCRIPT, 1, name, token)
+            self.breaker.record_success()
+        except Exception as e:
+            self.breaker.record_failure()
+            print(f"Redis UNLOCK error for '{name}': {e}")
+
+    def _redis_available(self) -> bool:
+        """Redis가 설정되어 있고 회로 차단기가 호출을 허용하는지 여부
+
+        연결되지 않은 상태(시작 시 연결 실패 등)면 회로 차단기가 허용할 때만 다시 연결합니다.
+        """
+        if self.client is None:
+            return self._reconnect()
+        return self.breaker.allow_request()
+
+    def _reconnect(self) -> bool:
+        """끊긴 연결 다시 시도 (회로 차단기로 reset_timeout마다 1회로 제한)"""
+        if not self.redis_url or not self.breaker.allow_request():
+            return False
+        with self._connect_lock:
+            if self.client is None:
+                print("Redis reconnecting...")
+                self._connect()
+        return self.client is not None
+
+    def circuit_state(self) -> dict:
+        """회로 차단기 상태 (Redis 미설정 시 state='disabled')
+
+        Returns:
+            state(closed/open/half_open/disabled), consecutive_failures, short_circuited, retry_in(초)
+        """
+        if not self.redis_url:
+            return {'state': 'disabled', 'consecutive_failures': 0, 'short_circuited': 0, 'retry_in': 0.0}
+        return self.breaker.stats()
+
+    def metrics_snapshot(self) -> list:
+        """키 그룹/계층/결과별 조회 통계 (CacheMetrics.snapshot() 참고)"""
+        return self.metrics.snapshot()
+
+    def compression_stats(self) -> dict:
+        """압축 전후 크기 통계 (CacheCodec.stats() 참고)"""
+        return self.codec.stats()
+
+    def pool_stats(self) -> dict:
+        """커넥션 풀 사용 현황
+
+        Returns:
+            max_connections, created(생성된 연결), in_use(사용 중), available(대기 중), utilization(%)
+        """
+        if not self.pool:
+            return {'max_connections': self.max_connections, 'created': 0, 'in_use': 0,
+                    'available': 0, 'utilization': 0.0}
+
+        # BlockingConnectionPool은 미생성 슬롯을 None으로 채운 큐를 사용
+        available = [conn for conn in list(self.pool.pool.queue) if conn is not None]
+        created = len(self.pool._connections)
+        in_use = max(0, created - len(available))
+        return {
+            'max_connections': self.max_connections,
+            'created': created,
+            'in_use': in_use,
+            'available': len(available),
+            'utilization': in_use / self.max_connections * 100 if self.max_connections else 0.0
+        }
+
+
+@st.cache_resource(show_spinner=False)
+def get_shared_cache() -> RedisCache:
+    """프로세스 전체에서 공유하는 RedisCache (세션마다 새 연결을 만들지 않음)"""
+    return RedisCache()
@@ -0,0 +1,300 @@
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import streamlit as st
+
+from modules.essay_aggregates import essay_fingerprint
+from modules.time_budget import DEFAULT_ANALYSIS_TIME_BUDGET, get_analysis_time_budget
+
+# 빠른 추정 모드 기본값
+DEFAULT_TIME_BUDGET = 5.0     # 추정 결과를 보여줄 때까지의 목표 시간 (초)
+DEFAULT_GROUPS = 4            # 신뢰구간 계산용 무작위 그룹 수
+BLOCK_SIZE = 3                # 표본 단위: 연속된 문장 3개 (문장 간 연결성 분석 유지)
+PILOT_BLOCKS = 6              # 처리 속도 측정용 예비 표본 블록 수
+MIN_BLOCKS_PER_GROUP = 4
+MIN_SAMPLED_SENTENCES = 80    # 전체 문장이 이보다 적으면 바로 정밀 분석
+MIN_TIME_LIMIT = 0.01         # 시간 예산을 다 쓴 뒤 분석에 넘기는 time_limit (0은 제한 없음이라 쓰지 않음)
+
+# 백그라운드 정밀 분석 시간 제한 = ANALYSIS_TIME_BUDGET × 배수 (넘으면 결과를 버리고 추정 결과 유지)
+BACKGROUND_TIME_MULTIPLIER = 10
+DEFAULT_EXACT_WORKERS = 2
+
+# 자유도별 t 분포 97.5% 분위수 (95% 신뢰구간)
+_T_975 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262}
+
+# 신뢰구간을 계산하는 지표: 이름 → 결과 dict 경로
+ESTIMATED_METRICS = {
+    'overall_score': ('overall_score',),
+    'statistical_score': ('step1_statistical', 'statistical_score'),
+    'vocabulary_score': ('step2_vocabulary', 'complexity_analysis', 'sophistication_score'),
+    'grammar_score': ('step3_grammar', 'grammar_score'),
+    'coherence_score': ('step3_similarity', 'coherence_score'),
+    'avg_sentence_length': ('step1_statistical', 'user_statistics', 'avg_sentence_length'),
+}
+
+
+def stratified_blocks(essays, segmenter, block_size=BLOCK_SIZE, seed=0):
+    """에세이별 층화 표본 순서
+
+    각 에세이를 연속 문장 block_size개씩 블록으로 나누고 에세이 안에서 무작위로 섞은 뒤,
+    (순번 + 난수) / 에세이 블록 수 순으로 합칩니다. 이렇게 하면 앞에서부터 몇 개를 잘라도
+    에세이별 블록 비율이 전체 비율과 거의 같습니다(비례 배분).
+
+    Returns:
+        [(에세이 번호, 블록 번호, [문장])] - 표본으로 뽑을 순서
+    """
+    rng = random.Random(seed)
+    keyed = []
+    for essay_index, essay in enumerate(essays):
+        sentences = segmenter.sentences(essay)
+        blocks = [(essay_index, start // block_size, sentences[start:start + block_size])
+                  for start in range(0, len(sentences), block_size)]
+        rng.shuffle(blocks)
+        for rank, block in enumerate(blocks):
+            keyed.append(((rank + rng.random()) / len(blocks), block))
+    keyed.sort(key=lambda item: item[0])
+    return [block for _, block in keyed]
+
+
+def sample_text(blocks):
+    """표본 블록 → 분석용 텍스트 (원래 에세이/문장 순서로 정렬)"""
+    ordered = sorted(blocks, key=lambda block: (block[0], block[1]))
+    return ' '.join(' '.join(sentences) for _, _, sentences in ordered)
+
+
+def _metric(result, path):
+    value = result
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+def random_groups_interval(point, replicates):
+    """무작위 그룹 분산 추정 기반 95% 신뢰구간
+
+    Args:
+        point: 전체 표본 추정값
+        replicates: 서로 겹치지 않는 그룹별 추정값
+    Returns:
+        (하한, 상한) 또는 None (그룹이 2개 미만)
+    """
+    values = np.asarray([value for value in replicates if value is not None], dtype=float)
+    if point is None or len(values) < 2:
+        return None
+    standard_error = float(np.sqrt(values.var(ddof=1) / len(values)))
+    margin = _T_975.get(len(values) - 1, 1.96) * standard_error
+    return (round(point - margin, 2), round(point + margin, 2))
+
+
+class ExactAnalysisJobs:
+    """정밀 분석 백그라운드 작업 (텍스트 해시별 1개, 완료된 결과는 최근 것부터 보관)
+
+    정밀 분석이 끝나기 전 화면이 다시 실행되어도 표본 분석을 반복하지 않도록
+    추정 결과도 같은 키로 보관합니다. 시간 제한에 걸린 정밀 분석(부분 결과)은 'partial'로
+    표시하고 결과로 쓰지 않습니다.
+    """
+
+    def __init__(self, max_workers=DEFAULT_EXACT_WORKERS, max_jobs=32):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='exact-analysis')
+        self._futures = OrderedDict()
+        self._estimates = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_jobs = max_jobs
+
+    def submit(self, key, func, *args, **kwargs):
+        """작업 시작 (같은 키의 작업이 이미 있으면 그대로 둠)"""
+        with self._lock:
+            if key in self._futures:
+                return self._futures[key]
+            future = self._executor.submit(func, *args, **kwargs)
+            self._futures[key] = future
+            while len(self._futures) > self.max_jobs:
+                oldest = next(iter(self._futures))
+                if not self._futures[oldest].done():
+                    break
+                self._futures.pop(oldest)
+            return future
+
+    def status(self, key):
+        """'running' / 'done' / 'partial'(시간 제한 초과) / 'failed' / None(작업 없음)"""
+        future = self._futures.get(key)
+        if future is None:
+            return None
+        if not future.done():
+            return 'running'
+        result = None if future.exception() else future.result()
+        if not result or 'error' in result:
+            return 'failed'
+        return 'partial' if result.get('truncated_steps') else 'done'
+
+    def result(self, key):
+        """완료된 정밀 분석 결과 (없거나 진행 중/실패면 None)"""
+        return self._futures[key].result() if self.status(key) == 'done' else None
+
+    def estimate(self, key):
+        """보관된 추정 결과 (없으면 None)"""
+        with self._lock:
+            return self._estimates.get(key)
+
+    def store_estimate(self, key, result):
+        """추정 결과 보관 (최근 max_jobs개)"""
+        with self._lock:
+            self._estimates[key] = result
+            self._estimates.move_to_end(key)
+            while len(self._estimates) > self.max_jobs:
+                self._estimates.popitem(last=False)
+
+
+@st.cache_resource(show_spinner=False)
+def get_exact_analysis_jobs() -> ExactAnalysisJobs:
+    """프로세스 전체에서 공유하는 정밀 분석 작업 관리자 (EXACT_ANALYSIS_WORKERS로 동시 작업 수 설정)"""
+    try:
+        workers = st.secrets["EXACT_ANALYSIS_WORKERS"]
+    except Exception:
+        workers = os.getenv("EXACT_ANALYSIS_WORKERS", DEFAULT_EXACT_WORKERS)
+    try:
+        workers = max(1, int(workers))
+    except (TypeError, ValueError):
+        workers = DEFAULT_EXACT_WORKERS
+    return ExactAnalysisJobs(max_workers=workers)
+
+
+def get_background_time_limit():
+    """백그라운드 정밀 분석 시간 제한 (초, ANALYSIS_TIME_BUDGET × BACKGROUND_TIME_MULTIPLIER)
+
+    ANALYSIS_TIME_BUDGET이 0(제한 없음)이어도 작업자 스레드를 오래 붙잡지 않도록 기본 예산의 배수를 씁니다.
+    """
+    return (get_analysis_time_budget() or DEFAULT_ANALYSIS_TIME_BUDGET) * BACKGROUND_TIME_MULTIPLIER
+
+
+def analysis_key(text):
+    """정밀 분석 작업 키 (통합 텍스트 내용 해시)"""
+    return essay_fingerprint(text)
+
+
+def fast_writing_analysis(preprocessor, essays, aggregate=None, time_budget=DEFAULT_TIME_BUDGET,
+                          groups=DEFAULT_GROUPS, seed=0):
+    """빠른 추정 종합 진단
+
+    1. 에세이별 층화 표본(연속 문장 블록)을 만들고 예비 표본으로 문장당 처리 시간을 잰 뒤
+    2. 남은 시간 예산에 맞는 크기의 표본으로 종합 진단을 실행하고
+    3. 표본을 겹치지 않는 그룹으로 나눠 각각 분석한 값의 분산으로 95% 신뢰구간을 계산합니다.
+    정밀 분석(전체 텍스트)은 백그라운드에서 시작하며, 끝나면 다음 호출부터 정밀 결과를 돌려줍니다.
+    그 전까지는 같은 텍스트에 대해 보관된 추정 결과를 다시 돌려줍니다.
+    aggregate가 있으면 1단계 통계는 전체 에세이의 누적 집계(정확한 값)이므로 신뢰구간 대상에서 빠지고
+    'exact_metrics'에 기록됩니다.
+    어휘 다양성처럼 텍스트 길이에 영향을 받는 값은 표본이 작을수록 높게 추정될 수 있습니다.
+    모든 분석 호출은 time_budget에서 남은 시간을 time_limit으로 받으며, 시간이 다 되면 남은 그룹 분석을
+    건너뛰고 그때까지의 추정 결과(신뢰구간은 그룹이 2개 이상일 때만)를 돌려줍니다.
+
+    Returns:
+        comprehensive_writing_analysis 결과 + 'analysis_mode' ('estimate' / 'exact')
+        추정이면 'estimate': {'sampled_sentences', 'total_sentences', 'sample_ratio',
+        'confidence_intervals', 'exact_metrics', 'elapsed', 'exact_key'}
+    """
+    started = time.perf_counter()
+    ends_at = started + time_budget
+    text = ' '.join(essays)
+    key = analysis_key(text)
+    jobs = get_exact_analysis_jobs()
+
+    exact = jobs.result(key)
+    if exact is not None:
+        return {**exact, 'analysis_mode': 'exact'}
+    estimate = jobs.estimate(key)
+    if estimate is not None:
+        return estimate
+
+    def remaining(share=1.0):
+        """남은 시간 예산 × share (초, 다 썼으면 None)"""
+        seconds = ends_at - time.perf_counter()
+        return seconds * share if seconds > 0 else None
+
+    def run_exact():
+        """전체 텍스트를 남은 시간 안에서 분석 (시간이 부족해 부분 결과이면 정밀 분석은 백그라운드에서)"""
+        exact_result = preprocessor.comprehensive_writing_analysis(text, aggregate, time_limit=remaining() or MIN_TIME_LIMIT)
+        if exact_result.get('truncated_steps'):
+            jobs.submit(key, preprocessor.comprehensive_writing_analysis, text, aggregate,
+                        time_limit=get_background_time_limit())
+        return {**exact_result, 'analysis_mode': 'exact'}
+
+    blocks = stratified_blocks(essays, preprocessor.segmenter, seed=seed)
+    total_sentences = sum(len(sentences) for _, _, sentences in blocks)
+    if total_sentences <= MIN_SAMPLED_SENTENCES:
+        return run_exact()
+
+    # 예비 표본으로 블록당 처리 시간 측정
+    pilot_started = time.perf_counter()
+    pilot = blocks[:PILOT_BLOCKS]
+    pilot_result = preprocessor.comprehensive_writing_analysis(sample_text(pilot), aggregate,
+                                                              time_limit=remaining() or MIN_TIME_LIMIT)
+    seconds_per_block = (time.perf_counter() - pilot_started) / min(PILOT_BLOCKS, len(blocks))
+
+    # 전체 표본 1회 + 그룹별 분석(합계가 표본 크기와 같음) ≈ 표본 2회 분량
+    affordable = int((remaining() or 0) * 0.8 / (2 * max(seconds_per_block, 1e-6)))
+    sample_size = min(len(blocks), max(groups * MIN_BLOCKS_PER_GROUP, affordable))
+    if sample_size >= len(blocks):
+        return run_exact()
+
+    if remaining() is None:
+        # 예비 표본만으로 시간 예산을 다 씀 - 예비 표본 결과를 추정값으로 사용 (신뢰구간 없음)
+        sampled, result, replicates = pilot, pilot_result, []
+    else:
+        sampled = blocks[:sample_size]
+        # 전체 표본에 남은 시간의 절반, 그룹 분석에 나머지 절반
+        result = preprocessor.comprehensive_writing_analysis(sample_text(sampled), aggregate,
+                                                            time_limit=remaining(0.5) or MIN_TIME_LIMIT)
+        if 'error' in result:
+            return result
+        replicates = []
+        # 앞에서부터 번갈아 그룹에 배정 (각 그룹도 층화 비율 유지), 시간이 다 되면 남은 그룹은 건너뜀
+        for group in range(groups):
+            time_limit = remaining(1.0 / (groups - group))
+            if time_limit is None:
+                break
+            replicate = preprocessor.comprehensive_writing_analysis(sample_text(sampled[group::groups]), aggregate,
+                                                                   time_limit=time_limit)
+            # 시간 제한에 걸린 그룹 결과는 분산을 부풀리므로 신뢰구간 계산에서 제외
+            if not replicate.get('truncated_steps'):
+                replicates.append(replicate)
+    if 'error' in result:
+        return result
+
+    intervals = {}
+    exact_metrics = []
+    for name, path in ESTIMATED_METRICS.items():
+        if aggregate is not None and path[0] == 'step1_statistical':
+            # 누적 집계로 계산한 1단계 값은 표본과 무관한 정확한 값
+            exact_metrics.append(name)
+            continue
+        interval = random_groups_interval(_metric(result, path), [_metric(replicate, path) for replicate in replicates])
+        if interval is not None:
+            intervals[name] = interval
+
+    # 화면에는 추정 결과를 먼저 보여주고 전체 텍스트 정밀 분석은 백그라운드에서 진행
+    jobs.submit(key, preprocessor.comprehensive_writing_analysis, text, aggregate,
+                time_limit=get_background_time_limit())
+    sampled_sentences = sum(len(sentences) for _, _, sentences in sampled)
+
+    estimate = {
+        **result,
+        'analysis_mode': 'estimate',
+        'estimate': {
+            'sampled_sentences': sampled_sentences,
+            'total_sentences': total_sentences,
+            'sample_ratio': sampled_sentences / total_sentences,
+            'confidence_intervals': intervals,
+            'exact_metrics': exact_metrics,
+            'elapsed': round(time.perf_counter() - started, 2),
+            'exact_key': key
+        }
+    }
+    jobs.store_estimate(key, estimate)
+    return estimate
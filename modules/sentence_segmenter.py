@@ -0,0 +1,196 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import streamlit as st
+
+# 마침표로 끝나도 문장 끝이 아닌 약어 (소문자, 마지막 마침표 제외)
+ABBREVIATIONS = frozenset({
+    'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'mt', 'vs', 'etc', 'eg', 'e.g', 'ie', 'i.e',
+    'cf', 'al', 'approx', 'dept', 'est', 'fig', 'inc', 'ltd', 'co', 'corp', 'no', 'vol', 'pp',
+    'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec',
+    'a.m', 'p.m', 'u.s', 'u.k', 'ph.d', 'gov', 'gen', 'col', 'capt', 'lt', 'sgt', 'rev'
+})
+
+# 문장 부호(+ 닫는 따옴표/괄호) 뒤 공백 → 문장 경계 후보
+_BOUNDARY = re.compile(r'[.!?]+["\'”’)\]]*(?=\s+|$)')
+# 후보 앞의 마지막 단어 (약어 판별용)
+_LAST_WORD = re.compile(r'([A-Za-z][A-Za-z.]*)\.$')
+# 다음 문장 시작 (소문자로 시작하면 문장 중간으로 봄)
+_NEXT_START = re.compile(r'\s+([^\s])')
+
+# 문서별 경계 위치 캐시 크기
+DEFAULT_CACHE_SIZE = 2048
+
+# 문장 최대 길이 (문자) - 마침표 없이 붙여 넣은 긴 텍스트는 이 길이 안에서 공백 기준으로 나눔
+MAX_SENTENCE_CHARS = 1000
+
+
+class RegexSegmenter:
+    """정규식 기반 문장 분리 (약어/이니셜 인식)
+
+    '.', '!', '?' 뒤에 공백이 오면 경계 후보로 보고, 마침표 앞 단어가 약어(Dr., e.g.)나
+    한 글자 이니셜(J. K.)이거나 다음 문장이 소문자로 시작하면 경계에서 제외합니다.
+    """
+
+    name = 'regex'
+
+    def __init__(self, abbreviations=ABBREVIATIONS):
+        self.abbreviations = abbreviations
+
+    def _is_boundary(self, text, match):
+        mark = match.group()
+        if mark.startswith('.') and mark.rstrip('"\'”’)]') == '.':
+            word = _LAST_WORD.search(text, max(0, match.start() - 20), match.start() + 1)
+            if word:
+                token = word.group(1).lower()
+                if token in self.abbreviations or len(token) == 1:
+                    return False
+        following = _NEXT_START.match(text, match.end())
+        return following is None or not following.group(1).islower()
+
+    def span_tokenize(self, text):
+        """문장별 (시작, 끝) 문자 위치 (앞뒤 공백 제외)"""
+        spans = []
+        start = 0
+        for match in _BOUNDARY.finditer(text):
+            if self._is_boundary(text, match):
+                spans.append((start, match.end()))
+                start = match.end()
+        spans.append((start, len(text)))
+        return _strip_spans(text, spans)
+
+
+class PunktSegmenter:
+    """NLTK punkt 문장 분리 (학습된 영어 모델, 데이터가 없으면 학습 전 기본 모델)"""
+
+    name = 'punkt'
+
+    def __init__(self):
+        try:
+            from nltk.tokenize import PunktTokenizer
+
+            self.tokenizer = PunktTokenizer('english')
+        except Exception:
+            from nltk.tokenize.punkt import PunktSentenceTokenizer
+
+            print("punkt data not found - using untrained punkt tokenizer")
+            self.tokenizer = PunktSentenceTokenizer()
+
+    def span_tokenize(self, text):
+        """문장별 (시작, 끝) 문자 위치"""
+        return _strip_spans(text, self.tokenizer.span_tokenize(text))
+
+
+def _strip_spans(text, spans):
+    """앞뒤 공백을 제외하고 빈 문장은 버림"""
+    stripped = []
+    for start, end in spans:
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if end > start:
+            stripped.append((start, end))
+    return stripped
+
+
+def _split_long_spans(text, spans, limit=MAX_SENTENCE_CHARS):
+    """limit보다 긴 문장을 limit 이내의 마지막 공백에서 나눔 (공백이 없으면 limit에서 자름)"""
+    result = []
+    for start, end in spans:
+        while end - start > limit:
+            cut = text.rfind(' ', start + 1, start + limit)
+            if cut <= start:
+                cut = start + limit
+            result.append((start, cut))
+            start = cut
+            while start < end and text[start].isspace():
+                start += 1
+        if end > start:
+            result.append((start, end))
+    return result
+
+
+def create_segmenter(name='regex'):
+    """이름으로 문장 분리기 생성 ('regex' 또는 'punkt')"""
+    if name == 'punkt':
+        return PunktSegmenter()
+    if name != 'regex':
+        print(f"Unknown sentence segmenter '{name}' - using regex")
+    return RegexSegmenter()
+
+
+class SentenceSegmenter:
+    """공용 문장 분리 서비스
+
+    문서 내용 해시별로 문장 경계 위치(int32 [N, 2] 배열)를 LRU 캐시에 보관하므로
+    같은 에세이를 여러 분석 단계에서 나눠도 분리는 한 번만 합니다. MAX_SENTENCE_CHARS보다
+    긴 문장은 나눠서 문장 하나가 태깅/문법 검사를 오래 붙잡지 않도록 합니다.
+    """
+
+    def __init__(self, segmenter=None, cache_size=DEFAULT_CACHE_SIZE):
+        self.segmenter = segmenter or RegexSegmenter()
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def name(self):
+        return self.segmenter.name
+
+    def spans(self, text):
+        """문장별 (시작, 끝) 문자 위치 배열 (int32, 읽기 전용)"""
+        text = text or ''
+        key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        with self._lock:
+            spans = self._cache.get(key)
+            if spans is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return spans
+            self.misses += 1
+
+        spans = _split_long_spans(text, self.segmenter.span_tokenize(text))
+        spans = np.asarray(spans, dtype=np.int32).reshape(-1, 2)
+        spans.flags.writeable = False
+        with self._lock:
+            self._cache[key] = spans
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return spans
+
+    def sentences(self, text):
+        """문장 목록 (앞뒤 공백 제외)"""
+        text = text or ''
+        return [text[start:end] for start, end in self.spans(text).tolist()]
+
+    def cache_stats(self):
+        """{'hits', 'misses', 'size', 'hit_ratio'}"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._cache),
+            'hit_ratio': self.hits / total if total else 0.0
+        }
+
+
+@st.cache_resource(show_spinner=False)
+def get_sentence_segmenter() -> SentenceSegmenter:
+    """프로세스 전체에서 공유하는 문장 분리 서비스 (SENTENCE_SEGMENTER 설정: regex / punkt)"""
+    try:
+        name = st.secrets["SENTENCE_SEGMENTER"]
+    except Exception:
+        name = os.getenv("SENTENCE_SEGMENTER", "regex")
+    try:
+        segmenter = create_segmenter(str(name).lower())
+    except Exception as e:
+        print(f"Sentence segmenter error ({e}) - using regex")
+        segmenter = RegexSegmenter()
+    return SentenceSegmenter(segmenter)
@@ -0,0 +1,79 @@
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+class SentenceSimilarityEngine:
+    """TF-IDF 희소 행렬 기반 문장 유사도 엔진
+
+    문서 1개의 문장들을 하나의 TF-IDF 행렬(행 단위 L2 정규화)로 만들고,
+    희소 행렬 곱 X·Xᵀ 로 모든 문장 쌍의 코사인 유사도를 한 번에 계산합니다.
+    인접/윈도우 유사도는 전체 행렬 없이 대각선 방향 행 곱으로 구합니다.
+    """
+
+    def __init__(self, window=3, stop_words='english'):
+        self.window = window
+        self.stop_words = stop_words
+
+    def vectorize(self, sentences):
+        """문장 목록 → 정규화된 TF-IDF 희소 행렬 (어휘가 없으면 None)"""
+        if not sentences:
+            return None
+        vectorizer = TfidfVectorizer(lowercase=True, stop_words=self.stop_words, sublinear_tf=True)
+        try:
+            return vectorizer.fit_transform(sentences).tocsr()
+        except ValueError:
+            # 불용어만 있는 텍스트 등 어휘가 비어 있는 경우
+            return None
+
+    def similarity_matrix(self, sentences):
+        """전체 문장 쌍 코사인 유사도 행렬 (scipy 희소 행렬, n x n)"""
+        matrix = self.vectorize(sentences)
+        if matrix is None:
+            return None
+        return (matrix @ matrix.T).tocsr()
+
+    @staticmethod
+    def _offset_similarities(matrix, offset):
+        """i번째와 i+offset번째 문장의 유사도 배열"""
+        if matrix.shape[0] <= offset:
+            return np.zeros(0)
+        return np.asarray(matrix[:-offset].multiply(matrix[offset:]).sum(axis=1)).ravel()
+
+    def coherence_metrics(self, sentences):
+        """문서 응집성 지표
+
+        불용어를 뺀 TF-IDF 코사인이므로 값의 범위는 0~1이지만, 인접/윈도우 유사도는
+        같은 내용어를 다시 쓴 경우에만 0보다 커서 보통 0.1 이하입니다.
+        중심 유사도는 주제어를 공유하는 정도라 보통 0.3~0.5입니다.
+
+        Returns:
+            adjacent: 인접 문장 평균 유사도
+            windowed: window 이내 문장 쌍 평균 유사도
+            centroid: 각 문장과 문서 중심(주제) 벡터의 평균 유사도
+            adjacent_similarities: 인접 문장 유사도 배열
+        """
+        metrics = {
+            'adjacent': 0.0,
+            'windowed': 0.0,
+            'centroid': 0.0,
+            'adjacent_similarities': np.zeros(0)
+        }
+
+        matrix = self.vectorize(sentences)
+        if matrix is None:
+            return metrics
+
+        adjacent = self._offset_similarities(matrix, 1)
+        windowed = np.concatenate([self._offset_similarities(matrix, offset)
+                                   for offset in range(1, self.window + 1)])
+
+        centroid = np.asarray(matrix.mean(axis=0)).ravel()
+        centroid_norm = np.linalg.norm(centroid)
+        if centroid_norm > 0:
+            centroid_similarities = matrix @ (centroid / centroid_norm)
+            metrics['centroid'] = float(np.mean(centroid_similarities))
+
+        metrics['adjacent'] = float(adjacent.mean()) if adjacent.size else 0.0
+        metrics['windowed'] = float(windowed.mean()) if windowed.size else 0.0
+        metrics['adjacent_similarities'] = adjacent
+        return metrics
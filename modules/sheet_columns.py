@@ -0,0 +1,107 @@
+import re
+
+from gspread.utils import rowcol_to_a1
+
+# 에세이 필드 → 시트 헤더 후보 (앞의 이름부터 찾음)
+ESSAY_COLUMNS = {
+    'username': ('아이디', 'username'),
+    'topic_name': ('이름',),  # 주제명
+    'created_at': ('날짜',),  # 작성일
+    'topic_description': ('주제',),  # 주제 설명
+    'essay_text': ('논술문',),  # 실제 에세이 내용
+    'total_score': ('점수',),  # 점수
+    'feedback': ('피드백',)  # 피드백
+}
+
+
+def quote_title(title):
+    """A1 표기용 워크시트 이름 ('가' → '\\'가\\'')"""
+    return "'" + title.replace("'", "''") + "'"
+
+
+def column_letter(index):
+    """0부터 시작하는 열 번호 → 열 문자 (0 → 'A', 27 → 'AB')"""
+    return re.sub(r'\d', '', rowcol_to_a1(1, index + 1))
+
+
+def resolve_ranges(title, header, columns=ESSAY_COLUMNS):
+    """헤더 행에서 필드별 열을 찾아 A1 범위로 변환 (2행부터 끝까지)
+
+    Args:
+        title: 워크시트 이름
+        header: 1행 셀 값 목록
+        columns: {필드: 헤더 후보 튜플}
+
+    Returns:
+        {필드: "'시트'!C2:C"} (헤더에 없는 필드는 제외)
+    """
+    positions = {}
+    for index, name in enumerate(header):
+        positions.setdefault(str(name).strip(), index)
+
+    ranges = {}
+    for field, candidates in columns.items():
+        for candidate in candidates:
+            if candidate in positions:
+                letter = column_letter(positions[candidate])
+                ranges[field] = f"{quote_title(title)}!{letter}2:{letter}"
+                break
+    return ranges
+
+
+def decode_columns(fields, value_ranges, columns=ESSAY_COLUMNS):
+    """batch_get(majorDimension=COLUMNS) 결과 → 길이가 같은 열 목록
+
+    시트 API는 열 끝의 빈 셀을 생략하므로 가장 긴 열에 맞춰 채웁니다.
+    헤더에 없던 필드는 빈 값으로 채웁니다. 숫자/날짜 변환은 essay_frame.normalize_columns()에서 합니다.
+
+    Returns:
+        {필드: 값 목록} (행이 없으면 빈 dict)
+    """
+    raw = {}
+    for field, value_range in zip(fields, value_ranges):
+        values = value_range.get('values') or [[]]
+        raw[field] = values[0]
+
+    row_count = max((len(values) for values in raw.values()), default=0)
+    if not row_count:
+        return {}
+
+    decoded = {}
+    for field in columns:
+        values = raw.get(field, [])
+        values = list(values) + [''] * (row_count - len(values))
+        decoded[field] = [str(value).strip() if field == 'username' else str(value) for value in values]
+    return decoded
+
+
+def row_count(columns):
+    """열 목록의 행 수"""
+    return len(next(iter(columns.values()), [])) if columns else 0
+
+
+def select_rows(columns, indices):
+    """지정한 행만 남긴 열 목록 (행이 없으면 빈 dict)"""
+    indices = list(indices)
+    if not indices:
+        return {}
+    return {field: [values[i] for i in indices] for field, values in columns.items()}
+
+
+def to_columns(records):
+    """레코드(dict) 목록 → 열 목록 (이미 열 목록이면 그대로 반환)"""
+    if isinstance(records, dict):
+        return records
+    if not records:
+        return {}
+    return {field: [record.get(field) for record in records] for field in records[0]}
+
+
+def to_records(columns):
+    """열 목록 → 레코드(dict) 목록 (이전 캐시 형식인 레코드 목록은 그대로 반환)"""
+    if isinstance(columns, list):
+        return columns
+    if not columns:
+        return []
+    fields = list(columns)
+    return [dict(zip(fields, row)) for row in zip(*(columns[field] for field in fields))]
@@ -0,0 +1,254 @@
+import copy
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+import streamlit as st
+
+# 요청 우선순위 (숫자가 작을수록 먼저)
+INTERACTIVE = 0
+BACKGROUND = 1
+
+# 재시도할 HTTP 상태 코드 (할당량 초과, 일시적 서버 오류)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def _status_code(error):
+    """gspread APIError 등에서 HTTP 상태 코드 추출 (없으면 None)"""
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    if status is None:
+        status = getattr(error, 'code', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after(error):
+    """Retry-After 헤더 값 (초, 없으면 None)"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+class _InFlight:
+    """진행 중인 요청 1건 (같은 키의 요청은 결과를 공유)
+
+    priority는 합류한 요청 중 가장 높은 우선순위로 올라갈 수 있고, 토큰 대기 중에도 반영됩니다.
+    """
+
+    def __init__(self, priority=INTERACTIVE):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.priority = priority
+
+
+class SheetsRequestScheduler:
+    """Google Sheets API 요청 스케줄러
+
+    - 토큰 버킷으로 분당 읽기 할당량을 추적하고 토큰이 없으면 호출 전에 대기
+    - 같은 키의 요청이 진행 중이면 새로 보내지 않고 그 결과를 함께 사용
+    - 429/5xx 응답은 지수 백오프 + 지터로 재시도 (429는 버킷도 비워서 다른 요청도 늦춤)
+    - 백그라운드 요청은 interactive_reserve개의 토큰을 남겨 두고, 대기 중인 화면 요청이 있으면 양보
+    """
+
+    def __init__(self, requests_per_minute=60, burst=10, interactive_reserve=2,
+                 max_retries=5, base_delay=1.0, max_delay=32.0, acquire_timeout=60.0):
+        """
+        Args:
+            requests_per_minute: 분당 허용 요청 수 (토큰 충전 속도)
+            burst: 버킷 최대 토큰 수 (한 번에 보낼 수 있는 요청 수)
+            interactive_reserve: 백그라운드 요청이 남겨 두어야 하는 토큰 수
+            max_retries: 재시도 최대 횟수
+            base_delay: 첫 재시도 대기 시간 (초, 이후 2배씩 증가)
+            max_delay: 재시도 대기 시간 상한 (초)
+            acquire_timeout: 토큰을 기다리는 최대 시간 (초)
+        """
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(burst)
+        self.interactive_reserve = min(interactive_reserve, burst - 1)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.acquire_timeout = acquire_timeout
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+        self._waiting = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+        self._context = threading.local()
+        self._stats = {'calls': 0, 'coalesced': 0, 'retries': 0, 'throttled': 0, 'failed': 0}
+
+    @contextmanager
+    def background(self):
+        """이 블록 안에서 현재 스레드의 요청을 백그라운드 우선순위로 처리"""
+        previous = getattr(self._context, 'priority', INTERACTIVE)
+        self._context.priority = BACKGROUND
+        try:
+            yield
+        finally:
+            self._context.priority = previous
+
+    def call(self, key, func, *args, cost=1, priority=None, **kwargs):
+        """할당량/재시도/중복 제거를 적용해서 func 실행
+
+        Args:
+            key: 요청 식별자 (같은 키의 요청이 진행 중이면 결과 공유, None이면 공유 안 함)
+            func: 실제 API 호출 함수
+            cost: 이 호출이 보내는 API 요청 수 (예: 헤더 조회 + batch_get = 2)
+            priority: INTERACTIVE 또는 BACKGROUND (기본: background() 블록 여부로 결정)
+        Returns:
+            func 결과 (결과를 공유받은 요청에는 복사본을 돌려주므로 호출한 쪽에서 수정해도 됨)
+        """
+        if priority is None:
+            priority = getattr(self._context, 'priority', INTERACTIVE)
+
+        if key is None:
+            return self._execute(_InFlight(priority), func, args, kwargs, cost)
+
+        with self._in_flight_lock:
+            entry = self._in_flight.get(key)
+            owner = entry is None
+            if owner:
+                entry = _InFlight(priority)
+                self._in_flight[key] = entry
+            else:
+                self._stats['coalesced'] += 1
+
+        if not owner:
+            if priority < entry.priority:
+                # 백그라운드 요청에 화면 요청이 합류하면 진행 중인 요청의 우선순위를 올림
+                with self._condition:
+                    entry.priority = min(entry.priority, priority)
+                    self._condition.notify_all()
+            entry.done.wait()
+            if entry.error is not None:
+                raise entry.error
+            return copy.deepcopy(entry.result)
+
+        try:
+            entry.result = self._execute(entry, func, args, kwargs, cost)
+            return entry.result
+        except Exception as e:
+            entry.error = e
+            raise
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.pop(key, None)
+            entry.done.set()
+
+    def _execute(self, entry, func, args, kwargs, cost):
+        """토큰 획득 → 호출, 재시도 가능한 오류는 백오프 후 재시도 (우선순위는 entry.priority)"""
+        attempt = 0
+        while True:
+            self._acquire(cost, entry)
+            try:
+                with self._condition:
+                    self._stats['calls'] += 1
+                return func(*args, **kwargs)
+            except Exception as e:
+                status = _status_code(e)
+                retryable = status in RETRYABLE_STATUS or isinstance(
+                    e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+                if not retryable or attempt >= self.max_retries:
+                    with self._condition:
+                        self._stats['failed'] += 1
+                    raise
+
+                if status == 429:
+                    self._drain()
+                delay = _retry_after(e)
+                if delay is None:
+                    # full jitter: 0 ~ min(max_delay, base * 2^attempt)
+                    delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+                attempt += 1
+                with self._condition:
+                    self._stats['retries'] += 1
+                print(f"Sheets API {status or type(e).__name__} - retry {attempt}/{self.max_retries} "
+                      f"in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _acquire(self, cost, entry):
+        """토큰 cost개 획득 (없으면 대기, acquire_timeout 초과 시 TimeoutError)"""
+        cost = min(float(cost), self.capacity)
+        deadline = time.monotonic() + self.acquire_timeout
+        with self._condition:
+            priority = entry.priority
+            self._waiting[priority] += 1
+            throttled = False
+            try:
+                while True:
+                    if entry.priority != priority:
+                        # 대기 중에 우선순위가 올라감 (화면 요청 합류)
+                        self._waiting[priority] -= 1
+                        priority = entry.priority
+                        self._waiting[priority] += 1
+                    self._refill()
+                    if priority == INTERACTIVE:
+                        needed = cost
+                    else:
+                        # 화면 요청이 기다리는 중이면 양보, 아니면 예약분을 남기고 사용
+                        needed = cost + self.interactive_reserve
+                        if self._waiting[INTERACTIVE]:
+                            needed = self.capacity + 1
+                    if self._tokens >= needed:
+                        self._tokens -= cost
+                        return
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError("Google Sheets 요청 할당량 대기 시간 초과")
+                    if not throttled:
+                        throttled = True
+                        self._stats['throttled'] += 1
+                    shortfall = max(min(needed, self.capacity) - self._tokens, 0.0)
+                    self._condition.wait(min(remaining, max(shortfall / self.rate, 0.05)))
+            finally:
+                self._waiting[priority] -= 1
+                self._condition.notify_all()
+
+    def _drain(self):
+        """429 응답 시 남은 토큰을 비워 모든 요청의 속도를 늦춤"""
+        with self._condition:
+            self._refill()
+            self._tokens = 0.0
+
+    def stats(self) -> dict:
+        """스케줄러 통계
+
+        Returns:
+            calls(실제 호출), coalesced(중복 제거), retries, throttled(토큰 대기), failed,
+            tokens(현재 토큰), waiting_interactive, waiting_background
+        """
+        with self._condition:
+            self._refill()
+            stats = dict(self._stats)
+            stats['tokens'] = self._tokens
+            stats['waiting_interactive'] = self._waiting[INTERACTIVE]
+            stats['waiting_background'] = self._waiting[BACKGROUND]
+        return stats
+
+
+@st.cache_resource(show_spinner=False)
+def get_sheets_scheduler() -> SheetsRequestScheduler:
+    """프로세스 전체에서 공유하는 Sheets 요청 스케줄러 (SHEETS_REQUESTS_PER_MINUTE로 할당량 설정)"""
+    try:
+        requests_per_minute = st.secrets["SHEETS_REQUESTS_PER_MINUTE"]
+    except Exception:
+        requests_per_minute = os.getenv("SHEETS_REQUESTS_PER_MINUTE", 60)
+    return SheetsRequestScheduler(requests_per_minute=float(requests_per_minute))
@@ -0,0 +1,144 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+import streamlit as st
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# 스냅샷 열 구성이 바뀌면 올림 (버전이 다른 스냅샷은 읽지 않음)
+SCHEMA_VERSION = 2
+
+MANIFEST_FILE = 'manifest.json'
+
+
+class SnapshotStore:
+    """마지막으로 성공한 Google Sheets 데이터의 로컬 Parquet 스냅샷
+
+    컨테이너가 재시작되어 Redis/프로세스 캐시가 비어 있어도 디스크의 스냅샷을
+    바로 제공하고, 그동안 백그라운드에서 최신 데이터로 갱신할 수 있게 합니다.
+    manifest.json에 스냅샷별 저장 시각, 행 수, 스키마 버전을 기록합니다.
+    """
+
+    def __init__(self, directory, source_id=None):
+        """
+        Args:
+            directory: 스냅샷 저장 디렉터리
+            source_id: 데이터 출처 식별자 (예: 시트 ID, 다르면 스냅샷을 읽지 않음)
+        """
+        self.directory = directory
+        self.source_id = source_id
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return PYARROW_AVAILABLE
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.parquet")
+
+    def manifest(self):
+        """전체 manifest ({이름: {fetched_at, rows, schema_version, source_id, file}})"""
+        try:
+            with open(os.path.join(self.directory, MANIFEST_FILE), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def info(self, name):
+        """스냅샷 1개의 manifest 항목 (현재 스키마/출처와 맞지 않으면 None)"""
+        entry = self.manifest().get(name)
+        if not entry:
+            return None
+        if entry.get('schema_version') != SCHEMA_VERSION or entry.get('source_id') != self.source_id:
+            return None
+        return entry
+
+    def save(self, name, columns):
+        """열 목록({필드: 값 목록})을 Parquet으로 저장 (저장마다 다른 임시 파일 → rename으로 원자적 교체)
+
+        Returns:
+            저장 여부
+        """
+        if not self.enabled or not columns:
+            return False
+
+        temp_path = None
+        try:
+            table = pa.Table.from_pydict(columns)
+            os.makedirs(self.directory, exist_ok=True)
+            # 화면 조회와 백그라운드 갱신이 같은 스냅샷을 동시에 저장해도 서로의 임시 파일을 덮어쓰지 않도록
+            # 같은 디렉터리에 고유한 임시 파일을 만듦 (rename이 같은 파일 시스템 안에서 원자적)
+            fd, temp_path = tempfile.mkstemp(prefix=f"{name}.", suffix='.tmp', dir=self.directory)
+            os.close(fd)
+            pq.write_table(table, temp_path, compression='zstd')
+
+            with self._lock:
+                os.replace(temp_path, self._path(name))
+                temp_path = None
+                manifest = self.manifest()
+                manifest[name] = {
+                    'fetched_at': time.time(),
+                    'rows': table.num_rows,
+                    'schema_version': SCHEMA_VERSION,
+                    'source_id': self.source_id,
+                    'file': os.path.basename(self._path(name))
+                }
+                manifest_path = os.path.join(self.directory, MANIFEST_FILE)
+                with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+                    json.dump(manifest, f, ensure_ascii=False, indent=2)
+                os.replace(manifest_path + '.tmp', manifest_path)
+
+            print(f"Snapshot saved: {name} ({table.num_rows} rows)")
+            return True
+        except Exception as e:
+            print(f"Snapshot save error ({name}): {e}")
+            return False
+        finally:
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    def load(self, name, filters=None):
+        """저장된 열 목록 (없거나 스키마/출처가 다르거나 읽기 실패 시 None)
+
+        Args:
+            filters: 행 조건 (pyarrow 형식, 예: [('username', '==', 'kim')]) - 맞는 행만 읽음
+        """
+        if not self.enabled or self.info(name) is None:
+            return None
+
+        try:
+            table = pq.read_table(self._path(name), filters=filters)
+            print(f"Snapshot loaded: {name} ({table.num_rows} rows)")
+            return table.to_pydict()
+        except Exception as e:
+            print(f"Snapshot load error ({name}): {e}")
+            return None
+
+    def age(self, name):
+        """스냅샷이 저장된 지 지난 시간 (초, 없으면 None)"""
+        entry = self.info(name)
+        return time.time() - entry['fetched_at'] if entry else None
+
+
+@st.cache_resource(show_spinner=False)
+def get_snapshot_store(source_id=None) -> SnapshotStore:
+    """프로세스 전체에서 공유하는 스냅샷 저장소 (SNAPSHOT_DIR, 기본 '.snapshots')"""
+    try:
+        directory = st.secrets["SNAPSHOT_DIR"]
+    except Exception:
+        directory = os.getenv("SNAPSHOT_DIR", ".snapshots")
+
+    if not PYARROW_AVAILABLE:
+        print("pyarrow not installed - local snapshots disabled")
+    return SnapshotStore(directory, source_id)
@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+
+# 종합 진단 전체 시간 제한 기본값 (초)
+DEFAULT_ANALYSIS_TIME_BUDGET = 20.0
+
+_local = threading.local()
+
+
+class Deadline:
+    """협조적 시간 제한
+
+    분석 코드가 반복문 안에서 expired()를 확인하고 True이면 그때까지의 결과로 멈춥니다.
+    한 번이라도 시간 초과를 확인하면 hit가 True가 되어 부분 결과였음을 알 수 있습니다.
+    """
+
+    def __init__(self, seconds=None):
+        self.seconds = seconds
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+        self.hit = False
+
+    def remaining(self):
+        """남은 시간 (초, 제한이 없으면 None)"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        """시간 초과 여부 (초과를 확인하면 hit 표시)"""
+        if self.expires_at is not None and time.monotonic() >= self.expires_at:
+            self.hit = True
+        return self.hit
+
+
+# 제한이 설정되지 않았을 때의 기본값 (항상 False)
+NO_DEADLINE = Deadline()
+
+
+def current_deadline():
+    """현재 스레드에서 실행 중인 단계의 시간 제한 (없으면 제한 없음)"""
+    return getattr(_local, 'deadline', None) or NO_DEADLINE
+
+
+@contextmanager
+def deadline_scope(deadline):
+    """with 블록 안에서 current_deadline()이 deadline을 돌려주도록 설정"""
+    previous = getattr(_local, 'deadline', None)
+    _local.deadline = deadline
+    try:
+        yield deadline
+    finally:
+        _local.deadline = previous
+
+
+class TimeBudget:
+    """여러 분석 단계를 하나의 시간 예산 안에서 실행
+
+    각 단계는 (남은 전체 시간 / 남은 단계 수)만큼의 제한을 받고, 일찍 끝난 단계가 남긴
+    시간은 다음 단계로 넘어갑니다. 제한에 걸린 단계의 결과에는 'truncated': True가 붙고
+    단계 이름이 truncated_steps에 기록됩니다. 예산을 모두 쓴 뒤의 단계는 실행하지 않고
+    기본 결과에 'skipped': True를 붙여 돌려줍니다.
+    """
+
+    def __init__(self, seconds, steps):
+        self.total = Deadline(seconds)
+        self.steps_left = steps
+        self.truncated_steps = []
+        self.step_seconds = {}
+
+    def run(self, name, func, *args, fallback=None, **kwargs):
+        """단계 1개 실행
+
+        Args:
+            name: 단계 이름 (truncated_steps에 기록)
+            fallback: 실행하지 못했을 때 돌려줄 기본 결과 dict
+        """
+        steps_left = max(1, self.steps_left)
+        self.steps_left -= 1
+        remaining = self.total.remaining()
+
+        if remaining is not None and remaining <= 0:
+            self.truncated_steps.append(name)
+            return {**(fallback or {}), 'truncated': True, 'skipped': True}
+
+        deadline = Deadline(None if remaining is None else remaining / steps_left)
+        started = time.monotonic()
+        with deadline_scope(deadline):
+            result = func(*args, **kwargs)
+        self.step_seconds[name] = round(time.monotonic() - started, 3)
+
+        if deadline.hit or (isinstance(result, dict) and result.get('truncated')):
+            self.truncated_steps.append(name)
+            if isinstance(result, dict):
+                result = {**result, 'truncated': True}
+        return result
+
+
+def get_analysis_time_budget():
+    """종합 진단 시간 예산 (ANALYSIS_TIME_BUDGET 초, 0 이하면 제한 없음)"""
+    try:
+        seconds = st.secrets["ANALYSIS_TIME_BUDGET"]
+    except Exception:
+        seconds = os.getenv("ANALYSIS_TIME_BUDGET", DEFAULT_ANALYSIS_TIME_BUDGET)
+    try:
+        seconds = float(seconds)
+    except (TypeError, ValueError):
+        seconds = DEFAULT_ANALYSIS_TIME_BUDGET
+    return seconds if seconds > 0 else None
@@ -0,0 +1,157 @@
+import numpy as np
+
+
+class Vocabulary:
+    """문자열 ↔ 정수 ID 사전 (한 번 부여한 ID는 바뀌지 않음)
+
+    문서 1개가 자기 사전을 가지므로 사전 크기는 그 문서의 고유 단어 수를 넘지 않고,
+    문서가 사라지면 함께 해제됩니다. (프로세스 공용 사전은 오타/고유명사가 계속 쌓여 커지기만 함)
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._strings = []
+
+    def id(self, string):
+        """문자열 1개의 ID (없으면 새로 부여)"""
+        token_id = self._ids.get(string)
+        if token_id is None:
+            token_id = len(self._strings)
+            self._strings.append(string)
+            self._ids[string] = token_id
+        return token_id
+
+    def lookup(self, string):
+        """문자열의 ID (없으면 -1, 새로 부여하지 않음)"""
+        return self._ids.get(string, -1)
+
+    def encode(self, strings):
+        """문자열 목록 → int32 ID 배열"""
+        strings = list(strings)
+        ids = self._ids
+        # 반복되는 단어는 dict 조회로 처리하고, 처음 나온 단어만 추가
+        return np.fromiter((ids[s] if s in ids else self.id(s) for s in strings),
+                           dtype=np.int32, count=len(strings))
+
+    def decode(self, ids):
+        """ID 배열 → 문자열 목록"""
+        strings = self._strings
+        return [strings[i] for i in np.asarray(ids).tolist()]
+
+    def string(self, token_id):
+        return self._strings[token_id]
+
+    def __len__(self):
+        return len(self._strings)
+
+
+class TokenDocument:
+    """정수 ID로 인코딩한 품사 태깅 문서
+
+    단어/태그는 문서 전용 사전의 int32 ID 배열로, 문장 경계는 시작 위치 배열로 보관합니다.
+    (word, tag) 튜플 목록처럼 len(), 인덱싱, 슬라이싱, 순회를 지원하므로 기존 코드에서
+    그대로 사용할 수 있고, 개수/비율 계산은 bincount로 처리합니다.
+    ID는 문서마다 다르므로 다른 문서의 ID와 직접 비교하지 않습니다.
+    """
+
+    __slots__ = ('token_ids', 'tag_ids', 'sentence_offsets', 'words_vocab', 'tags_vocab')
+
+    def __init__(self, token_ids, tag_ids, sentence_offsets, words_vocab, tags_vocab):
+        self.token_ids = token_ids
+        self.tag_ids = tag_ids
+        # 문장 i = [sentence_offsets[i], sentence_offsets[i + 1])
+        self.sentence_offsets = sentence_offsets
+        self.words_vocab = words_vocab
+        self.tags_vocab = tags_vocab
+
+    @classmethod
+    def from_tagged_sentences(cls, tagged_sentences):
+        """문장별 [(단어, 태그)] 목록 → 문서"""
+        words, tags, offsets = [], [], [0]
+        for tagged in tagged_sentences:
+            for word, tag in tagged:
+                words.append(word)
+                tags.append(tag)
+            offsets.append(len(words))
+        words_vocab, tags_vocab = Vocabulary(), Vocabulary()
+        return cls(words_vocab.encode(words), tags_vocab.encode(tags), np.asarray(offsets, dtype=np.int32),
+                   words_vocab, tags_vocab)
+
+    @classmethod
+    def from_tagged(cls, tagged):
+        """[(단어, 태그)] 목록 → 문장 1개짜리 문서"""
+        return cls.from_tagged_sentences([tagged])
+
+    def __len__(self):
+        return int(self.token_ids.shape[0])
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            token_ids = self.token_ids[index]
+            tag_ids = self.tag_ids[index]
+            return list(zip(self.words_vocab.decode(token_ids), self.tags_vocab.decode(tag_ids)))
+        return (self.words_vocab.string(int(self.token_ids[index])),
+                self.tags_vocab.string(int(self.tag_ids[index])))
+
+    def __iter__(self):
+        return iter(zip(self.words_vocab.decode(self.token_ids), self.tags_vocab.decode(self.tag_ids)))
+
+    @property
+    def sentence_count(self):
+        return int(self.sentence_offsets.shape[0]) - 1
+
+    def sentence(self, index):
+        """문장 1개의 [(단어, 태그)] 목록"""
+        return self[int(self.sentence_offsets[index]):int(self.sentence_offsets[index + 1])]
+
+    def sentence_tag_ids(self, index):
+        """문장 1개의 태그 ID 배열 (복사 없이 뷰로 반환)"""
+        return self.tag_ids[self.sentence_offsets[index]:self.sentence_offsets[index + 1]]
+
+    def words(self):
+        return self.words_vocab.decode(self.token_ids)
+
+    def tags(self):
+        return self.tags_vocab.decode(self.tag_ids)
+
+    def tag_counts(self):
+        """{태그: 개수} (bincount)"""
+        if not len(self):
+            return {}
+        counts = np.bincount(self.tag_ids, minlength=len(self.tags_vocab))
+        return {self.tags_vocab.string(tag_id): int(count) for tag_id, count in enumerate(counts.tolist()) if count}
+
+    def count_tags(self, tags, mask=None):
+        """지정한 태그들의 총 개수 (mask로 일부 토큰만 셀 수 있음)"""
+        tag_ids = [self.tags_vocab.lookup(tag) for tag in tags]
+        tag_ids = [tag_id for tag_id in tag_ids if tag_id >= 0]
+        if not tag_ids or not len(self):
+            return 0
+        selected = self.tag_ids if mask is None else self.tag_ids[mask]
+        return int(np.bincount(selected, minlength=len(self.tags_vocab))[tag_ids].sum())
+
+    def word_counts(self, mask=None):
+        """{단어: 개수} (bincount, mask로 일부 토큰만 셀 수 있음)"""
+        selected = self.token_ids if mask is None else self.token_ids[mask]
+        if not selected.size:
+            return {}
+        unique_ids, inverse = np.unique(selected, return_inverse=True)
+        counts = np.bincount(inverse)
+        return dict(zip(self.words_vocab.decode(unique_ids), counts.tolist()))
+
+    def word_mask(self, predicate):
+        """단어 조건을 만족하는 토큰 마스크 (조건은 단어 종류별로 한 번씩만 평가)"""
+        if not len(self):
+            return np.zeros(0, dtype=bool)
+        unique_ids, inverse = np.unique(self.token_ids, return_inverse=True)
+        allowed = np.fromiter((bool(predicate(word)) for word in self.words_vocab.decode(unique_ids)),
+                              dtype=bool, count=len(unique_ids))
+        return allowed[inverse]
+
+    @property
+    def nbytes(self):
+        """배열 메모리 크기 (바이트, 사전 제외)"""
+        return int(self.token_ids.nbytes + self.tag_ids.nbytes + self.sentence_offsets.nbytes)
@@ -0,0 +1,131 @@
+import base64
+import hashlib
+import math
+from typing import Iterable, Optional
+
+
+def _hash64(word: str) -> int:
+    """프로세스와 무관하게 항상 같은 64비트 해시 (내장 hash()는 실행마다 달라짐)"""
+    return int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class VocabularySketch:
+    """고유 어휘 수 스케치
+
+    고유 단어가 적을 때는 실제 집합을 유지하는 정확 모드로 동작하고,
+    exact_threshold를 넘으면 HyperLogLog 레지스터로 전환합니다.
+    에세이 → 학생 → 학급 순으로 merge()해서 전체 어휘 다양성을 계산할 수 있습니다.
+    (precision=12 기준 메모리 4KB, 표준 오차 약 1.6%)
+    """
+
+    def __init__(self, precision: int = 12, exact_threshold: int = 2000):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision은 4~16 사이여야 합니다")
+        self.precision = precision
+        self.exact_threshold = exact_threshold
+        self.words = set()
+        self.registers: Optional[bytearray] = None
+
+    @classmethod
+    def from_words(cls, words: Iterable[str], **kwargs) -> 'VocabularySketch':
+        """단어 목록으로 스케치 생성"""
+        sketch = cls(**kwargs)
+        sketch.update(words)
+        return sketch
+
+    @property
+    def is_exact(self) -> bool:
+        """정확 모드 여부"""
+        return self.registers is None
+
+    def add(self, word: str):
+        """단어 1개 추가"""
+        if self.registers is None:
+            self.words.add(word)
+            if len(self.words) > self.exact_threshold:
+                self._switch_to_hll()
+        else:
+            self._add_hash(_hash64(word))
+
+    def update(self, words: Iterable[str]):
+        """여러 단어 추가"""
+        for word in words:
+            self.add(word)
+
+    def _add_hash(self, hashed: int):
+        p = self.precision
+        index = hashed >> (64 - p)
+        remainder = hashed & ((1 << (64 - p)) - 1)
+        # 남은 비트에서 첫 1비트의 위치 (모두 0이면 최대값)
+        rank = (64 - p) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def _switch_to_hll(self):
+        self.registers = bytearray(1 << self.precision)
+        for word in self.words:
+            self._add_hash(_hash64(word))
+        self.words = set()
+
+    def merge(self, other: 'VocabularySketch') -> 'VocabularySketch':
+        """다른 스케치를 현재 스케치에 병합 (제자리 병합)"""
+        if other.precision != self.precision:
+            raise ValueError("precision이 다른 스케치는 병합할 수 없습니다")
+
+        if self.is_exact and other.is_exact:
+            self.words |= other.words
+            if len(self.words) > self.exact_threshold:
+                self._switch_to_hll()
+            return self
+
+        if self.is_exact:
+            self._switch_to_hll()
+
+        if other.is_exact:
+            for word in other.words:
+                self._add_hash(_hash64(word))
+        else:
+            self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self) -> int:
+        """고유 단어 수 (정확 모드에서는 실제 값, HLL 모드에서는 추정값)"""
+        if self.is_exact:
+            return len(self.words)
+
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+
+        # 작은 범위 보정 (linear counting)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+
+        return int(round(estimate))
+
+    def __len__(self):
+        return self.count()
+
+    def to_dict(self) -> dict:
+        """캐시 저장용 JSON 직렬화 가능한 dict"""
+        data = {'precision': self.precision, 'exact_threshold': self.exact_threshold}
+        if self.is_exact:
+            data['words'] = sorted(self.words)
+        else:
+            data['registers'] = base64.b64encode(bytes(self.registers)).decode('ascii')
+        return data
+
+    @classmethod
+    def from_dict(cls, data) -> 'VocabularySketch':
+        """to_dict() 결과 (또는 이전 형식인 단어 리스트)로부터 복원"""
+        if isinstance(data, list):
+            return cls.from_words(data)
+
+        sketch = cls(precision=data.get('precision', 12),
+                     exact_threshold=data.get('exact_threshold', 2000))
+        if 'registers' in data:
+            sketch.registers = bytearray(base64.b64decode(data['registers']))
+        else:
+            sketch.words = set(data.get('words', []))
+        return sketch
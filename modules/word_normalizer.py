@@ -0,0 +1,91 @@
+import threading
+from functools import lru_cache
+
+import streamlit as st
+
+# 단어 형태(type)별 결과 캐시 크기 - 에세이 어휘는 수천 개 수준이라 대부분 캐시에서 처리됨
+DEFAULT_CACHE_SIZE = 20000
+
+
+class WordNormalizer:
+    """어간 추출/표제어 추출 공용 처리기 (단어 형태별 LRU 캐시)
+
+    PorterStemmer/WordNetLemmatizer를 한 번만 만들고, 같은 단어는 캐시된 결과를
+    돌려줍니다. 에세이는 같은 단어가 반복되므로 대부분의 조회가 dict 조회로 끝납니다.
+    WordNet 데이터가 없으면 표제어 추출은 어간 추출로 대체합니다.
+    """
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE):
+        from nltk.stem import PorterStemmer, WordNetLemmatizer
+
+        self._stemmer = PorterStemmer()
+        self._lemmatizer = WordNetLemmatizer()
+        self._stem = lru_cache(maxsize=cache_size)(self._stemmer.stem)
+        self._lemmatize = lru_cache(maxsize=cache_size)(self._lemmatizer.lemmatize)
+        self._lemmatizer_available = None
+        self._lock = threading.Lock()
+
+    def stem(self, word):
+        """단어 1개 어간 추출"""
+        return self._stem(word)
+
+    def lemmatize(self, word, pos='n'):
+        """단어 1개 표제어 추출 (WordNet이 없으면 어간 추출)"""
+        if self._lemmatizer_available is False:
+            return self._stem(word)
+        try:
+            lemma = self._lemmatize(word, pos)
+            self._lemmatizer_available = True
+            return lemma
+        except LookupError:
+            with self._lock:
+                if self._lemmatizer_available is None:
+                    print("WordNet data not found - lemmatization falls back to stemming")
+                self._lemmatizer_available = False
+            return self._stem(word)
+
+    def stem_words(self, words):
+        """단어 목록 어간 추출 (배치)"""
+        stem = self._stem
+        return [stem(word) for word in words]
+
+    def lemmatize_words(self, words, pos='n'):
+        """단어 목록 표제어 추출 (배치)"""
+        words = list(words)
+        if not words:
+            return []
+        # 첫 단어로 WordNet 사용 가능 여부 확인 후 나머지는 캐시 함수로 바로 처리
+        first = self.lemmatize(words[0], pos)
+        if not self._lemmatizer_available:
+            return self.stem_words(words)
+        lemmatize = self._lemmatize
+        return [first] + [lemmatize(word, pos) for word in words[1:]]
+
+    def compare(self, words):
+        """단어별 (원형, 어간, 표제어) 목록 (학습 화면 예시용)"""
+        words = list(words)
+        return list(zip(words, self.stem_words(words), self.lemmatize_words(words)))
+
+    def cache_stats(self):
+        """캐시 적중 통계
+
+        Returns:
+            {'stem': {...}, 'lemmatize': {...}} - hits, misses, size, hit_ratio
+        """
+        stats = {}
+        for name, cached in (('stem', self._stem), ('lemmatize', self._lemmatize)):
+            info = cached.cache_info()
+            total = info.hits + info.misses
+            stats[name] = {
+                'hits': info.hits,
+                'misses': info.misses,
+                'size': info.currsize,
+                'hit_ratio': info.hits / total if total else 0.0
+            }
+        return stats
+
+
+@st.cache_resource(show_spinner=False)
+def get_word_normalizer() -> WordNormalizer:
+    """프로세스 전체에서 공유하는 단어 정규화기 (세션 간 캐시 공유)"""
+    return WordNormalizer()